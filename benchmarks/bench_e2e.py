@@ -0,0 +1,227 @@
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import requests
+
+# scripts/ 모듈 import 경로
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+
+## 수집/좌표 변환 종단 간 부하 벤치마크 --------------------------------------------------
+# 로컬 대역 서버(standin_server)를 띄우고 실제 스크립트를 그대로 돌려 처리량을 잰다.
+#   1. init_lotto 비동기 백필 : --rounds 회차
+#   2. crawler_lotto 주간 갱신 : 빠진 --weekly-gap 회차 + 최신 회차
+#   3. geocoder               : 좌표를 지운 판매점 --stores 곳
+# 단계별로 초당 회차/판매점 수, 요청 지연 p50/p99, limiter 재시도 횟수를 출력한다.
+# 작업은 임시 디렉터리(assets/data 복사본)에서 하므로 저장소의 데이터는 바뀌지 않는다.
+# (scripts 모듈은 import 시점의 cwd로 경로를 정하므로 임시 디렉터리로 옮긴 뒤에 import)
+#
+# 사용법: python benchmarks/bench_e2e.py [--rounds 50] [--latency-ms 20] [--error-rate 0.02]
+#                                       [--burst-every 10 --burst-len 1] [--rps 8] [--concurrency 8]
+
+REAL_DATA_DIR = os.path.join(ROOT_DIR, 'assets', 'data')
+
+
+class LatencyRecorder:
+    """requests.Session.request를 감싸서 요청별 지연(초)을 기록"""
+
+    def __init__(self):
+        self.samples = []
+        self._original = None
+
+    def install(self):
+        original = self._original = requests.Session.request
+        samples = self.samples
+
+        def timed_request(session, method, url, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(session, method, url, *args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - started)
+
+        requests.Session.request = timed_request
+
+    def uninstall(self):
+        if self._original is not None:
+            requests.Session.request = self._original
+
+    def take(self):
+        """지금까지 기록을 꺼내고 비움"""
+        taken = sorted(self.samples)
+        self.samples.clear()
+        return taken
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def seed_workdir(keep_round, store_count):
+    """현재(임시) 디렉터리에 keep_round까지의 history와 좌표를 지운 판매점 store_count곳을 준비"""
+    from history_io import load_history, write_history
+
+    data_dir = os.path.join(os.getcwd(), 'assets', 'data')
+    os.makedirs(data_dir)
+
+    history = [item for item in load_history(os.path.join(REAL_DATA_DIR, 'history.json'))
+               if item["round"] <= keep_round]
+    write_history(os.path.join(data_dir, 'history.json'), history)
+
+    with open(os.path.join(REAL_DATA_DIR, 'stores.json'), 'r', encoding='utf-8') as f:
+        stores = json.load(f)[:store_count]
+    for store in stores:
+        store["lat"] = 0
+        store["lng"] = 0
+    with open(os.path.join(data_dir, 'stores.json'), 'w', encoding='utf-8') as f:
+        json.dump(stores, f, ensure_ascii=False, indent=2)
+    return len(stores)
+
+
+def retry_counts(limiter_stats):
+    """limiter.stats() 목록 → 사유별 재시도 합계"""
+    retries = {}
+    for stats in limiter_stats:
+        for reason, n in stats["retries"].items():
+            retries[reason] = retries.get(reason, 0) + n
+    return retries
+
+
+def phase_result(name, unit, count, elapsed, latencies, retries):
+    return {
+        "phase": name,
+        "unit": unit,
+        "count": count,
+        "seconds": round(elapsed, 3),
+        "per_sec": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "retries": retries,
+    }
+
+
+def run_benchmark(args):
+    workdir = tempfile.mkdtemp(prefix="lotto_bench_")
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    import standin_server
+
+    config = standin_server.StandInConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        burst_every=args.burst_every, burst_len=args.burst_len, not_found_rate=args.not_found_rate,
+    )
+    server, state, base_url = standin_server.start_background(config)
+    final_round = standin_server.FIXTURE_ROUND     # byWin 고정 페이지가 알려주는 최신 회차
+    backfill_last = final_round - args.weekly_gap  # 1단계가 끝나는 회차
+    keep_round = backfill_last - args.rounds       # 처음부터 history에 있는 회차
+
+    # 스크립트 모듈은 import 시점의 cwd/환경변수로 경로와 주소를 정하므로 먼저 설정
+    os.environ["DHLOTTERY_BASE_URL"] = base_url
+    os.environ["KAKAO_GEOCODE_URL"] = f"{base_url}/v2/local/search/address.json"
+    os.environ["GOOGLE_GEOCODE_URL"] = f"{base_url}/maps/api/geocode/json"
+    os.environ.pop("LOTTO_DB", None)
+
+    recorder = LatencyRecorder()
+    results = []
+    try:
+        store_count = seed_workdir(keep_round, args.stores)
+        import crawler_lotto
+        import geocoder
+        import init_lotto
+
+        for provider in geocoder.PROVIDERS.values():
+            provider["max_rps"] = args.geocode_rps
+        output = sys.stdout if args.verbose else open(os.devnull, 'w')
+        recorder.install()
+
+        print(f"📏 종단 간 벤치마크 ({base_url}, 지연 {args.latency_ms}±{args.jitter_ms}ms, "
+              f"오류 {args.error_rate:.0%}, 429 구간 {args.burst_len}s/{args.burst_every}s)")
+
+        # 1. 비동기 백필
+        config.latest_round = backfill_last
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            init_lotto.run_crawler_async(args.concurrency, args.rps)
+        elapsed = time.perf_counter() - started
+        collected = init_lotto.last_round(init_lotto.HISTORY_FILE) - keep_round
+        backfill_retries = retry_counts([init_lotto.limiter.stats()])
+        results.append(phase_result("init_lotto", "rounds", collected, elapsed, recorder.take(), backfill_retries))
+
+        # 2. 주간 갱신 (빠진 회차 + 최신 회차)
+        config.latest_round = final_round
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            try:
+                crawler_lotto.update_weekly()
+            except SystemExit:
+                pass
+        elapsed = time.perf_counter() - started
+        collected = init_lotto.last_round(init_lotto.HISTORY_FILE) - backfill_last
+        # crawler_lotto는 init_lotto limiter를 같이 쓰므로 1단계 이후 증가분만
+        retries = retry_counts([init_lotto.limiter.stats()])
+        for reason, n in backfill_retries.items():
+            retries[reason] -= n
+        retries = {reason: n for reason, n in retries.items() if n}
+        results.append(phase_result("crawler_lotto", "rounds", collected, elapsed, recorder.take(), retries))
+
+        # 3. 좌표 변환
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            stats = geocoder.run_geocoder(workers=args.workers,
+                                          api_keys={"kakao": "standin", "google": "standin"})
+        elapsed = time.perf_counter() - started
+        results.append(phase_result("geocoder", "stores", store_count, elapsed,
+                                    recorder.take(), retry_counts(stats.get("limiter", []))))
+    finally:
+        recorder.uninstall()
+        os.chdir(previous_cwd)
+        server.shutdown()
+        if args.keep:
+            print(f"📂 작업 디렉터리 유지: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{'phase':<14} {'count':>6} {'sec':>8} {'per sec':>9} {'reqs':>6} {'p50 ms':>8} {'p99 ms':>8}  retries")
+    for r in results:
+        retries = ", ".join(f"{k}={v}" for k, v in sorted(r["retries"].items())) or "-"
+        print(f"{r['phase']:<14} {r['count']:>6} {r['seconds']:>8.2f} {r['per_sec']:>6.2f} {r['unit'][0]}/s "
+              f"{r['requests']:>6} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f}  {retries}")
+    print(f"🧪 서버 요청 수: {dict(sorted(state.counts.items()))}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="대역 서버 상대로 수집/좌표 변환 처리량 측정")
+    parser.add_argument("--rounds", type=int, default=50, help="비동기 백필로 수집할 회차 수")
+    parser.add_argument("--weekly-gap", type=int, default=3, help="주간 갱신이 채울 빠진 회차 수")
+    parser.add_argument("--stores", type=int, default=300, help="좌표 변환할 판매점 수")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="429 구간 주기(초), 0이면 없음")
+    parser.add_argument("--burst-len", type=float, default=0.0, help="429 구간 길이(초)")
+    parser.add_argument("--not-found-rate", type=float, default=0.1, help="좌표 검색 결과 없음 비율")
+    parser.add_argument("--rps", type=float, default=8.0, help="init_lotto 초당 요청 수 상한")
+    parser.add_argument("--concurrency", type=int, default=8, help="init_lotto 동시 회차 수")
+    parser.add_argument("--geocode-rps", type=float, default=10.0, help="좌표 제공자별 초당 요청 수 상한")
+    parser.add_argument("--workers", type=int, default=8, help="좌표 변환 작업자 수")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장 (회귀 비교용)")
+    parser.add_argument("--keep", action="store_true", help="임시 작업 디렉터리 남기기")
+    parser.add_argument("--verbose", action="store_true", help="스크립트 출력 그대로 보기")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 {args.json} 저장")
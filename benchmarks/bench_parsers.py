@@ -0,0 +1,79 @@
+import argparse
+import os
+import sys
+import time
+
+# scripts/ 모듈 import 경로
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+
+import lotto_parser  # noqa: E402
+
+## 파서 백엔드별 초당 처리 페이지 수 측정 ------------------------------------------------
+# 사용법: python benchmarks/bench_parsers.py [--seconds 2]
+
+FIXTURE_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'fixtures')
+BYWIN_FIXTURE = os.path.join(FIXTURE_DIR, 'byWin_1199.html')
+TOPSTORE_FIXTURE = os.path.join(FIXTURE_DIR, 'topStore_1199.html')
+
+
+def read_fixture(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def measure(func, seconds):
+    """seconds 동안 반복 호출해서 초당 호출 수 반환"""
+    count = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while True:
+        func()
+        count += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            return count / (now - started)
+
+
+def run_benchmark(seconds=2.0):
+    bywin = read_fixture(BYWIN_FIXTURE)
+    topstore = read_fixture(TOPSTORE_FIXTURE)
+
+    # 백엔드끼리 결과가 같은지 먼저 확인
+    expected = (
+        lotto_parser.parse_prizes(bywin, backend="bs4"),
+        lotto_parser.parse_stores(topstore, backend="bs4"),
+        lotto_parser.parse_latest(bywin, backend="bs4"),
+    )
+
+    stages = [
+        ("prizes (byWin)", lambda b: lotto_parser.parse_prizes(bywin, backend=b)),
+        ("stores (topStore)", lambda b: lotto_parser.parse_stores(topstore, backend=b)),
+        ("latest (byWin)", lambda b: lotto_parser.parse_latest(bywin, backend=b)),
+    ]
+
+    print(f"📏 파서 벤치마크 (단계별 {seconds:.1f}초)")
+    print(f"{'backend':<8} {'stage':<20} {'pages/s':>10} {'vs bs4':>8}")
+
+    baseline = {}
+    for backend in ["bs4"] + [b for b in lotto_parser.available_backends() if b != "bs4"]:
+        actual = (
+            lotto_parser.parse_prizes(bywin, backend=backend),
+            lotto_parser.parse_stores(topstore, backend=backend),
+            lotto_parser.parse_latest(bywin, backend=backend),
+        )
+        if actual != expected:
+            print(f"❌ {backend} 결과가 bs4와 다릅니다.")
+            sys.exit(1)
+
+        for stage, func in stages:
+            rate = measure(lambda: func(backend), seconds)
+            baseline.setdefault(stage, rate)
+            print(f"{backend:<8} {stage:<20} {rate:>10.1f} {rate / baseline[stage]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="파서 백엔드 벤치마크")
+    parser.add_argument("--seconds", type=float, default=2.0, help="단계별 측정 시간(초)")
+    args = parser.parse_args()
+    run_benchmark(args.seconds)
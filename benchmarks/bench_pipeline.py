@@ -0,0 +1,240 @@
+import argparse
+import contextlib
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# scripts/ 모듈 import 경로
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+
+## 수집/집계 파이프라인 단계별 벤치마크 (시간 + 최대 메모리) -----------------------------
+# 단계마다 min-time 동안 반복해서 1회 최단 시간을 재고 (timeit처럼 잡음이 가장 적은 값), tracemalloc으로 한 번 더 돌려 최대 메모리를 잰다.
+#   parse.*          : lotto_parser로 고정 페이지(benchmarks/fixtures) 파싱만
+#   fetch.*          : init_lotto.get_prize_info / get_store_info, crawler_lotto.get_latest_data
+#                      (지연 0인 로컬 대역 서버 상대, 속도 제한 없음 → 요청/파싱/조립 비용)
+#   history.*@xN     : 합성 history(N배) JSON 직렬화 / history_io.load_history
+#   stores.*@xN      : init_Stores.create_stores_from_history 전체 생성, stores.json 직렬화 / 읽기
+# 결과를 benchmarks/baseline.json과 비교해서 허용 범위를 넘게 느려지거나 메모리가 늘면 실패(종료 코드 1).
+# 시간 기준값은 기계마다 다르므로 비교할 기계에서 --save-baseline으로 다시 기록한다.
+#
+# 사용법: python benchmarks/bench_pipeline.py [--scales 1,10] [--only stores] [--save-baseline]
+
+BASELINE_FILE = os.path.join(ROOT_DIR, 'benchmarks', 'baseline.json')
+
+MIN_RUNS = 3
+MAX_RUNS = 10000
+# 공용 러너는 같은 코드도 시간이 ±50%까지 흔들리므로 시간은 2배 넘게 느려질 때만 실패로 보고,
+# 흔들림이 거의 없는 tracemalloc 최대 메모리는 좁게 본다 (--time-tolerance로 조절)
+TIME_TOLERANCE = 1.0      # 기준보다 100% 넘게 느리면 실패
+MEMORY_TOLERANCE = 0.15   # 기준보다 최대 메모리가 15% 넘게 늘면 실패
+
+
+def quiet():
+    """스크립트의 진행 출력 숨기기"""
+    return contextlib.redirect_stdout(open(os.devnull, 'w'))
+
+
+def measure(func, setup=None, min_time=1.0):
+    """(1회 최단 시간(초), 최대 메모리(바이트), 반복 횟수) - setup은 매 회 전에 호출, 시간에서 제외"""
+    times = []
+    total = 0.0
+    # timeit처럼 측정 중에는 GC를 끔 (이전 단계 쓰레기 수거 시점에 따라 흔들리지 않게)
+    gc.collect()
+    gc.disable()
+    try:
+        while len(times) < MAX_RUNS and (len(times) < MIN_RUNS or total < min_time):
+            if setup:
+                setup()
+            with quiet():
+                started = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - started
+            times.append(elapsed)
+            total += elapsed
+    finally:
+        gc.enable()
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        with quiet():
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak, len(times)
+
+
+def build_stages(scales):
+    """[(단계 이름, 함수, setup)] - 현재(임시) 디렉터리 기준으로 scripts 모듈을 import한 뒤 호출"""
+    import crawler_lotto
+    import init_Stores
+    import init_lotto
+    import lotto_parser
+    import synthetic_history
+    from history_io import load_history, write_history
+    from rate_limiter import AdaptiveRateLimiter
+
+    # 로컬 서버 상대라 속도 제한은 풀어둠 (limiter는 호출 시점에 모듈 변수로 참조됨, crawler_lotto도 같은 limiter)
+    init_lotto.limiter = AdaptiveRateLimiter(initial_rate=1e6, max_rate=1e6, burst=1e6, name="bench")
+
+    with open(os.path.join(ROOT_DIR, 'benchmarks', 'fixtures', 'byWin_1199.html'), encoding='utf-8') as f:
+        bywin = f.read()
+    with open(os.path.join(ROOT_DIR, 'benchmarks', 'fixtures', 'topStore_1199.html'), encoding='utf-8') as f:
+        topstore = f.read()
+
+    stages = [
+        ("parse.prizes", lambda: lotto_parser.parse_prizes(bywin), None),
+        ("parse.stores", lambda: lotto_parser.parse_stores(topstore, first_table=1), None),
+        ("parse.latest", lambda: lotto_parser.parse_latest(bywin), None),
+        ("fetch.get_prize_info", lambda: init_lotto.get_prize_info(1199), None),
+        ("fetch.get_store_info", lambda: init_lotto.get_store_info(1199), None),
+        ("fetch.get_latest_data", crawler_lotto.get_latest_data, None),
+    ]
+
+    base = synthetic_history.load_base()
+    stores_file = init_Stores.STORES_FILE
+
+    def reset_stores():
+        for path in (stores_file, init_Stores.STORES_META_FILE, init_Stores.STORES_INDEX_FILE):
+            if os.path.exists(path):
+                os.remove(path)
+
+    for scale in scales:
+        state = {}
+
+        def prepare(scale=scale, state=state):
+            """이 배수 단계들을 처음 돌 때 한 번만 합성 history 저장"""
+            if state.get("scale") != scale:
+                records = synthetic_history.synthetic_history(base, scale)
+                with quiet():
+                    write_history(init_lotto.HISTORY_FILE, records)
+                state["scale"] = scale
+                state["records"] = records
+
+        def read_stores(state=state):
+            with open(stores_file, 'r', encoding='utf-8') as f:
+                state["stores"] = json.load(f)
+
+        def setup_create(prepare=prepare):
+            prepare()
+            reset_stores()
+
+        def setup_stores_io(prepare=prepare, read_stores=read_stores, state=state):
+            prepare()
+            if state.get("stores_scale") != state["scale"]:
+                reset_stores()
+                with quiet():
+                    init_Stores.create_stores_from_history()
+                read_stores()
+                state["stores_scale"] = state["scale"]
+
+        stages += [
+            (f"history.dump@x{scale}",
+             lambda state=state: json.dumps(state["records"], ensure_ascii=False, indent=2), prepare),
+            (f"history.load@x{scale}", lambda: load_history(init_lotto.HISTORY_FILE), prepare),
+            (f"stores.create@x{scale}", init_Stores.create_stores_from_history, setup_create),
+            (f"stores.dump@x{scale}",
+             lambda state=state: json.dumps(state["stores"], ensure_ascii=False, indent=2), setup_stores_io),
+            (f"stores.load@x{scale}", read_stores, setup_stores_io),
+        ]
+    return stages
+
+
+def load_baseline(path=BASELINE_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get("stages", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def compare(result, baseline, time_tolerance, memory_tolerance):
+    """기준값 대비 (상태, 시간 변화율) - 상태: new / ok / slower / memory"""
+    base = baseline.get(result["stage"])
+    if base is None:
+        return "new", None
+    ratio = result["seconds"] / base["seconds"] - 1 if base["seconds"] else 0.0
+    if ratio > time_tolerance:
+        return "slower", ratio
+    if base["peak_kb"] and result["peak_kb"] / base["peak_kb"] - 1 > memory_tolerance:
+        return "memory", ratio
+    return "ok", ratio
+
+
+def run_benchmark(args):
+    scales = [int(s) for s in args.scales.split(",") if s]
+    workdir = tempfile.mkdtemp(prefix="lotto_bench_")
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    os.makedirs(os.path.join('assets', 'data'))
+    os.environ.pop("LOTTO_DB", None)
+    import standin_server
+
+    config = standin_server.StandInConfig(latency_ms=0.0, jitter_ms=0.0)
+    server, _, base_url = standin_server.start_background(config)
+    os.environ["DHLOTTERY_BASE_URL"] = base_url
+
+    baseline = load_baseline(args.baseline)
+    results = []
+    try:
+        print(f"📏 파이프라인 벤치마크 (배수 {scales}, 단계별 최소 {args.min_time:.1f}초)")
+        print(f"{'stage':<24} {'runs':>5} {'best ms':>11} {'peak KB':>10} {'base ms':>10} {'Δ':>7}  status")
+        for stage, func, setup in build_stages(scales):
+            if args.only and args.only not in stage:
+                continue
+            seconds, peak, runs = measure(func, setup, args.min_time)
+            result = {"stage": stage, "seconds": seconds, "peak_kb": round(peak / 1024, 1), "runs": runs}
+            status, ratio = compare(result, baseline, args.time_tolerance, args.memory_tolerance)
+            result["status"] = status
+            results.append(result)
+
+            base = baseline.get(stage)
+            base_ms = f"{base['seconds'] * 1000:.2f}" if base else "-"
+            delta = f"{ratio:+.0%}" if ratio is not None else "-"
+            mark = {"ok": "✅", "new": "🆕", "slower": "❌", "memory": "❌"}[status]
+            print(f"{stage:<24} {runs:>5} {seconds * 1000:>11.2f} {result['peak_kb']:>10.1f} "
+                  f"{base_ms:>10} {delta:>7}  {mark} {status}")
+    finally:
+        os.chdir(previous_cwd)
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.save_baseline:
+        stages = dict(load_baseline(args.baseline)) if args.only else {}
+        stages.update({r["stage"]: {"seconds": round(r["seconds"], 6), "peak_kb": r["peak_kb"]} for r in results})
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({"version": 1, "stages": dict(sorted(stages.items()))}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"💾 기준값 저장 → {args.baseline}")
+        return True
+
+    regressions = [r for r in results if r["status"] in ("slower", "memory")]
+    if regressions:
+        print(f"❌ 성능 회귀 {len(regressions)}개 단계: {', '.join(r['stage'] for r in regressions)}")
+        return False
+    print("✨ 기준값 대비 회귀 없음")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="파이프라인 단계별 시간/메모리 벤치마크")
+    parser.add_argument("--scales", default="1,10", help="합성 history 배수 (쉼표 구분)")
+    parser.add_argument("--only", help="이름에 이 문자열이 들어간 단계만")
+    parser.add_argument("--min-time", type=float, default=1.0, help="단계별 최소 측정 시간(초)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="기준값 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    args = parser.parse_args()
+
+    if not run_benchmark(args):
+        sys.exit(1)
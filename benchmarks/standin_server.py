@@ -0,0 +1,218 @@
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# scripts/ 모듈 import 경로
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+
+from draw_columns import parse_date  # noqa: E402
+
+## 동행복권 / Kakao / Google 대역 서버 -------------------------------------------------
+# 실제 서버를 두드리지 않고 수집/좌표 변환 처리량을 재기 위한 로컬 HTTP 서버.
+#   GET  /common.do?method=getLottoNumber&drwNo=N   → history.json 기반 API JSON (latest_round 초과는 fail)
+#   GET  /gameResult.do?method=byWin[&drwNo=N]      → fixtures/byWin_1199.html
+#   GET|POST /store.do?method=topStore...           → fixtures/topStore_1199.html
+#   GET  /v2/local/search/address.json?query=       → Kakao 주소 검색 형식
+#   GET  /maps/api/geocode/json?address=            → Google Geocoding 형식
+# 응답 지연, 오류(500) 비율, 주기적인 429 구간(Retry-After 포함)을 설정할 수 있다.
+#
+#   python benchmarks/standin_server.py --port 8765 --latency-ms 30 --error-rate 0.02
+#   DHLOTTERY_BASE_URL=http://127.0.0.1:8765 python scripts/init_lotto.py
+
+FIXTURE_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'fixtures')
+HISTORY_FILE = os.path.join(ROOT_DIR, 'assets', 'data', 'history.json')
+FIXTURE_ROUND = 1199      # byWin/topStore 고정 페이지의 회차
+
+
+class StandInConfig:
+    """
+    - latency_ms / jitter_ms : 응답마다 latency ± jitter 만큼 대기
+    - error_rate             : 이 비율로 500 응답
+    - burst_every / burst_len: burst_every초마다 burst_len초 동안 모든 요청에 429
+    - not_found_rate         : 좌표 검색 결과 없음 비율 (주소별로 고정)
+    - latest_round           : getLottoNumber가 답하는 마지막 회차 (실행 중 바꿀 수 있음)
+    """
+
+    def __init__(self, latency_ms=20.0, jitter_ms=10.0, error_rate=0.0, burst_every=0.0, burst_len=0.0,
+                 not_found_rate=0.1, latest_round=None, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_len = burst_len
+        self.not_found_rate = not_found_rate
+        self.latest_round = latest_round
+        self.random = random.Random(seed)
+
+
+class StandInState:
+    """응답 본문 + 요청 통계 (핸들러 스레드들이 공유)"""
+
+    def __init__(self, config, history_file=HISTORY_FILE):
+        self.config = config
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        self.counts = {}
+
+        with open(history_file, 'r', encoding='utf-8') as f:
+            self.draws = {item["round"]: item for item in json.load(f)}
+        if config.latest_round is None:
+            config.latest_round = max(self.draws)
+
+        with open(os.path.join(FIXTURE_DIR, f'byWin_{FIXTURE_ROUND}.html'), 'rb') as f:
+            self.bywin = f.read()
+        with open(os.path.join(FIXTURE_DIR, f'topStore_{FIXTURE_ROUND}.html'), 'rb') as f:
+            self.topstore = f.read()
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def fault(self):
+        """이번 요청에 넣을 오류 상태 코드 (없으면 None)"""
+        config = self.config
+        if config.burst_every > 0 and config.burst_len > 0:
+            if (time.monotonic() - self.started) % config.burst_every < config.burst_len:
+                return 429
+        with self.lock:
+            roll = config.random.random()
+        if roll < config.error_rate:
+            return 500
+        return None
+
+    def delay(self):
+        config = self.config
+        with self.lock:
+            jitter = config.random.uniform(-config.jitter_ms, config.jitter_ms)
+        wait = max(0.0, config.latency_ms + jitter) / 1000.0
+        if wait:
+            time.sleep(wait)
+
+    def lotto_number(self, round_no):
+        draw = self.draws.get(round_no)
+        if draw is None or round_no > self.config.latest_round:
+            return {"returnValue": "fail"}
+        body = {"returnValue": "success", "drwNo": round_no, "drwNoDate": parse_date(draw["date"]), "bnusNo": draw["bonus"]}
+        for i, n in enumerate(draw["numbers"], 1):
+            body[f"drwtNo{i}"] = n
+        return body
+
+    def geocode(self, query):
+        """주소별로 고정된 가짜 좌표 (not_found_rate 비율은 결과 없음)"""
+        h = zlib.crc32(query.encode("utf-8"))
+        if (h % 1000) / 1000.0 < self.config.not_found_rate:
+            return None
+        return 33.0 + (h % 50000) / 10000.0, 125.0 + (h // 50000 % 50000) / 10000.0
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # 헤더/본문을 따로 써서 생기는 40ms 지연(Nagle + delayed ACK) 방지
+    state = None  # make_server에서 설정
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json; charset=utf-8", headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        state = self.state
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if self.command == "POST":
+            length = int(self.headers.get("Content-Length") or 0)
+            query.update(parse_qs(self.rfile.read(length).decode("utf-8")))
+        method = query.get("method", [""])[0]
+        name = url.path + (f":{method}" if method else "")
+        state.count(name)
+
+        state.delay()
+        status = state.fault()
+        if status == 429:
+            self._send(429, {"error": "too many requests"}, headers={"Retry-After": "1"})
+            return
+        if status is not None:
+            self._send(status, {"error": "injected"})
+            return
+
+        if url.path == "/common.do" and method == "getLottoNumber":
+            self._send(200, state.lotto_number(int(query.get("drwNo", ["0"])[0])))
+        elif url.path == "/gameResult.do" and method == "byWin":
+            self._send(200, state.bywin, "text/html; charset=utf-8")
+        elif url.path == "/store.do" and method == "topStore":
+            self._send(200, state.topstore, "text/html; charset=utf-8")
+        elif url.path == "/v2/local/search/address.json":
+            point = state.geocode(query.get("query", [""])[0])
+            documents = [] if point is None else [{"y": str(point[0]), "x": str(point[1])}]
+            self._send(200, {"documents": documents, "meta": {"total_count": len(documents)}})
+        elif url.path == "/maps/api/geocode/json":
+            point = state.geocode(query.get("address", [""])[0])
+            if point is None:
+                self._send(200, {"status": "ZERO_RESULTS", "results": []})
+            else:
+                location = {"lat": point[0], "lng": point[1]}
+                self._send(200, {"status": "OK", "results": [{"geometry": {"location": location}}]})
+        else:
+            self._send(404, {"error": "not found"})
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+def make_server(config=None, host="127.0.0.1", port=0, history_file=HISTORY_FILE):
+    """서버 생성 (port=0이면 빈 포트), 반환: (server, state) - serve_forever는 호출한 쪽에서"""
+    state = StandInState(config or StandInConfig(), history_file)
+    handler = type("BoundStandInHandler", (StandInHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, state
+
+
+def start_background(config=None, history_file=HISTORY_FILE):
+    """백그라운드 스레드로 서버 시작 → (server, state, base_url)"""
+    server, state = make_server(config, history_file=history_file)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, state, f"http://{host}:{port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동행복권/Kakao/Google 대역 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--burst-every", type=float, default=0.0, help="429 구간 주기(초), 0이면 없음")
+    parser.add_argument("--burst-len", type=float, default=0.0, help="429 구간 길이(초)")
+    parser.add_argument("--not-found-rate", type=float, default=0.1)
+    parser.add_argument("--latest-round", type=int)
+    args = parser.parse_args()
+
+    config = StandInConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.burst_every, args.burst_len,
+                           args.not_found_rate, args.latest_round)
+    server, state = make_server(config, port=args.port)
+    print(f"🧪 대역 서버 시작: http://127.0.0.1:{args.port} (최신 {config.latest_round}회)")
+    print(f"   DHLOTTERY_BASE_URL=http://127.0.0.1:{args.port}")
+    print(f"   KAKAO_GEOCODE_URL=http://127.0.0.1:{args.port}/v2/local/search/address.json")
+    print(f"   GOOGLE_GEOCODE_URL=http://127.0.0.1:{args.port}/maps/api/geocode/json")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📈 요청 수: {state.counts}")
@@ -0,0 +1,63 @@
+import argparse
+import copy
+import datetime
+import json
+import os
+import sys
+
+# scripts/ 모듈 import 경로
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+
+## 합성 history 생성기 ------------------------------------------------------------------
+# 실제 history.json을 scale배로 늘린 데이터 (벤치마크용).
+#   - k번째 복사본(k ≥ 1)은 회차를 k × 원본 최대 회차만큼 밀고, 추첨일도 회차에 맞춰 주 단위로 다시 매김
+#   - 판매점 이름에 "#k"를 붙여 판매점 수도 대략 scale배가 되게 함
+# 번호/상금/당첨자 수는 원본 그대로라 파서·집계 비용의 분포는 실제와 같다.
+#
+# 사용법: python benchmarks/synthetic_history.py --scale 10 --out /tmp/history_x10.json
+
+REAL_HISTORY_FILE = os.path.join(ROOT_DIR, 'assets', 'data', 'history.json')
+FIRST_DRAW_DATE = datetime.date(2002, 12, 7)
+
+
+def draw_date(round_no):
+    """회차 → 추첨일 (1회 2002-12-07부터 매주 토요일)"""
+    date = FIRST_DRAW_DATE + datetime.timedelta(weeks=round_no - 1)
+    return f"{date.year}년 {date.month:02d}월 {date.day:02d}일"
+
+
+def synthetic_history(base, scale):
+    """base(history 레코드 목록)를 scale배로 늘린 새 목록 (최신순)"""
+    max_round = max(item["round"] for item in base)
+    records = []
+    for k in range(scale):
+        for item in base:
+            record = copy.deepcopy(item)
+            if k:
+                record["round"] = item["round"] + k * max_round
+                record["date"] = draw_date(record["round"])
+                for rank in ("1st", "2nd"):
+                    for store in record["result"].get(rank, {}).get("stores", []):
+                        store["name"] = f"{store['name']}#{k}"
+            records.append(record)
+    records.sort(key=lambda x: x["round"], reverse=True)
+    return records
+
+
+def load_base(history_file=REAL_HISTORY_FILE):
+    from history_io import load_history
+
+    return load_history(history_file)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 history 생성")
+    parser.add_argument("--scale", type=int, default=10, help="원본 대비 배수")
+    parser.add_argument("--out", required=True, help="저장할 파일 경로")
+    args = parser.parse_args()
+
+    records = synthetic_history(load_base(), args.scale)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+    print(f"✨ {len(records)}개 회차 ({args.scale}배) → {args.out}")
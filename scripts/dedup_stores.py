@@ -0,0 +1,332 @@
+import argparse
+import json
+import math
+import os
+import re
+from difflib import SequenceMatcher
+
+import lotto_db
+from store_leaderboard import PROVINCES
+from stores_io import publish_stores
+
+## 중복 판매점 병합 ----------------------------------------------------------------------
+# normalize_key(이름+주소 공백 제거)만으로는 같은 판매점이 여러 레코드로 나뉜다.
+#   "CU(반고개점) | 대구 달서구 두류동 864-7"  /  "씨유 반고개점 | 대구 달서구 두류동 864-7번지"
+#   괄호 안 건물명, 쉼표 뒤 상세주소, 지번 ↔ 도로명 주소 등
+# 전체 쌍을 비교하지 않도록 후보를 블록으로 나눈 뒤 블록 안에서만 점수를 매긴다.
+#   - 주소 블록: 정규화 주소의 글자 3-gram 역색인 (너무 흔한 3-gram은 제외)
+#   - 좌표 블록: 약 100m 격자 (지번/도로명처럼 주소 글자가 다른 경우)
+# 블록 안에서도 도로명 건물번호나 지번이 서로 다르면 점수를 매기지 않는다 (같은 길의 다른 판매점).
+# 점수를 넘긴 쌍 중 자동 병합은 정규화 주소가 완전히 같고 이름도 충분히 비슷한 경우만.
+# 나머지(같은 건물의 다른 상호, 지번 ↔ 도로명 등)는 store_merge_review.json에 남겨 사람이 확인한다.
+# 병합 결과는 당첨 회차를 합치고, 흡수된 키는 store_aliases.json에 남겨
+# init_Stores가 다음 회차부터 같은 레코드로 합치도록 한다.
+
+
+# --- 설정 ---
+BASE_DIR = os.getcwd()
+DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
+STORES_FILE = os.path.join(DATA_DIR, 'stores.json')
+ALIASES_FILE = os.path.join(DATA_DIR, 'store_aliases.json')
+REVIEW_FILE = os.path.join(DATA_DIR, 'store_merge_review.json')
+
+NGRAM = 3
+MAX_BLOCK_SIZE = 200      # 이보다 많은 판매점이 공유하는 3-gram은 블록으로 쓰지 않음
+MIN_SHARED_NGRAMS = 4     # 주소 3-gram을 이만큼 공유해야 후보
+GRID_DEG = 0.001          # 좌표 격자 크기 (약 100m)
+NEAR_METERS = 30.0        # 이 거리 이내면 같은 위치로 봄
+FAR_METERS = 150.0        # 이 거리 이상이면 좌표 유사도 0
+MIN_NAME_SIM = 0.6
+MIN_SCORE = 0.8
+AUTO_NAME_SIM = 0.75      # 자동 병합 이름 유사도 (한쪽 이름이 다른 쪽을 포함해도 자동)
+
+RANKS = ["1st", "2nd"]
+
+# 편의점 브랜드 표기 통일
+BRANDS = {
+    "cu": "씨유", "gs25": "지에스25", "gs": "지에스", "훼미리마트": "패밀리마트",
+    "7-eleven": "세븐일레븐", "7eleven": "세븐일레븐", "emart24": "이마트24",
+}
+
+_PAREN_RE = re.compile(r"\([^)]*\)")
+# 층/호 토큰 (공백으로 나눈 토큰 하나 전체가 일치할 때만 제거 → "종로 331 1층"의 건물번호는 남김)
+_DETAIL_TOKEN_RE = re.compile(r"(지하)?\d+층|지하|\d+(-\d+)?호")
+# 건물번호(도로명) / 지번 토큰
+_NUMBER_TOKEN_RE = re.compile(r"(산)?\d+(-\d+)?")
+_NAME_STRIP_RE = re.compile(r"[\s()\[\]{}.,·\-_/]")
+
+
+def address_tokens(addr):
+    """괄호/쉼표 뒤 상세주소, 층·호 토큰, 번지 접미사를 뗀 주소 토큰 (시/도는 약칭)"""
+    addr = _PAREN_RE.sub(" ", addr or "").split(",")[0]
+    tokens = [t[:-2] if t.endswith("번지") else t for t in addr.split()]
+    tokens = [t for t in tokens if t and not _DETAIL_TOKEN_RE.fullmatch(t)]
+    if tokens:
+        tokens[0] = PROVINCES.get(tokens[0], tokens[0])
+    return tokens
+
+
+def normalize_address(addr):
+    """비교용 주소: address_tokens를 공백 없이 합침"""
+    return "".join(address_tokens(addr))
+
+
+def address_numbers(addr):
+    """
+    {"road": 건물번호, "lot": 지번} - 숫자 토큰 바로 앞 토큰이 ~로/~길이면 도로명 건물번호, 아니면 지번
+    """
+    tokens = address_tokens(addr)
+    numbers = {}
+    for prev, token in zip(tokens, tokens[1:]):
+        if _NUMBER_TOKEN_RE.fullmatch(token):
+            kind = "road" if prev.endswith(("로", "길")) else "lot"
+            numbers.setdefault(kind, token)
+    return numbers
+
+
+def numbers_conflict(a, b):
+    """같은 종류(도로명/지번) 번호가 둘 다 있는데 다르면 다른 판매점"""
+    return any(kind in b and a[kind] != b[kind] for kind in a)
+
+
+def normalize_name(name):
+    """비교용 이름: 소문자, 괄호/구두점/공백 제거, 브랜드 표기 통일"""
+    name = (name or "").lower()
+    for brand, canonical in BRANDS.items():
+        if name.startswith(brand):
+            name = canonical + name[len(brand):]
+            break
+    return _NAME_STRIP_RE.sub("", name)
+
+
+def ngrams(text, n=NGRAM):
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def distance_m(a, b):
+    """두 판매점 좌표 거리 (m, 좌표가 없으면 None)"""
+    if not (a.get("lat") and a.get("lng") and b.get("lat") and b.get("lng")):
+        return None
+    lat = math.radians((a["lat"] + b["lat"]) / 2)
+    dy = (a["lat"] - b["lat"]) * 111320.0
+    dx = (a["lng"] - b["lng"]) * 111320.0 * math.cos(lat)
+    return math.hypot(dx, dy)
+
+
+def candidate_pairs(stores, grams):
+    """주소 3-gram 블록 + 좌표 격자 블록에서 나온 후보 쌍 (i < j)"""
+    postings = {}
+    for i, gs in enumerate(grams):
+        for g in gs:
+            postings.setdefault(g, []).append(i)
+
+    pairs = set()
+    shared = {}
+    for ids in postings.values():
+        if len(ids) < 2 or len(ids) > MAX_BLOCK_SIZE:
+            continue
+        for x in range(len(ids)):
+            for y in range(x + 1, len(ids)):
+                pair = (ids[x], ids[y])
+                shared[pair] = shared.get(pair, 0) + 1
+    pairs.update(pair for pair, count in shared.items() if count >= MIN_SHARED_NGRAMS)
+
+    # 좌표 격자: 이웃 칸까지 포함해 같은 블록으로 봄
+    cells = {}
+    for i, store in enumerate(stores):
+        if store.get("lat") and store.get("lng"):
+            cell = (int(store["lat"] / GRID_DEG), int(store["lng"] / GRID_DEG))
+            cells.setdefault(cell, []).append(i)
+    for (cy, cx), ids in cells.items():
+        near = [j for dy in (-1, 0, 1) for dx in (-1, 0, 1) for j in cells.get((cy + dy, cx + dx), ())]
+        for i in ids:
+            for j in near:
+                if i < j:
+                    pairs.add((i, j))
+    return pairs, shared
+
+
+def score_pair(a, b, name_a, name_b, grams_a, grams_b, shared_count):
+    """(점수, 이름 유사도) - 이름 절반 + 주소/좌표 중 높은 쪽 절반"""
+    name_sim = SequenceMatcher(None, name_a, name_b).ratio()
+    union = len(grams_a) + len(grams_b) - shared_count
+    addr_sim = shared_count / union if union else 0.0
+
+    geo_sim = 0.0
+    dist = distance_m(a, b)
+    if dist is not None:
+        geo_sim = min(1.0, max(0.0, (FAR_METERS - dist) / (FAR_METERS - NEAR_METERS)))
+    return 0.5 * name_sim + 0.5 * max(addr_sim, geo_sim), name_sim
+
+
+def names_match(name_a, name_b, name_sim):
+    """자동 병합할 만큼 이름이 같은지 (유사도가 높거나 한쪽이 다른 쪽을 포함)"""
+    if name_sim >= AUTO_NAME_SIM:
+        return True
+    shorter, longer = sorted((name_a, name_b), key=len)
+    return len(shorter) >= 2 and shorter in longer
+
+
+def win_count(store):
+    return sum(len(store["wins"].get(rank, [])) for rank in RANKS)
+
+
+def find_duplicates(stores):
+    """
+    중복 묶음 찾기.
+    반환: (묶음, 검토 목록)
+    - 묶음: [[대표 위치, 흡수될 위치, ...], ...] - 대표는 당첨이 가장 많은 (같으면 먼저 등록된) 판매점
+    - 검토 목록: 점수는 넘었지만 자동 병합 조건(같은 주소 + 비슷한 이름)에 못 미친 [(점수, i, j), ...]
+    """
+    names = [normalize_name(s["name"]) for s in stores]
+    addresses = [normalize_address(s.get("address", "")) for s in stores]
+    grams = [ngrams(addr) for addr in addresses]
+    numbers = [address_numbers(s.get("address", "")) for s in stores]
+    pairs, shared = candidate_pairs(stores, grams)
+
+    parent = list(range(len(stores)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    review = []
+    for i, j in pairs:
+        # 건물번호/지번이 다르면 이름이 같아도 다른 판매점 (같은 길의 가로판매점 등)
+        if numbers_conflict(numbers[i], numbers[j]):
+            continue
+        count = shared.get((i, j))
+        if count is None:
+            count = len(grams[i] & grams[j])
+        score, name_sim = score_pair(stores[i], stores[j], names[i], names[j], grams[i], grams[j], count)
+        if name_sim < MIN_NAME_SIM or score < MIN_SCORE:
+            continue
+        if addresses[i] != addresses[j] or not names_match(names[i], names[j], name_sim):
+            review.append((round(score, 3), i, j))
+            continue
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    groups = {}
+    for i in range(len(stores)):
+        groups.setdefault(find(i), []).append(i)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda i: (-win_count(stores[i]), i))
+        clusters.append(members)
+    # 다른 쌍을 거쳐 이미 같은 묶음이 된 쌍은 검토할 필요 없음
+    review = sorted((r for r in review if find(r[1]) != find(r[2])), key=lambda r: (-r[0], r[1], r[2]))
+    return sorted(clusters, key=lambda m: m[0]), review
+
+
+def save_review(stores, review, review_file=REVIEW_FILE):
+    """자동 병합하지 않은 후보 쌍 저장 (확인 후 store_aliases.json에 직접 추가)"""
+    entries = [{
+        "score": score,
+        "a": {"key": lotto_db.store_key(stores[i]), "name": stores[i]["name"], "address": stores[i].get("address", "")},
+        "b": {"key": lotto_db.store_key(stores[j]), "name": stores[j]["name"], "address": stores[j].get("address", "")},
+    } for score, i, j in review]
+    with open(review_file, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False, indent=2)
+
+
+def merge_cluster(stores, members):
+    """묶음을 대표 레코드 하나로 합침 (당첨 회차 합집합, 좌표/전화번호는 비어 있으면 채움, 투표 합산)"""
+    target = stores[members[0]]
+    wins = {rank: set(target["wins"].get(rank, [])) for rank in RANKS}
+    aliases = list(target.get("aliases", []))
+
+    for pos in members[1:]:
+        other = stores[pos]
+        for rank in RANKS:
+            wins[rank].update(other["wins"].get(rank, []))
+        if not target.get("lat") and other.get("lat"):
+            target["lat"], target["lng"] = other["lat"], other["lng"]
+        if not target.get("phone") and other.get("phone"):
+            target["phone"] = other["phone"]
+        target["likes"] = target.get("likes", 0) + other.get("likes", 0)
+        target["dislikes"] = target.get("dislikes", 0) + other.get("dislikes", 0)
+        aliases.append(lotto_db.store_key(other))
+        aliases.extend(other.get("aliases", []))
+
+    target["wins"] = {rank: sorted(wins[rank], reverse=True) for rank in RANKS}
+    target["aliases"] = sorted(set(aliases))
+    return target
+
+
+def load_aliases(aliases_file=ALIASES_FILE):
+    """{대표 키: {"name", "address", "aliases": [흡수된 키, ...]}}"""
+    try:
+        with open(aliases_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def alias_map(aliases):
+    """{흡수된 키: 대표 키}"""
+    return {alias: key for key, entry in aliases.items() for alias in entry["aliases"]}
+
+
+def dedup_stores(dry_run=False):
+    print("🔗 중복 판매점 병합 시작...")
+
+    if not os.path.exists(STORES_FILE):
+        print(f"❌ {STORES_FILE} 파일이 없습니다.")
+        return
+
+    with open(STORES_FILE, 'r', encoding='utf-8') as f:
+        stores = json.load(f)
+
+    clusters, review = find_duplicates(stores)
+    absorbed = sum(len(m) - 1 for m in clusters)
+    print(f"📊 판매점 {len(stores)}곳 중 중복 묶음 {len(clusters)}개 (흡수 {absorbed}곳), 검토 후보 {len(review)}쌍")
+
+    for members in clusters[:20]:
+        print("  - " + "  ⇐  ".join(f"{stores[i]['name']} | {stores[i]['address']}" for i in members))
+
+    if dry_run:
+        return
+    save_review(stores, review)
+    print(f"📝 검토 후보 {len(review)}쌍 → {REVIEW_FILE}")
+    if not clusters:
+        return
+
+    aliases = load_aliases()
+    removed = set()
+    merged = []
+    for members in clusters:
+        target = merge_cluster(stores, members)
+        removed.update(members[1:])
+        merged.append(target)
+        key = lotto_db.store_key(target)
+        aliases[key] = {"name": target["name"], "address": target["address"], "aliases": target["aliases"]}
+        # 흡수된 판매점이 대표였던 기존 항목은 정리
+        for alias in target["aliases"]:
+            aliases.pop(alias, None)
+
+    deleted_keys = [lotto_db.store_key(stores[i]) for i in sorted(removed)]
+    stores = [s for i, s in enumerate(stores) if i not in removed]
+
+    with open(ALIASES_FILE, 'w', encoding='utf-8') as f:
+        json.dump(aliases, f, ensure_ascii=False, indent=2)
+    # stores.json + 색인/순위표/회차 역색인/delta/DB
+    publish_stores(stores, merged, deleted_keys, alias_map=alias_map(aliases), stores_file=STORES_FILE)
+
+    print(f"✨ 저장 완료: 판매점 {len(stores)}곳, 별칭 {len(deleted_keys)}개 → {ALIASES_FILE}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="stores.json 중복 판매점 병합")
+    parser.add_argument("--dry-run", action="store_true", help="병합할 묶음만 출력")
+    args = parser.parse_args()
+
+    dedup_stores(dry_run=args.dry_run)
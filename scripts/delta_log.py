@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import time
+
+from lotto_db import store_key
+
+## 주간 변경분(delta) 파일 ----------------------------------------------------------------
+# 매주 history.json/stores.json 전체를 다시 받지 않도록, 실행마다 바뀐 레코드만 담은
+# 버전별 delta 파일을 남긴다. 소비자는 base 스냅샷 + 이후 delta만 적용하면 최신 상태가 된다.
+#
+#   assets/data/deltas/<kind>/index.json     {"snapshot_version", "latest_version"}
+#   assets/data/deltas/<kind>/base.json      snapshot_version 시점 전체 (공백 없이)
+#   assets/data/deltas/<kind>/v000012.json   {"version", "base_version", "upserts", "deletes"}
+#
+# kind: "history" (키 = 회차 문자열) / "stores" (키 = 이름|주소 정규화 키)
+# compact 명령으로 delta를 base에 합치고 delta 파일을 지운다.
+
+
+# --- 설정 ---
+BASE_DIR = os.getcwd()
+DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
+DELTA_DIR = os.path.join(DATA_DIR, 'deltas')
+
+KINDS = ("history", "stores")
+
+
+def record_key(kind, record):
+    return str(record["round"]) if kind == "history" else store_key(record)
+
+
+def _kind_dir(kind, delta_dir):
+    return os.path.join(delta_dir, kind)
+
+
+def _read_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path, data, minify=False):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        if minify:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        else:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_index(kind, delta_dir=DELTA_DIR):
+    return _read_json(os.path.join(_kind_dir(kind, delta_dir), "index.json"), None)
+
+
+def delta_path(kind, version, delta_dir=DELTA_DIR):
+    return os.path.join(_kind_dir(kind, delta_dir), f"v{version:06d}.json")
+
+
+def emit_delta(kind, upserts=(), deletes=(), snapshot=None, delta_dir=DELTA_DIR):
+    """
+    바뀐 레코드만 담은 다음 버전 delta 기록.
+    - upserts: 추가/변경된 레코드 목록, deletes: 삭제된 키 목록
+    - 처음 호출이면 snapshot(쓰기 후 전체 목록, 또는 그것을 돌려주는 함수)을 base로 저장하고 버전 1부터 시작
+    - 반환: 기록한 버전 (바뀐 게 없으면 None)
+    """
+    upserts = list(upserts)
+    deletes = list(deletes)
+    if not upserts and not deletes:
+        return None
+
+    folder = _kind_dir(kind, delta_dir)
+    os.makedirs(folder, exist_ok=True)
+    index = load_index(kind, delta_dir)
+
+    if index is None:
+        # base 스냅샷이 이미 이번 변경을 포함하므로 delta 파일 없이 버전만 시작
+        if snapshot is None:
+            return None
+        base = snapshot() if callable(snapshot) else snapshot
+        _write_json(os.path.join(folder, "base.json"), base, minify=True)
+        index = {"snapshot_version": 1, "latest_version": 1}
+        _write_json(os.path.join(folder, "index.json"), index)
+        return 1
+
+    version = index["latest_version"] + 1
+    delta = {
+        "kind": kind,
+        "version": version,
+        "base_version": version - 1,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "upserts": {record_key(kind, record): record for record in upserts},
+        "deletes": deletes,
+    }
+    _write_json(delta_path(kind, version, delta_dir), delta)
+    index["latest_version"] = version
+    _write_json(os.path.join(folder, "index.json"), index)
+    return version
+
+
+def diff_records(kind, old_records, new_records):
+    """전체 목록 두 개 비교 → (upserts, deletes)"""
+    old = {record_key(kind, r): r for r in old_records}
+    new_keys = set()
+    upserts = []
+    for record in new_records:
+        key = record_key(kind, record)
+        new_keys.add(key)
+        if old.get(key) != record:
+            upserts.append(record)
+    deletes = [key for key in old if key not in new_keys]
+    return upserts, deletes
+
+
+def apply_delta(kind, records, delta):
+    """목록에 delta 한 개 적용 (기존 위치 유지, 새 레코드는 history는 정렬 / stores는 뒤에 추가)"""
+    upserts = dict(delta["upserts"])
+    deletes = set(delta["deletes"])
+    result = []
+    for record in records:
+        key = record_key(kind, record)
+        if key in deletes:
+            continue
+        result.append(upserts.pop(key, record))
+    result.extend(upserts.values())
+    if kind == "history":
+        result.sort(key=lambda x: x["round"], reverse=True)
+    return result
+
+
+def materialize(kind, delta_dir=DELTA_DIR, upto=None):
+    """base + delta들을 적용한 전체 목록 (upto 버전까지)"""
+    folder = _kind_dir(kind, delta_dir)
+    index = load_index(kind, delta_dir)
+    if index is None:
+        return []
+    records = _read_json(os.path.join(folder, "base.json"), [])
+    last = index["latest_version"] if upto is None else upto
+    for version in range(index["snapshot_version"] + 1, last + 1):
+        records = apply_delta(kind, records, _read_json(delta_path(kind, version, delta_dir), None))
+    return records
+
+
+def compact(kind, delta_dir=DELTA_DIR):
+    """delta들을 base 스냅샷에 합치고 delta 파일 삭제, 합친 delta 수 반환"""
+    folder = _kind_dir(kind, delta_dir)
+    index = load_index(kind, delta_dir)
+    if index is None or index["latest_version"] == index["snapshot_version"]:
+        return 0
+
+    records = materialize(kind, delta_dir)
+    _write_json(os.path.join(folder, "base.json"), records, minify=True)
+    folded = index["latest_version"] - index["snapshot_version"]
+    old_snapshot = index["snapshot_version"]
+    index["snapshot_version"] = index["latest_version"]
+    _write_json(os.path.join(folder, "index.json"), index)
+
+    for version in range(old_snapshot + 1, index["latest_version"] + 1):
+        try:
+            os.remove(delta_path(kind, version, delta_dir))
+        except OSError:
+            pass
+    return folded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="history/stores delta 관리")
+    parser.add_argument("command", choices=["compact", "verify"],
+                        help="compact: delta를 base에 합침 / verify: base+delta가 현재 파일과 같은지 확인")
+    parser.add_argument("kind", choices=KINDS)
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        folded = compact(args.kind)
+        print(f"✨ {args.kind}: delta {folded}개를 base 스냅샷에 합쳤습니다.")
+    else:
+        live_file = os.path.join(DATA_DIR, f"{args.kind}.json")
+        live = _read_json(live_file, [])
+        rebuilt = materialize(args.kind)
+        upserts, deletes = diff_records(args.kind, live, rebuilt)
+        if upserts or deletes:
+            print(f"❌ {args.kind}: 현재 파일과 {len(upserts)}건 다르고 {len(deletes)}건 빠져 있습니다.")
+        else:
+            print(f"✅ {args.kind}: base + delta = {live_file}")
@@ -0,0 +1,167 @@
+import json
+import os
+import re
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # numpy는 선택 의존성 (없으면 열 저장소를 만들지 않음)
+    np = None
+
+## 회차 데이터 열(column) 저장소 --------------------------------------------------------
+# history.json(수 MB, 중첩 dict)을 매번 json.load 하지 않도록
+# 회차 순(오름차순) 배열을 .npy 파일로 따로 저장하고 memory-map으로 읽는다.
+#   rounds.npy   int32[N]
+#   dates.npy    datetime64[D][N]
+#   numbers.npy  uint8[N, 6]
+#   bonus.npy    uint8[N]
+#   prize.npy    int64[N, 3]   (1등, 2등, 3등 1게임당 당첨금)
+#   winners.npy  int64[N, 3]
+#   meta.json    {"count", "max_round", "ranks"}
+
+
+# --- 설정 ---
+BASE_DIR = os.getcwd()
+DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
+COLUMNS_DIR = os.path.join(DATA_DIR, 'columns')
+
+RANKS = ["1st", "2nd", "3rd"]
+COLUMN_NAMES = ["rounds", "dates", "numbers", "bonus", "prize", "winners"]
+
+# "2025년 11월 29일" / "2025-11-22" 둘 다 있음
+_DATE_RE = re.compile(r"(\d{4})\D+(\d{1,2})\D+(\d{1,2})")
+
+
+def is_available():
+    return np is not None
+
+
+def parse_date(text):
+    """history.json 날짜 문자열 → 'YYYY-MM-DD' (실패 시 None)"""
+    match = _DATE_RE.search(text or "")
+    if not match:
+        return None
+    y, m, d = match.groups()
+    return f"{int(y):04d}-{int(m):02d}-{int(d):02d}"
+
+
+def _to_arrays(records):
+    records = sorted(records, key=lambda x: x["round"])
+    return {
+        "rounds": np.array([r["round"] for r in records], dtype=np.int32),
+        "dates": np.array([parse_date(r.get("date")) or "NaT" for r in records], dtype="datetime64[D]"),
+        "numbers": np.array([r["numbers"] for r in records], dtype=np.uint8).reshape(-1, 6),
+        "bonus": np.array([r["bonus"] for r in records], dtype=np.uint8),
+        "prize": np.array([[r["result"].get(k, {}).get("prize", 0) for k in RANKS] for r in records],
+                          dtype=np.int64).reshape(-1, len(RANKS)),
+        "winners": np.array([[r["result"].get(k, {}).get("winners", 0) for k in RANKS] for r in records],
+                            dtype=np.int64).reshape(-1, len(RANKS)),
+    }
+
+
+def _write(arrays, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    for name in COLUMN_NAMES:
+        tmp_path = os.path.join(out_dir, f"{name}.tmp.npy")
+        np.save(tmp_path, arrays[name])
+        os.replace(tmp_path, os.path.join(out_dir, f"{name}.npy"))
+
+    rounds = arrays["rounds"]
+    meta = {
+        "count": int(len(rounds)),
+        "max_round": int(rounds[-1]) if len(rounds) else 0,
+        "ranks": RANKS,
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def export_columns(history_data, out_dir=COLUMNS_DIR):
+    """history 전체로 열 저장소 다시 만들기 (numpy 없으면 False)"""
+    if np is None:
+        return False
+    _write(_to_arrays(history_data), out_dir)
+    return True
+
+
+def append_columns(records, out_dir=COLUMNS_DIR):
+    """
+    기존 최대 회차보다 새로운 회차만 뒤에 이어 붙임.
+    - 열 저장소가 없거나 새 회차가 기존보다 오래됐으면 False (전체 재생성 필요)
+    """
+    if np is None or not records:
+        return False
+    try:
+        with open(os.path.join(out_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        old = {name: np.load(os.path.join(out_dir, f"{name}.npy")) for name in COLUMN_NAMES}
+    except (OSError, ValueError):
+        return False
+
+    if min(r["round"] for r in records) <= meta["max_round"]:
+        return False
+
+    new = _to_arrays(records)
+    _write({name: np.concatenate([old[name], new[name]]) for name in COLUMN_NAMES}, out_dir)
+    return True
+
+
+class DrawColumns:
+    """
+    열 저장소 읽기 결과 (기본은 memory-map, 실제 접근한 부분만 메모리에 올라감).
+    - rounds / dates / numbers / bonus / prize / winners : numpy 배열
+    - draw(round_no) : 한 회차 dict
+    """
+
+    def __init__(self, arrays):
+        self.rounds = arrays["rounds"]
+        self.dates = arrays["dates"]
+        self.numbers = arrays["numbers"]
+        self.bonus = arrays["bonus"]
+        self.prize = arrays["prize"]
+        self.winners = arrays["winners"]
+
+    def __len__(self):
+        return len(self.rounds)
+
+    def index_of(self, round_no):
+        idx = int(np.searchsorted(self.rounds, round_no))
+        if idx >= len(self.rounds) or self.rounds[idx] != round_no:
+            raise KeyError(round_no)
+        return idx
+
+    def draw(self, round_no):
+        i = self.index_of(round_no)
+        return {
+            "round": int(self.rounds[i]),
+            "date": str(self.dates[i]),
+            "numbers": [int(n) for n in self.numbers[i]],
+            "bonus": int(self.bonus[i]),
+            "prize": {k: int(v) for k, v in zip(RANKS, self.prize[i])},
+            "winners": {k: int(v) for k, v in zip(RANKS, self.winners[i])},
+        }
+
+
+def load_draws(columns_dir=COLUMNS_DIR, mmap=True):
+    """열 저장소 읽기 (mmap=True면 memory-map)"""
+    if np is None:
+        raise RuntimeError("numpy가 설치되어 있지 않습니다. (pip install numpy)")
+    mode = "r" if mmap else None
+    return DrawColumns({
+        name: np.load(os.path.join(columns_dir, f"{name}.npy"), mmap_mode=mode)
+        for name in COLUMN_NAMES
+    })
+
+
+if __name__ == "__main__":
+    # history.json에서 열 저장소 다시 만들기
+    if np is None:
+        print("❌ numpy가 설치되어 있지 않습니다. (pip install numpy)")
+        sys.exit(1)
+
+    history_file = os.path.join(DATA_DIR, 'history.json')
+    with open(history_file, 'r', encoding='utf-8') as f:
+        history = json.load(f)
+
+    export_columns(history)
+    print(f"✨ {len(history)}개 회차 → {COLUMNS_DIR}")
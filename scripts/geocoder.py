@@ -0,0 +1,413 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import lotto_db
+import metrics
+from http_client import create_session, robust_request
+from journal import JsonlJournal
+from rate_limiter import AdaptiveRateLimiter
+from stores_io import publish_stores
+
+## 판매점 좌표 변환 (동시 요청 + 주소 캐시 + 제공자 순차 대체) ---------------------------------
+# 좌표가 없는(0.0) 판매점만 골라 주소 → 좌표로 바꾼다.
+#   1. 같은 주소는 한 번만 요청 (여러 판매점이 같은 주소를 공유)
+#      묶는 기준은 실제로 보내는 정제 검색어 (괄호·쉼표 뒤 상세주소 제거 + 공백 정리)
+#   2. 이전에 찾은 주소는 geocode_cache.json에서 바로 채움 (재실행 시 네트워크 0회)
+#      모든 제공자가 결과 없음으로 답한 주소도 NEGATIVE_TTL_DAYS 동안은 다시 묻지 않음
+#   3. 남은 주소만 작업자 여러 개로 동시 요청, 주소마다 CHAIN 순서대로 시도
+#      (kakao 원본 → kakao 정제 주소 → google 정제 주소, 제공자별 속도 제한은 따로)
+#   4. 결과는 나올 때마다 geocode.journal.jsonl에 한 줄씩만 추가하고,
+#      stores.json/캐시는 끝날 때 한 번만 저장 → 중간에 끊겨도 다음 실행이 저널부터 재생
+#
+#   python scripts/geocoder.py --workers 8
+#   python scripts/geocoder.py --chain google:clean
+
+
+# --- 설정 ---
+BASE_DIR = os.getcwd()
+DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
+STORES_FILE = os.path.join(DATA_DIR, 'stores.json')
+GEOCODE_CACHE_FILE = os.path.join(DATA_DIR, 'geocode_cache.json')
+GEOCODE_JOURNAL_FILE = os.path.join(DATA_DIR, 'geocode.journal.jsonl')
+
+GEOCODE_WORKERS = 8
+NEGATIVE_TTL_DAYS = 30    # 어디서도 못 찾은 주소를 다시 묻기까지 기간
+
+# (제공자, 주소 형태) 시도 순서 - raw: 원본 주소 / clean: 괄호·쉼표 뒤 제거
+CHAIN = [("kakao", "raw"), ("kakao", "clean"), ("google", "clean")]
+
+# 제공자별 엔드포인트/속도 제한 (초당 요청 수)
+# - KAKAO_GEOCODE_URL / GOOGLE_GEOCODE_URL로 주소를 바꿀 수 있음 (로컬 대역 서버 등)
+PROVIDERS = {
+    "kakao": {
+        "url": os.environ.get("KAKAO_GEOCODE_URL", "https://dapi.kakao.com/v2/local/search/address.json"),
+        "max_rps": 10.0,
+    },
+    "google": {
+        "url": os.environ.get("GOOGLE_GEOCODE_URL", "https://maps.googleapis.com/maps/api/geocode/json"),
+        "max_rps": 10.0,
+    },
+}
+
+API_KEYS = {
+    "kakao": os.environ.get("KAKAO_API_KEY", ""),
+    "google": os.environ.get("GOOGLE_API_KEY", ""),
+}
+
+# 제공자가 정상 응답했지만 결과가 없음 (None은 요청 자체 실패)
+NOT_FOUND = "not_found"
+
+
+def normalize_address(address):
+    """앞뒤/중복 공백 정리"""
+    return " ".join((address or "").split())
+
+
+def clean_address_string(address):
+    """괄호 / 쉼표 뒤 상세주소 제거"""
+    return address.split('(')[0].split(',')[0].strip()
+
+
+def address_key(address):
+    """
+    중복 제거/캐시 키: 정제 검색어(clean) + 공백 정리.
+    - "강남구 1 (1층)"과 "강남구 1, 2층"은 같은 검색어를 보내므로 한 주소로 봄
+    - 정제하면 비는 주소는 원본 기준
+    """
+    return normalize_address(clean_address_string(address or "")) or normalize_address(address)
+
+
+def is_online(address):
+    return "dhlottery.co.kr" in address or "동행복권" in address
+
+
+class GeocodeCache:
+    """
+    주소 → 좌표 캐시 (JSON 파일 하나).
+    - entries: {address_key(주소): {"lat", "lng", "provider", "ts"}}
+      결과 없음은 {"not_found": true, "tried": ["kakao:raw", ...], "ts"}
+      (negative_ttl이 지났거나 이번 chain에 아직 안 해본 단계가 있으면 없는 것으로 봄)
+    - 여러 작업자 스레드에서 put 하므로 잠금 사용
+    """
+
+    def __init__(self, path=GEOCODE_CACHE_FILE, negative_ttl=NEGATIVE_TTL_DAYS * 86400):
+        self.path = path
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.entries = self._rekey(self.entries)
+
+    @staticmethod
+    def _rekey(entries):
+        """예전(공백 정리만 한 원본 주소) 키로 저장된 캐시를 address_key로 합침 (좌표 항목 우선)"""
+        merged = {}
+        for address, entry in entries.items():
+            key = address_key(address)
+            if key not in merged or merged[key].get("not_found"):
+                merged[key] = entry
+        return merged
+
+    def get(self, address, chain=()):
+        """좌표 항목 / 아직 유효한 결과 없음 항목 / None(다시 물어봐야 함)"""
+        entry = self.entries.get(address_key(address))
+        if entry is not None and entry.get("not_found"):
+            if time.time() - entry["ts"] > self.negative_ttl:
+                return None
+            if any(f"{p}:{v}" not in entry.get("tried", []) for p, v in chain):
+                return None
+        return entry
+
+    def tried_steps(self, address):
+        """아직 유효한 결과 없음 항목에서 이미 해본 단계 ("kakao:raw" 등)"""
+        entry = self.entries.get(address_key(address))
+        if entry is None or not entry.get("not_found") or time.time() - entry["ts"] > self.negative_ttl:
+            return []
+        return entry.get("tried", [])
+
+    def put(self, address, lat, lng, provider):
+        with self._lock:
+            self.entries[address_key(address)] = {
+                "lat": lat, "lng": lng, "provider": provider, "ts": int(time.time()),
+            }
+
+    def put_not_found(self, address, chain, tried=()):
+        steps = sorted(set(tried) | {f"{p}:{v}" for p, v in chain})
+        with self._lock:
+            self.entries[address_key(address)] = {"not_found": True, "tried": steps, "ts": int(time.time())}
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self.entries, ensure_ascii=False, indent=1, sort_keys=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+
+# --- 제공자별 요청 (좌표 / NOT_FOUND / 실패 시 None) ---
+
+def kakao_lookup(session, limiter, query, api_key):
+    resp = robust_request(
+        session, limiter, "GET", PROVIDERS["kakao"]["url"], desc=f"kakao '{query}'",
+        max_retries=4, timeout=5,
+        headers={"Authorization": f"KakaoAK {api_key}"}, params={"query": query},
+    )
+    if resp is None:
+        return None
+    documents = resp.json().get('documents', [])
+    if not documents:
+        return NOT_FOUND
+    # 보통 첫 번째 결과가 가장 정확함
+    return float(documents[0]['y']), float(documents[0]['x'])
+
+
+def google_lookup(session, limiter, query, api_key):
+    resp = robust_request(
+        session, limiter, "GET", PROVIDERS["google"]["url"], desc=f"google '{query}'",
+        max_retries=4, timeout=10,
+        params={"address": query, "key": api_key, "language": "ko"},
+    )
+    if resp is None:
+        return None
+    result = resp.json()
+    if result.get('status') == 'OK':
+        location = result['results'][0]['geometry']['location']
+        return location['lat'], location['lng']
+    if result.get('status') == 'ZERO_RESULTS':
+        return NOT_FOUND
+    # OVER_QUERY_LIMIT / REQUEST_DENIED 등은 실패로 보고 다음 실행에 다시 시도
+    print(f"\n⚠️ google '{query}' 상태: {result.get('status')}")
+    return None
+
+
+LOOKUPS = {"kakao": kakao_lookup, "google": google_lookup}
+
+
+VARIANTS = {"raw": normalize_address, "clean": address_key}
+
+
+def parse_chain(text):
+    """"kakao:raw,google:clean" → [("kakao", "raw"), ("google", "clean")]"""
+    chain = []
+    for step in text.split(","):
+        provider, _, variant = step.strip().partition(":")
+        if provider not in PROVIDERS or (variant or "raw") not in VARIANTS:
+            raise ValueError(f"알 수 없는 단계: {step}")
+        chain.append((provider, variant or "raw"))
+    return chain
+
+
+def chain_queries(chain, address):
+    """주소 하나에 대해 실제로 보낼 (제공자, 검색어) 순서 (같은 제공자에 같은 검색어는 한 번만)"""
+    queries = []
+    for provider, variant in chain:
+        query = VARIANTS[variant](address)
+        if len(query) > 2 and (provider, query) not in queries:
+            queries.append((provider, query))
+    return queries
+
+
+def geocode_address(session, limiters, chain, address, api_keys, skip=()):
+    """
+    주소 하나를 chain 순서대로 시도 → ((lat, lng), 제공자) / (NOT_FOUND, None) / (None, None)
+    - 어느 단계든 좌표를 찾으면 바로 끝
+    - skip: 최근에 이미 결과 없음으로 끝난 단계 ("kakao:raw" 등)는 건너뜀
+    - 요청 실패가 한 번이라도 있으면 결과 없음이 아니라 실패로 봄 (negative 캐시에 넣지 않음)
+    """
+    chain = [(p, v) for p, v in chain if f"{p}:{v}" not in skip]
+    failed = False
+    for provider, query in chain_queries(chain, address):
+        with metrics.timer("geocode", provider=provider):
+            result = LOOKUPS[provider](session, limiters[provider], query, api_keys[provider])
+        if result is None:
+            failed = True
+        elif result != NOT_FOUND:
+            return result, provider
+    return (None, None) if failed else (NOT_FOUND, None)
+
+
+def pending_addresses(stores):
+    """좌표가 없는 판매점을 검색어별로 묶음 → {address_key(주소): [stores 위치, ...]} (온라인 제외)"""
+    groups = {}
+    for pos, store in enumerate(stores):
+        address = store.get('address', '')
+        if is_online(address):
+            continue
+        if store.get('lat', 0.0) != 0.0 and store.get('lng', 0.0) != 0.0:
+            continue
+        groups.setdefault(address_key(address), []).append(pos)
+    return groups
+
+
+def replay_journal(journal, cache):
+    """이전 실행이 중간에 끊겼으면 저널의 결과를 캐시에 먼저 반영 → 반영한 주소 수"""
+    records = journal.read_all()
+    for record in records:
+        if record.get("not_found"):
+            cache.put_not_found(record["address"], (), record.get("tried", []))
+        else:
+            cache.put(record["address"], record["lat"], record["lng"], record["provider"])
+    return len(records)
+
+
+def geocode_stores(stores, chain=None, workers=GEOCODE_WORKERS, api_keys=None, cache=None, journal=None):
+    """
+    stores 목록의 빈 좌표 채우기 (목록을 직접 수정).
+    - chain: [(제공자, 주소 형태), ...] (기본 CHAIN, API 키가 없는 제공자 단계는 뺌)
+    - journal: 결과를 한 줄씩 남길 JsonlJournal (남아 있는 기록은 먼저 재생)
+    - 캐시 파일 저장은 호출한 쪽에서 (run_geocoder는 stores.json과 함께 한 번)
+    반환: (좌표가 바뀐 판매점 위치 목록, 통계 dict)
+    """
+    api_keys = dict(API_KEYS, **{k: v for k, v in (api_keys or {}).items() if v})
+    chain = [step for step in (chain or CHAIN) if api_keys.get(step[0])]
+    if cache is None:
+        cache = GeocodeCache()
+    if journal is not None:
+        replayed = replay_journal(journal, cache)
+        if replayed:
+            print(f"♻️ 이전 실행 저널에서 {replayed}개 주소 결과 복구")
+
+    groups = pending_addresses(stores)
+    updated = []
+    stats = {"pending_stores": sum(len(v) for v in groups.values()), "unique_addresses": len(groups),
+             "cache_hits": 0, "negative_hits": 0, "requested": 0, "found": 0, "not_found": 0,
+             "failed": 0, "by_provider": {}}
+
+    def apply(address, lat, lng):
+        for pos in groups[address]:
+            stores[pos]['lat'] = lat
+            stores[pos]['lng'] = lng
+            updated.append(pos)
+
+    # 1. 캐시에 있는 주소는 바로 채움
+    todo = []
+    for address in groups:
+        entry = cache.get(address, chain)
+        if entry is None:
+            todo.append(address)
+        elif entry.get("not_found"):
+            stats["negative_hits"] += 1
+            metrics.inc("geocode_cache_total", result="negative")
+        else:
+            apply(address, entry["lat"], entry["lng"])
+            stats["cache_hits"] += 1
+            metrics.inc("geocode_cache_total", result="hit")
+
+    print(f"📊 좌표 없는 판매점 {stats['pending_stores']}곳 → 주소 {len(groups)}개 "
+          f"(캐시 {stats['cache_hits']}개, 최근 실패 {stats['negative_hits']}개, 요청 {len(todo)}개)")
+    if not todo:
+        return updated, stats
+    if not chain:
+        print("❌ API 키가 있는 제공자가 없습니다.")
+        return updated, stats
+    print(f"🔗 시도 순서: {' → '.join(f'{p}:{v}' for p, v in chain)}")
+
+    # 2. 남은 주소만 동시 요청 (제공자마다 속도 제한 따로)
+    session = create_session(pool_size=workers)
+    limiters = {
+        provider: AdaptiveRateLimiter(initial_rate=PROVIDERS[provider]["max_rps"] / 2, min_rate=0.5,
+                                      max_rate=PROVIDERS[provider]["max_rps"], name=provider)
+        for provider in {p for p, _ in chain}
+    }
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        tried = {address: cache.tried_steps(address) for address in todo}
+        # 묶음의 첫 판매점 주소로 요청 (raw 단계도 묶음당 한 번)
+        futures = {executor.submit(geocode_address, session, limiters, chain,
+                                   stores[groups[address][0]].get('address', ''), api_keys,
+                                   tried[address]): address
+                   for address in todo}
+        for done, future in enumerate(as_completed(futures), 1):
+            address = futures[future]
+            stats["requested"] += 1
+            result, provider = future.result()
+            keys = [lotto_db.store_key(stores[pos]) for pos in groups[address]]
+            metrics.gauge("queue_depth", len(todo) - done, queue="geocode")
+            if result is None:
+                stats["failed"] += 1
+                metrics.inc("geocode_total", result="failed")
+            elif result == NOT_FOUND:
+                cache.put_not_found(address, chain, tried[address])
+                if journal is not None:
+                    journal.append({"address": address, "keys": keys, "not_found": True,
+                                    "tried": cache.entries[address]["tried"]})
+                stats["not_found"] += 1
+                metrics.inc("geocode_total", result="not_found")
+            else:
+                lat, lng = result
+                cache.put(address, lat, lng, provider)
+                if journal is not None:
+                    journal.append({"address": address, "keys": keys, "lat": lat, "lng": lng,
+                                    "provider": provider})
+                apply(address, lat, lng)
+                stats["found"] += 1
+                metrics.inc("geocode_total", result="found", provider=provider)
+                stats["by_provider"][provider] = stats["by_provider"].get(provider, 0) + 1
+            if done % 100 == 0 or done == len(todo):
+                rate = done / max(time.time() - started, 1e-9)
+                print(f"  ⏱️ {done}/{len(todo)} 주소 처리 ({rate:.1f}개/초)")
+
+    stats["limiter"] = [limiter.stats() for limiter in limiters.values()]
+    return updated, stats
+
+
+def save_geocoded(stores, updated_positions):
+    """좌표가 바뀐 경우 stores.json 한 번 저장 (색인/순위표/delta/DB는 publish_stores가 같이 갱신)"""
+    if not updated_positions:
+        return
+    publish_stores(stores, [stores[pos] for pos in sorted(set(updated_positions))], stores_file=STORES_FILE)
+
+
+def run_geocoder(chain=None, workers=GEOCODE_WORKERS, api_keys=None):
+    print(f"🚀 좌표 업데이트를 시작합니다... (작업자 {workers}개)")
+
+    if not os.path.exists(STORES_FILE):
+        print(f"❌ {STORES_FILE} 파일이 없습니다. 먼저 stores.json을 생성해주세요.")
+        return
+
+    with open(STORES_FILE, 'r', encoding='utf-8') as f:
+        stores = json.load(f)
+
+    cache = GeocodeCache()
+    journal = JsonlJournal(GEOCODE_JOURNAL_FILE)
+    updated, stats = geocode_stores(stores, chain, workers, api_keys, cache, journal)
+
+    # 끝날 때 한 번만 병합/저장, 저장이 끝난 뒤에 저널 삭제
+    save_geocoded(stores, updated)
+    cache.save()
+    journal.clear()
+    metrics.flush()
+
+    print("\n" + "=" * 50)
+    print("🎉 작업 완료!")
+    print(f" - 좌표 없는 판매점: {stats['pending_stores']}곳 (주소 {stats['unique_addresses']}개)")
+    print(f" - 캐시로 채움: {stats['cache_hits']}개 주소 (최근 실패로 건너뜀 {stats['negative_hits']}개)")
+    print(f" - 요청: {stats['requested']}개 (성공 {stats['found']} {stats['by_provider']}, "
+          f"결과 없음 {stats['not_found']}, 실패 {stats['failed']})")
+    print(f" - 좌표 갱신 판매점: {len(set(updated))}곳")
+    if "limiter" in stats:
+        print(f" - 요청 통계: {stats['limiter']}")
+    print("=" * 50)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="판매점 주소 → 좌표 변환")
+    parser.add_argument("--chain", default=",".join(f"{p}:{v}" for p, v in CHAIN),
+                        help="시도 순서 (예: kakao:raw,kakao:clean,google:clean)")
+    parser.add_argument("--workers", type=int, default=GEOCODE_WORKERS, help="동시 요청 작업자 수")
+    args = parser.parse_args()
+
+    chain = parse_chain(args.chain)
+    if not any(API_KEYS[provider] for provider, _ in chain):
+        print("❌ 오류: KAKAO_API_KEY / GOOGLE_API_KEY 환경변수에 API 키를 넣어주세요.")
+    else:
+        run_geocoder(chain, args.workers)
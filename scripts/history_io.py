@@ -0,0 +1,274 @@
+import json
+import os
+import re
+
+import delta_log
+import draw_columns
+import lotto_db
+import publish_history
+from journal import JsonlJournal
+
+## history.json 읽기/쓰기 + 수집 저널 압축 ------------------------------------------------
+# 크롤 중에는 회차마다 저널(history.journal.jsonl)에 한 줄씩만 추가하고,
+# history.json은 끝날 때(또는 --compact 요청 시) 한 번만 다시 쓴다.
+# LOTTO_DB가 설정돼 있으면 바뀐 회차는 DB에만 쓰고 history.json은 DB에서 내보낸다 (export_from_db).
+
+# history.json은 최신 회차가 맨 앞이므로 앞부분만 읽으면 최대 회차를 알 수 있음
+_ROUND_RE = re.compile(r'"round"\s*:\s*(\d+)')
+_PEEK_BYTES = 4096
+
+
+def index_path(history_file):
+    return os.path.splitext(history_file)[0] + ".index.json"
+
+
+def columns_dir(history_file):
+    return os.path.join(os.path.dirname(history_file), "columns")
+
+
+def shard_dir(history_file):
+    return os.path.join(os.path.dirname(history_file), "history")
+
+
+def delta_dir(history_file):
+    return os.path.join(os.path.dirname(history_file), "deltas")
+
+
+def record_delta(history_file, records):
+    """바뀐 회차만 담은 history delta 기록 (처음이면 현재 history.json을 base로)"""
+    return delta_log.emit_delta("history", records, snapshot=lambda: load_history(history_file),
+                                delta_dir=delta_dir(history_file))
+
+
+def journal_path(history_file):
+    return os.path.splitext(history_file)[0] + ".journal.jsonl"
+
+
+def open_journal(history_file):
+    return JsonlJournal(journal_path(history_file))
+
+
+def load_history(history_file):
+    if not os.path.exists(history_file):
+        return []
+    try:
+        with open(history_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        return []
+
+
+def _shards_cover(shards, first, last):
+    """샤드 범위들이 first~last 회차를 빈틈없이 덮는지"""
+    next_round = first
+    for entry in sorted(shards, key=lambda e: e["from"]):
+        if entry["to"] < next_round:
+            continue
+        if entry["from"] > next_round:
+            return False
+        next_round = entry["to"] + 1
+        if next_round > last:
+            return True
+    return next_round > last
+
+
+def load_rounds_since(history_file, after_round):
+    """
+    after_round보다 새로운 회차만 (최신순).
+    - 배포용 샤드가 최신이고 after_round 다음 회차부터 빈틈없이 덮으면 해당 샤드만 읽음
+    - 아니면(샤드 누락, 회차 수 불일치 등) history.json 전체에서 골라냄
+    """
+    index = load_round_index(history_file)
+    if index["max_round"] <= after_round:
+        return []
+
+    folder = shard_dir(history_file)
+    manifest = publish_history.load_manifest(folder)
+    if (manifest["latest_round"] == index["max_round"]
+            and _shards_cover(manifest["shards"], after_round + 1, index["max_round"])):
+        records = []
+        try:
+            for entry in manifest["shards"]:
+                if entry["to"] <= after_round:
+                    continue
+                with open(os.path.join(folder, entry["file"]), "r", encoding="utf-8") as f:
+                    records.extend(item for item in json.load(f) if item["round"] > after_round)
+        except (OSError, ValueError):
+            records = None
+        # 샤드 내용이 history.json과 같은 회차 수일 때만 사용
+        expected = sum(1 for r in index["rounds"] if r > after_round)
+        if records is not None and len(records) == expected:
+            return sorted(records, key=lambda x: x["round"], reverse=True)
+
+    return [item for item in load_history(history_file) if item["round"] > after_round]
+
+
+def _replace_file(path, text):
+    """임시 파일에 쓰고 교체 (쓰는 도중 죽어도 기존 파일 유지)"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write_history(history_file, history_data, changed=None):
+    """
+    최신순 정렬 후 history.json 저장 + 회차 인덱스/열 저장소/샤드 갱신.
+    - LOTTO_DB가 설정돼 있으면 changed(없으면 전체)만 DB에 넣고 history.json은 DB에서 내보냄
+      (history_data도 내보낸 내용으로 바뀜)
+    """
+    exported = export_from_db(history_file, history_data if changed is None else changed)
+    if exported is None:
+        history_data.sort(key=lambda x: x["round"], reverse=True)
+        _replace_file(history_file, json.dumps(history_data, ensure_ascii=False, indent=2))
+    else:
+        history_data[:] = exported
+    _publish_derived(history_file, history_data)
+
+
+def _publish_derived(history_file, history_data):
+    """history.json을 새로 쓴 뒤 파생 파일 전체 갱신"""
+    save_round_index(history_file, [item["round"] for item in history_data])
+    # numpy가 있으면 memory-map용 열 저장소도 같이 갱신
+    draw_columns.export_columns(history_data, columns_dir(history_file))
+    # 앱 배포용 샤드 (내용이 바뀐 샤드만 다시 씀)
+    publish_history.publish_all(history_data, shard_dir(history_file))
+
+
+def export_from_db(history_file, records):
+    """
+    LOTTO_DB가 설정돼 있으면 DB가 쓰기 대상: records만 DB에 upsert하고 history.json은 DB에서 내보냄.
+    - DB가 비어 있으면 기존 history.json/stores.json부터 가져옴 (처음 켰을 때 기존 회차가 빠지지 않게)
+    - 반환: 내보낸 전체 회차 (최신순), DB를 쓰지 않으면 None → 호출한 쪽이 JSON을 직접 씀
+    """
+    conn = lotto_db.connect_if_enabled()
+    if conn is None:
+        return None
+    try:
+        lotto_db.import_json(conn, history_file, os.path.join(os.path.dirname(history_file), "stores.json"),
+                             only_empty=True)
+        lotto_db.upsert_draws(conn, records)
+        return lotto_db.export_history(conn, history_file)
+    finally:
+        conn.close()
+
+
+def _dump_record(record):
+    """json.dump(indent=2) 리스트 안의 원소와 같은 모양으로 직렬화"""
+    text = json.dumps(record, ensure_ascii=False, indent=2)
+    return "\n".join("  " + line for line in text.split("\n"))
+
+
+def prepend_history(history_file, records):
+    """
+    기존 최대 회차보다 새로운 회차들을 history.json 앞쪽에 끼워 넣음.
+    - 기존 내용은 JSON 디코딩 없이 텍스트 그대로 이어 붙임 (write_history 결과와 같은 바이트)
+    - 새 회차가 기존보다 오래됐거나 파일 모양이 예상과 다르면 전체 병합으로 처리
+    - LOTTO_DB가 설정돼 있으면 새 회차만 DB에 넣고 history.json은 DB에서 내보냄
+    """
+    if not records:
+        return
+    records = sorted(records, key=lambda x: x["round"], reverse=True)
+
+    exported = export_from_db(history_file, records)
+    if exported is not None:
+        _publish_derived(history_file, exported)
+        record_delta(history_file, records)
+        return
+
+    index = load_round_index(history_file)
+    text = None
+    if os.path.exists(history_file):
+        with open(history_file, "r", encoding="utf-8") as f:
+            text = f.read()
+
+    if (text is None or not text.startswith("[\n  {")
+            or records[-1]["round"] <= index["max_round"]):
+        by_round = {item["round"]: item for item in load_history(history_file)}
+        for record in records:
+            by_round[record["round"]] = record
+        write_history(history_file, list(by_round.values()))
+        return
+
+    block = ",\n".join(_dump_record(record) for record in records)
+    _replace_file(history_file, "[\n" + block + ",\n" + text[2:])
+    save_round_index(history_file, index["rounds"] + [record["round"] for record in records])
+    publish_history.publish_rounds(records, shard_dir(history_file), load_all=lambda: load_history(history_file))
+    record_delta(history_file, records)
+
+    # 열 저장소가 이미 있으면 새 회차만 이어 붙임 (어긋나 있으면 전체 재생성)
+    out_dir = columns_dir(history_file)
+    if draw_columns.is_available() and os.path.exists(os.path.join(out_dir, "meta.json")):
+        if not draw_columns.append_columns(records, out_dir):
+            draw_columns.export_columns(load_history(history_file), out_dir)
+
+
+# --- 회차 인덱스 (history.index.json) ---
+# history.json 전체를 디코딩하지 않고 저장된 회차를 알기 위한 사이드카.
+# history.json 크기/첫 회차가 기록과 다르면(수동 편집 등) 한 번 전체를 읽어 다시 만든다.
+
+def save_round_index(history_file, rounds):
+    rounds = sorted(set(rounds))
+    index = {
+        "max_round": rounds[-1] if rounds else 0,
+        "count": len(rounds),
+        "history_size": os.path.getsize(history_file) if os.path.exists(history_file) else 0,
+        "rounds": rounds,
+    }
+    _replace_file(index_path(history_file), json.dumps(index, separators=(",", ":")))
+    return index
+
+
+def load_round_index(history_file):
+    """{'max_round', 'count', 'history_size', 'rounds'} (오래됐으면 다시 생성)"""
+    size = os.path.getsize(history_file) if os.path.exists(history_file) else 0
+    try:
+        with open(index_path(history_file), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index["history_size"] == size and index["max_round"] == peek_max_round(history_file):
+            return index
+    except (OSError, ValueError, KeyError):
+        pass
+
+    return save_round_index(history_file, [item["round"] for item in load_history(history_file)])
+
+
+def peek_max_round(history_file):
+    """history.json 전체를 읽지 않고 첫 레코드의 회차만 확인 (없으면 0)"""
+    if not os.path.exists(history_file):
+        return 0
+    with open(history_file, "r", encoding="utf-8", errors="ignore") as f:
+        match = _ROUND_RE.search(f.read(_PEEK_BYTES))
+    return int(match.group(1)) if match else 0
+
+
+def last_round(history_file):
+    """history.json + 저널 기준 마지막으로 수집된 회차"""
+    last = open_journal(history_file).last()
+    journal_round = last["round"] if last else 0
+    return max(peek_max_round(history_file), journal_round)
+
+
+def compact_history(history_file):
+    """
+    저널 내용을 history.json에 합치고 저널 삭제.
+    - 같은 회차는 저널 쪽이 우선
+    - 반환: 합쳐진 저널 레코드 수
+    """
+    journal = open_journal(history_file)
+    records = journal.read_all()
+    if not records:
+        return 0
+
+    exported = export_from_db(history_file, records)
+    if exported is not None:
+        # DB 모드: 저널 회차만 DB에 넣었으므로 history.json 전체를 다시 읽을 필요 없음
+        _publish_derived(history_file, exported)
+    else:
+        by_round = {item["round"]: item for item in load_history(history_file)}
+        for record in records:
+            by_round[record["round"]] = record
+        write_history(history_file, list(by_round.values()))
+    record_delta(history_file, records)
+    journal.clear()
+    return len(records)
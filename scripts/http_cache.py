@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+## 원본 응답 디스크 캐시 ----------------------------------------------------------
+# 파서 버그를 고칠 때마다 동행복권 전체를 다시 받지 않도록,
+# 요청(메서드 + URL + POST 폼 데이터) 해시를 키로 원본 응답 본문을 저장한다.
+# - 용량 상한을 넘으면 가장 오래 안 쓴 항목부터 삭제 (LRU, 파일 mtime 기준)
+# - 서버가 ETag/Last-Modified를 주면 조건부 요청으로 304 재사용
+# - offline(재생) 모드에서는 네트워크 없이 캐시만 사용
+
+
+class CachedResponse:
+    """캐시에서 꺼낸 응답 (requests.Response와 같은 방식으로 사용)"""
+
+    from_cache = True
+
+    def __init__(self, url, status_code, headers, content, encoding):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        pass
+
+
+class ResponseCache:
+    """
+    요청 해시 → (본문 파일, 메타 JSON) 저장소.
+    - <cache_dir>/<앞 2글자>/<해시>.body
+    - <cache_dir>/<앞 2글자>/<해시>.json  (url, method, data, status, encoding, etag, last_modified)
+    """
+
+    def __init__(self, cache_dir, max_bytes=512 * 1024 * 1024, offline=False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    @staticmethod
+    def make_key(method, url, data=None):
+        payload = json.dumps(data or {}, sort_keys=True, ensure_ascii=False)
+        raw = f"{method.upper()}\n{url}\n{payload}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def _paths(self, key):
+        folder = os.path.join(self.cache_dir, key[:2])
+        return os.path.join(folder, f"{key}.body"), os.path.join(folder, f"{key}.json")
+
+    def _scan(self):
+        """(본문 경로, 본문+메타 크기, 마지막 사용 시각) 목록"""
+        for folder, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".body"):
+                    continue
+                body_path = os.path.join(folder, name)
+                meta_path = body_path[:-len(".body")] + ".json"
+                try:
+                    stat = os.stat(body_path)
+                    size = stat.st_size + os.path.getsize(meta_path)
+                except OSError:
+                    continue
+                yield body_path, size, stat.st_mtime
+
+    def get(self, method, url, data=None):
+        """캐시된 응답과 메타, 없으면 (None, None)"""
+        body_path, meta_path = self._paths(self.make_key(method, url, data))
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                content = f.read()
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None, None
+
+        # LRU용 사용 시각 갱신
+        now = time.time()
+        try:
+            os.utime(body_path, (now, now))
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+        resp = CachedResponse(meta["url"], meta["status"], meta.get("headers", {}),
+                              content, meta.get("encoding"))
+        return resp, meta
+
+    @staticmethod
+    def conditional_headers(meta):
+        """재검증용 If-None-Match / If-Modified-Since 헤더"""
+        headers = {}
+        if meta and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def mark_revalidated(self):
+        with self._lock:
+            self.revalidated += 1
+
+    def put(self, method, url, data, resp):
+        key = self.make_key(method, url, data)
+        body_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+
+        meta = {
+            "method": method.upper(),
+            "url": url,
+            "data": data,
+            "status": resp.status_code,
+            "encoding": resp.encoding,
+            "headers": {k: v for k, v in resp.headers.items()
+                        if k.lower() in ("content-type", "etag", "last-modified")},
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "stored_at": time.time(),
+        }
+        meta_bytes = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+
+        old_size = 0
+        if os.path.exists(body_path):
+            old_size = os.path.getsize(body_path) + os.path.getsize(meta_path)
+
+        # 본문을 먼저 쓰고 메타를 나중에 교체 (메타가 있으면 본문도 완성된 상태)
+        for path, payload in ((body_path, resp.content), (meta_path, meta_bytes)):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total_bytes += len(resp.content) + len(meta_bytes) - old_size
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self):
+        """상한의 90%가 될 때까지 오래 안 쓴 항목부터 삭제"""
+        with self._lock:
+            entries = sorted(self._scan(), key=lambda e: e[2])
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * 0.9
+            for body_path, size, _ in entries:
+                if total <= target:
+                    break
+                for path in (body_path, body_path[:-len(".body")] + ".json"):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+            self._total_bytes = total
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "bytes": self._total_bytes,
+            }
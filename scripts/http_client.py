@@ -0,0 +1,137 @@
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException, ConnectionError as ReqConnectionError, Timeout
+
+import metrics
+from rate_limiter import backoff_delay
+
+## 크롤러 공용 HTTP 세션/요청 래퍼 -------------------------------------------------
+
+# 봇 차단 완화용 헤더
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/129.0.0.0 Safari/537.36"
+    ),
+    "Referer": "https://www.dhlottery.co.kr/common.do?method=main"
+}
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+def create_session(pool_size=32):
+    """
+    공용 세션 생성.
+    - 재시도는 robust_request 한 곳에서만 처리 (urllib3 Retry 이중 재시도 제거)
+    - 동시 요청용으로 커넥션 풀 크기를 넉넉하게
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(max_retries=0, pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def _retry_after(resp):
+    """429 응답의 Retry-After(초) 값, 없으면 None"""
+    value = resp.headers.get("Retry-After") if resp is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def robust_request(session, limiter, method, url, desc="", max_retries=8, base_sleep=1.0,
+                   timeout=10, cache=None, **kwargs):
+    """
+    GET/POST 공통 재시도 래퍼.
+    - cache(ResponseCache)가 있으면 원본 응답을 저장하고, 가능하면 조건부 요청으로 재사용
+    - cache.offline이면 네트워크 없이 캐시된 응답만 반환 (없으면 None)
+    - 모든 요청은 limiter 토큰을 받은 뒤 전송
+    - ConnectionReset(10054)/타임아웃 → 감속 + 지수 백오프 재시도
+    - 5xx / 429 → 감속 + 지수 백오프 재시도 (429는 Retry-After 우선)
+    - 4xx(404 포함) → 한 번만 찍고 스킵
+    """
+    cached, meta = None, None
+    if cache is not None:
+        cached, meta = cache.get(method, url, kwargs.get("data"))
+        if cache.offline:
+            metrics.inc("http_cache_total", result="hit" if cached is not None else "miss")
+            return cached
+        if meta is not None:
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers.update(cache.conditional_headers(meta))
+            kwargs["headers"] = headers
+
+    for attempt in range(1, max_retries + 1):
+        # 속도 제한 대기도 따로 기록 (긴 수집에서 실제로 가장 많이 기다리는 곳)
+        with metrics.timer("throttle", limiter=limiter.name):
+            limiter.acquire()
+
+        try:
+            with metrics.timer("http", method=method):
+                resp = session.request(method, url, timeout=timeout, **kwargs)
+        except ReqConnectionError as e:
+            # 연결이 끊겼을 때(10054 등)
+            limiter.record_failure("connection")
+            metrics.inc("http_retries_total", reason="connection")
+            wait = backoff_delay(attempt, base_sleep)
+            print(f"\n⚠️ {desc} 연결 오류 {attempt}/{max_retries}회차, "
+                  f"{wait:.1f}초 후 재시도: {e}")
+            time.sleep(wait)
+            continue
+        except Timeout as e:
+            limiter.record_failure("timeout")
+            metrics.inc("http_retries_total", reason="timeout")
+            wait = backoff_delay(attempt, base_sleep)
+            print(f"\n⚠️ {desc} 시간 초과 {attempt}/{max_retries}회차, "
+                  f"{wait:.1f}초 후 재시도: {e}")
+            time.sleep(wait)
+            continue
+        except RequestException as e:
+            print(f"\n⚠️ {desc} 요청 오류: {e}")
+            break
+
+        status = resp.status_code
+        metrics.inc("http_requests_total", status=status)
+        metrics.inc("http_bytes_total", len(resp.content))
+
+        # 조건부 요청 결과 변경 없음 → 캐시 본문 재사용
+        if status == 304 and cached is not None:
+            limiter.record_success()
+            cache.mark_revalidated()
+            metrics.inc("http_cache_total", result="revalidated")
+            return cached
+
+        # 5xx, 429는 서버/부하 문제로 보고 재시도
+        if status in RETRY_STATUS:
+            reason = "429" if status == 429 else "5xx"
+            limiter.record_failure(reason)
+            metrics.inc("http_retries_total", reason=reason)
+            wait = backoff_delay(attempt, base_sleep)
+            if status == 429:
+                wait = max(wait, _retry_after(resp) or 0.0)
+            print(f"\n⚠️ {desc} 서버 오류 {status}, "
+                  f"{attempt}/{max_retries}회차, {wait:.1f}초 후 재시도")
+            time.sleep(wait)
+            continue
+
+        # 나머지(404 포함)는 재시도 의미 없다고 보고 종료
+        try:
+            resp.raise_for_status()
+        except RequestException as e:
+            print(f"\n⚠️ {desc} HTTP 오류: {e}")
+            return None
+
+        limiter.record_success()
+        if cache is not None:
+            cache.put(method, url, kwargs.get("data"), resp)
+        return resp
+
+    metrics.inc("http_failures_total")
+    print(f"\n⚠️ {desc} 재시도 {max_retries}회 모두 실패, 스킵합니다.")
+    return None
@@ -1,5 +1,16 @@
+import argparse
+import hashlib
 import json
 import os
+
+import delta_log
+import dedup_stores
+import lotto_db
+import metrics
+import store_round_index
+from history_io import load_history, load_rounds_since
+from lotto_db import normalize_key
+from stores_io import publish_stores
 # 초기 store 구성 >> 로또 당첨지에 대한 ㅇㅇ
 
 
@@ -11,15 +22,142 @@ DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
 HISTORY_FILE = os.path.join(DATA_DIR, 'history.json')
 # 출력 파일 (생성될 파일)
 STORES_FILE = os.path.join(DATA_DIR, 'stores.json')
+# stores.json에 반영된 마지막 회차 (증분 갱신 기준점)
+STORES_META_FILE = os.path.join(DATA_DIR, 'stores.meta.json')
+# 판매점 키 → stores.json 내 위치 (+ 만들 때의 판매점 수/stores.json 해시)
+STORES_INDEX_FILE = os.path.join(DATA_DIR, 'stores.index.json')
+
+# 재생성해도 유지해야 하는 값 (좌표/전화번호/투표)
+PRESERVED_FIELDS = ["phone", "likes", "dislikes", "lat", "lng"]
+
+def new_store(name, addr):
+    return {
+        "name": name,
+        "address": addr,
+        "phone": "",  # 초기값 공란
+        "wins": {
+            "1st": [],
+            "2nd": []
+        },
+        "likes": 0,
+        "dislikes": 0,
+        # 요청하신 위도/경도 초기값 (lat: 위도-y, lng: 경도-x)
+        "lat": 0.0, 
+        "lng": 0.0
+    }
+
+def merge_rounds(stores_list, key_index, rounds, aliases=None):
+    """
+    회차 목록의 1등/2등 배출점을 stores_list에 합침 (같은 회차를 다시 넣어도 결과 동일).
+    - key_index: 판매점 키 → stores_list 위치 (신규 판매점은 뒤에 추가하며 같이 갱신)
+    - aliases: dedup_stores가 병합한 별칭 (흡수된 키의 당첨은 대표 판매점으로 합침)
+    - 당첨 회차는 집합으로 모았다가 마지막에 내림차순 리스트로 되돌림
+    - 반환: 바뀐 판매점 위치 집합
+    """
+    aliases = aliases or {}
+    redirect = dedup_stores.alias_map(aliases)
+    win_sets = {}
+    touched = set()
 
-def normalize_key(name, addr):
+    for round_data in rounds:
+        round_no = round_data['round']
+        result = round_data.get('result', {})
+
+        # 1등, 2등 각각 처리
+        for rank in ['1st', '2nd']:
+            # history.json 구조상 stores 키가 없는 경우(3등 등) 대비
+            store_list = result.get(rank, {}).get('stores', [])
+
+            for entry in store_list:
+                name = entry['name']
+                # history.json은 'addr'이지만 stores.json은 'address'로 저장
+                addr = entry.get('addr', '')
+                key = normalize_key(name, addr)
+                key = redirect.get(key, key)
+
+                pos = key_index.get(key)
+                if pos is None:
+                    # 신규 등록 (병합된 판매점이면 대표 이름/주소로)
+                    pos = len(stores_list)
+                    entry = aliases.get(key)
+                    if entry is None:
+                        stores_list.append(new_store(name, addr))
+                    else:
+                        stores_list.append(new_store(entry['name'], entry['address']))
+                        stores_list[pos]['aliases'] = entry['aliases']
+                    key_index[key] = pos
+
+                if pos not in win_sets:
+                    wins = stores_list[pos]['wins']
+                    win_sets[pos] = {r: set(wins.get(r, [])) for r in ['1st', '2nd']}
+                if round_no not in win_sets[pos][rank]:
+                    win_sets[pos][rank].add(round_no)
+                    touched.add(pos)
+
+    # 최신 회차가 앞으로 오도록 내림차순 정렬
+    for pos in touched:
+        stores_list[pos]['wins'] = {
+            r: sorted(win_sets[pos][r], reverse=True) for r in ['1st', '2nd']
+        }
+    return touched
+
+def load_stores():
+    if not os.path.exists(STORES_FILE):
+        return []
+    with open(STORES_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def stores_file_hash():
+    """stores.json 내용 sha256 - 다른 스크립트가 다시 썼는지 확인용 (새로 체크아웃해도 같은 값)"""
+    with open(STORES_FILE, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_key_index(stores_list):
+    """
+    저장된 키 인덱스.
+    - 기록된 판매점 수/stores.json 해시가 지금과 다르면(dedup_stores, manage_stores 등이 다시 씀)
+      stores.json 기준으로 다시 만듦
     """
-    판매점을 구분하는 고유 키 생성
-    이름과 주소의 공백을 제거하고 합쳐서 비교 (오타/공백 차이 방지)
+    try:
+        with open(STORES_INDEX_FILE, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if (saved["count"] == len(stores_list) == len(saved["keys"])
+                and saved["stores_sha256"] == stores_file_hash()):
+            return saved["keys"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return {normalize_key(s['name'], s.get('address', '')): i for i, s in enumerate(stores_list)}
+
+def load_last_round(stores_list):
+    """stores.json에 반영된 마지막 회차 (기록이 없으면 당첨 회차 중 최댓값)"""
+    try:
+        with open(STORES_META_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)['last_round']
+    except (OSError, ValueError, KeyError):
+        return max((r for s in stores_list for rank in ['1st', '2nd'] for r in s['wins'].get(rank, [])),
+                   default=0)
+
+def save_stores(stores_list, key_index, last_round, changed, deletes=(), incremental=False):
     """
-    n = name.replace(' ', '').strip()
-    a = addr.replace(' ', '').strip()
-    return f"{n}|{a}"
+    stores.json(+ 색인/순위표/delta/DB는 stores_io.publish_stores) 저장 후 키 인덱스 + 기준 회차 저장
+    - incremental: 새 회차만 합친 경우 순위표도 바뀐 지역만 다시 계산
+    """
+    version = publish_stores(stores_list, changed, deletes, latest_round=last_round,
+                             incremental=incremental, stores_file=STORES_FILE)
+    if lotto_db.enabled():
+        # DB에서 내보낸 stores.json은 DB 등록 순서 → 위치 인덱스도 그 순서로
+        key_index = {normalize_key(s['name'], s.get('address', '')): i for i, s in enumerate(stores_list)}
+
+    with metrics.timer("serialize", what="stores_index"):
+        with open(STORES_INDEX_FILE, 'w', encoding='utf-8') as f:
+            json.dump({"count": len(stores_list), "stores_sha256": stores_file_hash(), "keys": key_index},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        with open(STORES_META_FILE, 'w', encoding='utf-8') as f:
+            json.dump({"last_round": last_round, "count": len(stores_list)}, f)
+
+    print(f"✨ 저장 완료: {STORES_FILE}")
+    if version is not None:
+        print(f"🧾 stores delta v{version}: 변경 {len(changed)}건, 삭제 {len(deletes)}건")
 
 def create_stores_from_history():
     print("📂 history.json 데이터를 기반으로 stores.json 생성을 시작합니다...")
@@ -29,76 +167,72 @@ def create_stores_from_history():
         return
 
     # 1. history.json 읽기
-    with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
-        history_data = json.load(f)
-
-    # 2. 데이터 집계를 위한 딕셔너리
-    # Key: "이름|주소", Value: Store 객체
-    stores_map = {}
+    history_data = load_history(HISTORY_FILE)
+
+    # 2. 전체 회차 집계 (Key: "이름|주소", Value: stores_list 위치)
+    stores_list = []
+    key_index = {}
+    aliases = dedup_stores.load_aliases()
+    with metrics.timer("merge", what="stores"):
+        merge_rounds(stores_list, key_index, history_data, aliases)
+
+    # 3. 기존 stores.json의 좌표/전화번호/투표는 유지
+    old_stores = load_stores()
+    for old in old_stores:
+        pos = key_index.get(normalize_key(old['name'], old.get('address', '')))
+        if pos is not None:
+            for field in PRESERVED_FIELDS:
+                if field in old:
+                    stores_list[pos][field] = old[field]
 
-    # 3. 데이터 순회 및 집계
-    for round_data in history_data:
-        round_no = round_data['round']
-        result = round_data.get('result', {})
+    print(f"📊 총 {len(stores_list)}개의 판매점이 추출되었습니다.")
 
-        # 1등, 2등 각각 처리
-        for rank in ['1st', '2nd']:
-            rank_data = result.get(rank, {})
-            # history.json 구조상 stores 키가 없는 경우(3등 등) 대비
-            store_list = rank_data.get('stores', [])
+    # 회차 → 판매점 역색인도 전체 다시 생성
+    redirect = dedup_stores.alias_map(aliases)
+    store_round_index.build_index(history_data, lambda key: redirect.get(key, key))
 
-            if not store_list:
-                continue
+    # 4. 파일 저장
+    upserts, deletes = delta_log.diff_records("stores", old_stores, stores_list)
+    last_round = max((item['round'] for item in history_data), default=0)
+    save_stores(stores_list, key_index, last_round, upserts, deletes)
 
-            for entry in store_list:
-                name = entry['name']
-                # history.json은 'addr'이지만 stores.json은 'address'로 저장
-                addr = entry.get('addr', '') 
-                
-                # 고유 키 생성
-                key = normalize_key(name, addr)
+def update_stores_incremental():
+    """stores.json에 아직 반영되지 않은 회차만 합침 (좌표/투표 유지)"""
+    print("📂 새 회차만 stores.json에 반영합니다...")
 
-                # 이미 등록된 판매점인지 확인
-                if key not in stores_map:
-                    # 신규 등록
-                    stores_map[key] = {
-                        "name": name,
-                        "address": addr,
-                        "phone": "",  # 초기값 공란
-                        "wins": {
-                            "1st": [],
-                            "2nd": []
-                        },
-                        "likes": 0,
-                        "dislikes": 0,
-                        # 요청하신 위도/경도 초기값 (lat: 위도-y, lng: 경도-x)
-                        "lat": 0.0, 
-                        "lng": 0.0
-                    }
-                
-                # 해당 등수의 당첨 회차 추가
-                # 리스트에 이미 있는지 확인 (중복 방지)
-                if round_no not in stores_map[key]['wins'][rank]:
-                    stores_map[key]['wins'][rank].append(round_no)
-
-    # 4. 리스트 형태로 변환
-    stores_list = list(stores_map.values())
-
-    # (옵션) 회차 정렬: 최신 회차가 앞으로 오도록 내림차순 정렬
-    for store in stores_list:
-        store['wins']['1st'].sort(reverse=True)
-        store['wins']['2nd'].sort(reverse=True)
+    if not os.path.exists(STORES_FILE):
+        # 처음이면 전체 생성
+        create_stores_from_history()
+        return
 
-    print(f"📊 총 {len(stores_list)}개의 판매점이 추출되었습니다.")
+    stores_list = load_stores()
+    key_index = load_key_index(stores_list)
+    last_round = load_last_round(stores_list)
 
-    # 5. 파일 저장
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
+    new_rounds = load_rounds_since(HISTORY_FILE, last_round)
+    if not new_rounds:
+        print(f"ℹ️ {last_round}회차까지 이미 반영되어 있습니다.")
+        return
 
-    with open(STORES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(stores_list, f, ensure_ascii=False, indent=2)
+    aliases = dedup_stores.load_aliases()
+    with metrics.timer("merge", what="stores"):
+        touched = merge_rounds(stores_list, key_index, new_rounds, aliases)
+    redirect = dedup_stores.alias_map(aliases)
+    store_round_index.update_index(new_rounds, lambda key: redirect.get(key, key),
+                                   load_all=lambda: load_history(HISTORY_FILE))
+    newest = max(item['round'] for item in new_rounds)
+    print(f"📊 {len(new_rounds)}개 회차 반영 → 판매점 {len(touched)}곳 갱신 (총 {len(stores_list)}곳)")
 
-    print(f"✨ 저장 완료: {STORES_FILE}")
+    save_stores(stores_list, key_index, newest, [stores_list[pos] for pos in sorted(touched)],
+                incremental=True)
 
 if __name__ == "__main__":
-    create_stores_from_history()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="history.json 기반 stores.json 생성/갱신")
+    parser.add_argument("--full", action="store_true",
+                        help="전체 회차로 다시 생성 (기본은 새 회차만 증분 반영)")
+    args = parser.parse_args()
+
+    if args.full:
+        create_stores_from_history()
+    else:
+        update_stores_incremental()
@@ -1,11 +1,16 @@
-import requests
-from requests.exceptions import RequestException, ConnectionError as ReqConnectionError
-from bs4 import BeautifulSoup
-import json
+import argparse
+import asyncio
+import multiprocessing
 import os
 import time
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import metrics
+from http_cache import ResponseCache
+from history_io import compact_history, last_round, open_journal, write_history
+from http_client import create_session, robust_request as _robust_request
+from lotto_parser import empty_prizes, parse_page_count, parse_prizes, parse_round_pages, parse_stores
+from rate_limiter import AdaptiveRateLimiter
 
 ## 동행복권에서 로또 데이터 크롤링하는 코드 -------------------------------------------
 
@@ -15,87 +20,53 @@ BASE_DIR = os.getcwd()
 DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
 HISTORY_FILE = os.path.join(DATA_DIR, 'history.json')
 
-# 요청 간 간격(성능 < 안정성 기준으로 넉넉하게 설정)
-GLOBAL_ROUND_DELAY = 3.0   # 회차 하나 끝날 때마다 대기 시간(초)
-REQUEST_DELAY = 1.0        # 각 HTTP 요청 사이 최소 대기 시간(초)
+# 동행복권 주소 (DHLOTTERY_BASE_URL로 바꾸면 로컬 대역 서버 등으로 요청 - benchmarks/standin_server.py)
+DHLOTTERY_BASE_URL = os.environ.get("DHLOTTERY_BASE_URL", "https://dhlottery.co.kr").rstrip("/")
+DHLOTTERY_API_BASE_URL = os.environ.get("DHLOTTERY_BASE_URL", "https://www.dhlottery.co.kr").rstrip("/")
+
+# 원본 응답 캐시 (파서 수정 후 재수집 없이 재생하기 위함)
+CACHE_DIR = os.path.join(BASE_DIR, '.cache', 'http')
+CACHE_MAX_MB = 512
+
+# 요청 속도 (고정 sleep 대신 limiter가 응답 상태를 보고 조절)
+INITIAL_RPS = 1.0          # 시작 초당 요청 수
+MAX_RPS = 4.0              # 정상 응답이 이어질 때 올라갈 수 있는 상한
+
+# 비동기 백필 모드 기본값
+ASYNC_CONCURRENCY = 8      # 동시에 수집할 회차 수
+ASYNC_RPS = 8.0            # 비동기 모드 초당 요청 수 상한
+
+# 파이프라인 모드 (수집 → 큐 → 파싱 프로세스 풀 → 회차 순서 기록)
+PARSE_WORKERS = os.cpu_count() or 1   # 파싱 프로세스 수
+PIPELINE_QUEUE_SIZE = 16              # 파싱을 기다리는 원본 페이지 묶음(회차) 최대 개수
 
 # --- 세션 설정 ---
-session = requests.Session()
-retries = Retry(
-    total=5,
-    connect=5,
-    read=5,
-    backoff_factor=1,
-    status_forcelist=[500, 502, 503, 504],
-    allowed_methods=["HEAD", "GET", "OPTIONS"]
-)
-session.mount('https://', HTTPAdapter(max_retries=retries))
-
-# 봇 차단 완화용 헤더
-session.headers.update({
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/129.0.0.0 Safari/537.36"
-    ),
-    "Referer": "https://www.dhlottery.co.kr/common.do?method=main"
-})
-
-
-def robust_request(method, url, desc="", max_retries=8, base_sleep=2.0, **kwargs):
-    """
-    GET/POST 공통 재시도 래퍼.
-    - ConnectionReset(10054) → 지수 백오프로 여러 번 재시도
-    - 5xx / 429 → 재시도
-    - 4xx(404 포함) → 한 번만 찍고 스킵
-    """
-    for attempt in range(1, max_retries + 1):
-        try:
-            resp = session.request(method, url, timeout=10, **kwargs)
-            status = resp.status_code
-
-            # 5xx, 429는 서버/부하 문제로 보고 재시도
-            if status >= 500 or status == 429:
-                raise RequestException(f"Server error {status}", response=resp)
-
-            # 나머지 4xx/2xx 처리
-            resp.raise_for_status()
-
-            # 성공한 요청 사이도 살짝 텀을 준다
-            if REQUEST_DELAY > 0:
-                time.sleep(REQUEST_DELAY)
-
-            return resp
-
-        except ReqConnectionError as e:
-            # 연결이 끊겼을 때(10054 등)
-            wait = base_sleep * attempt
-            print(f"\n⚠️ {desc} 연결 오류 {attempt}/{max_retries}회차, "
-                  f"{wait:.1f}초 후 재시도: {e}")
-            time.sleep(wait)
-
-        except RequestException as e:
-            status = getattr(e, "response", None).status_code if getattr(e, "response", None) is not None else None
-
-            # 서버 에러 계열은 한 번 더 시도
-            if status in (500, 502, 503, 504, 429):
-                wait = base_sleep * attempt
-                print(f"\n⚠️ {desc} 서버 오류 {status}, "
-                      f"{attempt}/{max_retries}회차, {wait:.1f}초 후 재시도")
-                time.sleep(wait)
-                continue
+# 파이프라인 모드의 파싱 프로세스(spawn)는 이 파일을 __mp_main__으로 다시 import 하므로
+# 그때는 세션/limiter/스레드 풀을 만들지 않음 (작업자는 lotto_parser 함수만 실행)
+if __name__ != "__mp_main__":
+    session = create_session()
 
-            # 나머지(404 포함)는 재시도 의미 없다고 보고 종료
-            print(f"\n⚠️ {desc} HTTP 오류: {e}")
-            break
+    # 모든 요청이 공유하는 속도 제한기
+    limiter = AdaptiveRateLimiter(initial_rate=INITIAL_RPS, max_rate=MAX_RPS, name="dhlottery")
+
+    # 회차 하나의 기본/상금/판매점 요청을 동시에 보내기 위한 풀
+    fanout_executor = ThreadPoolExecutor(max_workers=3)
+
+    # 판매점 2페이지 이후를 동시에 받기 위한 풀 (속도는 limiter가 전체 기준으로 조절)
+    page_executor = ThreadPoolExecutor(max_workers=4)
+
+# 원본 응답 캐시 (None이면 사용 안 함, __main__에서 설정)
+response_cache = None
 
-    print(f"\n⚠️ {desc} 재시도 {max_retries}회 모두 실패, 스킵합니다.")
-    return None
+
+def robust_request(method, url, desc="", **kwargs):
+    """공용 세션/limiter/캐시로 요청 (재시도·백오프는 http_client.robust_request)"""
+    return _robust_request(session, limiter, method, url, desc=desc, cache=response_cache, **kwargs)
 
 
 def get_base_info_api(round_no: int):
     """1. 기본 번호 및 날짜 (API)"""
-    url = f"https://www.dhlottery.co.kr/common.do?method=getLottoNumber&drwNo={round_no}"
+    url = f"{DHLOTTERY_API_BASE_URL}/common.do?method=getLottoNumber&drwNo={round_no}"
     desc = f"기본 정보 ({round_no}회)"
 
     try:
@@ -114,82 +85,35 @@ def get_base_info_api(round_no: int):
         return None
 
 
-def get_prize_info(round_no: int):
-    """2. 1~3등 상금 및 당첨자 수 (HTML 파싱)"""
-    url = f"https://dhlottery.co.kr/gameResult.do?method=byWin&drwNo={round_no}"
-    desc = f"상금 정보 ({round_no}회)"
+def fetch_prize_page(round_no: int):
+    """byWin 원본 HTML (실패 시 None)"""
+    url = f"{DHLOTTERY_BASE_URL}/gameResult.do?method=byWin&drwNo={round_no}"
+    resp = robust_request("GET", url, desc=f"상금 정보 ({round_no}회)")
+    return resp.text if resp is not None else None
 
-    prizes = {
-        "1st": {"prize": 0, "winners": 0},
-        "2nd": {"prize": 0, "winners": 0},
-        "3rd": {"prize": 0, "winners": 0},
-    }
 
-    resp = robust_request("GET", url, desc=desc)
-    if resp is None:
-        return prizes
+def get_prize_info(round_no: int):
+    """2. 1~3등 상금 및 당첨자 수 (HTML 파싱)"""
+    html = fetch_prize_page(round_no)
+    if html is None:
+        return empty_prizes()
 
     try:
-        soup = BeautifulSoup(resp.text, "html.parser")
-        rows = soup.select(".tbl_data tbody tr")
-
-        for i, key in enumerate(["1st", "2nd", "3rd"]):
-            if i >= len(rows):
-                break
-
-            row = rows[i]
-            cells = row.find_all("td")
-
-            try:
-                prize_cell = None
-                winner_cell = None
-
-                # 뒤에서부터: '... 원' 들어간 마지막 셀 = 당첨금, 그 앞 = 인원
-                for cell in reversed(cells):
-                    txt = cell.text.strip()
-                    if "원" in txt and prize_cell is None:
-                        prize_cell = cell
-                    elif prize_cell is not None and winner_cell is None:
-                        winner_cell = cell
-                        break
-
-                if prize_cell and winner_cell:
-                    prize_val = int(
-                        prize_cell.text.replace(",", "").replace("원", "").strip()
-                    )
-                    winner_val = int(
-                        winner_cell.text.replace(",", "").replace("개", "").strip()
-                    )
-
-                    prizes[key]["prize"] = prize_val
-                    prizes[key]["winners"] = winner_val
-
-            except Exception:
-                # 개별 등수만 실패한 경우 → 그 등수는 0으로 남겨둠
-                pass
-
+        with metrics.timer("parse", page="byWin"):
+            return parse_prizes(html)
     except Exception as e:
         print(f"⚠️ 상금 파싱 오류 ({round_no}회): {e}")
+        return empty_prizes()
 
-    return prizes
-
-
-def get_store_info(round_no: int):
-    """
-    3. 판매점 정보 (HTML 파싱)
-    - 동행복권 구조상:
-      * URL: https://dhlottery.co.kr/store.do?method=topStore&pageGubun=L645
-      * METHOD: POST
-      * BODY: method=topStore&nowPage=1&gameNo=5133&drwNo=회차&...
-    """
-    stores = {"1st": [], "2nd": []}
 
-    url = "https://dhlottery.co.kr/store.do?method=topStore&pageGubun=L645"
-    desc = f"판매점 정보 ({round_no}회)"
+def fetch_store_page(round_no: int, page: int):
+    """topStore 한 페이지 원본 HTML (실패 시 None)"""
+    url = f"{DHLOTTERY_BASE_URL}/store.do?method=topStore&pageGubun=L645"
+    desc = f"판매점 정보 ({round_no}회 {page}페이지)"
 
     payload = {
         "method": "topStore",
-        "nowPage": "1",
+        "nowPage": str(page),
         "rankNo": "",       # 1등/2등 필터 (공란이면 기본 1등)
         "gameNo": "5133",   # 로또 6/45 gameNo (사이트에서 쓰는 값)
         "drwNo": str(round_no),
@@ -198,60 +122,153 @@ def get_store_info(round_no: int):
     }
 
     resp = robust_request("POST", url, desc=desc, data=payload)
-    if resp is None:
-        return stores
+    return resp.text if resp is not None else None
+
+
+def merge_store_pages(pages):
+    """
+    페이지별 파싱 결과를 페이지 순서대로 합침.
+    - 2등 목록은 페이지마다 이어짐
+    - 1등 표가 모든 페이지에 똑같이 반복되면 첫 페이지 것만 사용
+    """
+    stores = {"1st": list(pages[0]["1st"]), "2nd": list(pages[0]["2nd"])}
+    for page in pages[1:]:
+        if page["1st"] != pages[0]["1st"]:
+            stores["1st"].extend(page["1st"])
+        stores["2nd"].extend(page["2nd"])
+    return stores
+
+
+def get_store_info(round_no: int):
+    """
+    3. 판매점 정보 (HTML 파싱)
+    - 동행복권 구조상:
+      * URL: https://dhlottery.co.kr/store.do?method=topStore&pageGubun=L645
+      * METHOD: POST
+      * BODY: method=topStore&nowPage=1&gameNo=5133&drwNo=회차&...
+    - 첫 페이지에서 전체 페이지 수를 읽고, 나머지 페이지는 동시에 받아서 순서대로 합침
+    """
+    first_html = fetch_store_page(round_no, 1)
+    if first_html is None:
+        return {"1st": [], "2nd": []}
 
     try:
-        soup = BeautifulSoup(resp.text, "html.parser")
-        tables = soup.select("table.tbl_data")
-
-        print("----------------1--------------------")
-        # 1등 배출점 테이블
-        if len(tables) >= 1:
-            rows = tables[1].select("tbody tr")
-
-            print(rows)
-            for row in rows:
-                cols = row.find_all("td")
-                if len(cols) >= 4:
-                    try:
-                        print(cols)
-                        name = cols[1].text.strip()
-                        method = cols[2].text.strip()
-                        address = cols[3].text.strip()
-                        if "조회 결과가 없습니다" not in name:
-                            stores["1st"].append(
-                                {"name": name, "addr": address, "method": method}
-                            )
-                    except Exception:
-                        pass
-        
-
-        print("------------------2------------------")
-        # 2등 배출점 테이블 (있으면)
-        if len(tables) >= 2:
-            rows = tables[2].select("tbody tr")
-            print(rows)
-            for row in rows:
-                cols = row.find_all("td")
-                if len(cols) >= 3:
-                    try:
-                        print(cols)
-                        name = cols[1].text.strip()
-                        address = cols[2].text.strip()
-
-                        if "조회 결과가 없습니다" not in name:
-                            stores["2nd"].append(
-                                {"name": name, "addr": address}
-                            )
-                    except Exception:
-                        pass
-        
-        print("----------------end------------------")
+        # 첫 번째 tbl_data는 회차 선택 폼, 그 다음이 1등/2등 배출점 표
+        with metrics.timer("parse", page="topStore"):
+            pages = [parse_stores(first_html, first_table=1)]
+            page_count = parse_page_count(first_html)
     except Exception as e:
         print(f"⚠️ 판매점 파싱 오류 ({round_no}회): {e}")
+        return {"1st": [], "2nd": []}
+
+    if page_count > 1:
+        futures = [page_executor.submit(fetch_store_page, round_no, page)
+                   for page in range(2, page_count + 1)]
+        for page, future in enumerate(futures, start=2):
+            html = future.result()
+            if html is None:
+                print(f"⚠️ 판매점 {page}페이지 누락 ({round_no}회)")
+                continue
+            try:
+                with metrics.timer("parse", page="topStore"):
+                    pages.append(parse_stores(html, first_table=1))
+            except Exception as e:
+                print(f"⚠️ 판매점 파싱 오류 ({round_no}회 {page}페이지): {e}")
+
+    with metrics.timer("merge", what="store_pages"):
+        return merge_store_pages(pages)
+
+
+def build_round_data(api_data, prize_data, store_data):
+    """API/상금/판매점 결과를 history.json 한 회차 형식으로 조립"""
+    return {
+        "round": api_data["drwNo"],
+        "date": api_data["drwNoDate"],
+        "numbers": [
+            api_data["drwtNo1"],
+            api_data["drwtNo2"],
+            api_data["drwtNo3"],
+            api_data["drwtNo4"],
+            api_data["drwtNo5"],
+            api_data["drwtNo6"],
+        ],
+        "bonus": api_data["bnusNo"],
+        "result": {
+            "1st": {
+                "prize": prize_data["1st"]["prize"],
+                "winners": prize_data["1st"]["winners"],
+                "stores": store_data["1st"],
+            },
+            "2nd": {
+                "prize": prize_data["2nd"]["prize"],
+                "winners": prize_data["2nd"]["winners"],
+                "stores": store_data["2nd"],
+            },
+            "3rd": {
+                "prize": prize_data["3rd"]["prize"],
+                "winners": prize_data["3rd"]["winners"],
+                # 3등은 판매점 정보가 너무 많아 수집하지 않음
+            },
+        },
+    }
+
+
+def crawl_round(round_no: int):
+    """
+    한 회차 전체 수집.
+    - 기본/상금/판매점 요청 3개를 동시에 보내고 결과를 합침
+    - 존재하지 않는 회차(또는 기본 정보 실패)면 상금/판매점 결과는 버리고 None
+    """
+    base_future = fanout_executor.submit(get_base_info_api, round_no)
+    prize_future = fanout_executor.submit(get_prize_info, round_no)
+    store_future = fanout_executor.submit(get_store_info, round_no)
+
+    api_data = base_future.result()
+    prize_data = prize_future.result()
+    store_data = store_future.result()
+
+    if api_data is None:
+        return None
+
+    with metrics.timer("merge", what="round"):
+        return build_round_data(api_data, prize_data, store_data)
 
-    return stores
+
+async def crawl_round_async(round_no: int, executor):
+    """crawl_round의 비동기 버전 (이벤트 루프의 executor에서 3개 요청을 동시에 실행)"""
+    loop = asyncio.get_running_loop()
+    api_data, prize_data, store_data = await asyncio.gather(
+        loop.run_in_executor(executor, get_base_info_api, round_no),
+        loop.run_in_executor(executor, get_prize_info, round_no),
+        loop.run_in_executor(executor, get_store_info, round_no),
+    )
+
+    if api_data is None:
+        return None
+
+    with metrics.timer("merge", what="round"):
+        return build_round_data(api_data, prize_data, store_data)
+
+
+def resume_round():
+    """이어서 수집할 시작 회차 (history.json 첫 레코드 + 저널 마지막 줄 기준)"""
+    last = last_round(HISTORY_FILE)
+    if last:
+        print(f"🔄 기존 데이터 발견! {last + 1}회차부터 이어합니다.")
+    else:
+        print("ℹ️ 처음부터 시작합니다.")
+    return last + 1
+
+
+def finish_crawl():
+    """저널을 history.json에 한 번에 합치고 통계 출력"""
+    with metrics.timer("serialize", what="history"):
+        merged = compact_history(HISTORY_FILE)
+    print(f"\n✨ {HISTORY_FILE} 저장 완료! (저널 {merged}개 회차 반영)")
+    print(f"📈 요청 통계: {limiter.stats()}")
+    if response_cache is not None:
+        print(f"📦 캐시 통계: {response_cache.stats()}")
+    metrics.flush()
 
 
 def run_crawler():
@@ -260,97 +277,331 @@ def run_crawler():
     if not os.path.exists(DATA_DIR):
         os.makedirs(DATA_DIR)
 
-    history_data = []
-    start_round = 1
-
     # 이어하기 로직
-    if os.path.exists(HISTORY_FILE):
-        try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                history_data = json.load(f)
-                if history_data:
-                    max_round = max(item["round"] for item in history_data)
-                    start_round = max_round + 1
-                    print(f"🔄 기존 데이터 발견! {start_round}회차부터 이어합니다.")
-        except Exception:
-            print("ℹ️ 처음부터 시작합니다.")
-
-    current_round = start_round
+    current_round = resume_round()
+    journal = open_journal(HISTORY_FILE)
 
     while True:
         print(f"[{current_round}회차] 수집 중...", end=" ", flush=True)
 
-        # 1. 기본 정보 (없으면 이 시점에서 전체 종료)
-        api_data = get_base_info_api(current_round)
-        if api_data is None:
+        formatted_data = crawl_round(current_round)
+        if formatted_data is None:
             print("\n🎉 수집 완료!")
             break
 
-        # 2. 상금 정보
-        prize_data = get_prize_info(current_round)
-
-        # 3. 판매점 정보
-        store_data = get_store_info(current_round)
-
-        # 4. 데이터 조립
-        formatted_data = {
-            "round": api_data["drwNo"],
-            "date": api_data["drwNoDate"],
-            "numbers": [
-                api_data["drwtNo1"],
-                api_data["drwtNo2"],
-                api_data["drwtNo3"],
-                api_data["drwtNo4"],
-                api_data["drwtNo5"],
-                api_data["drwtNo6"],
-            ],
-            "bonus": api_data["bnusNo"],
-            "result": {
-                "1st": {
-                    "prize": prize_data["1st"]["prize"],
-                    "winners": prize_data["1st"]["winners"],
-                    "stores": store_data["1st"],
-                },
-                "2nd": {
-                    "prize": prize_data["2nd"]["prize"],
-                    "winners": prize_data["2nd"]["winners"],
-                    "stores": store_data["2nd"],
-                },
-                "3rd": {
-                    "prize": prize_data["3rd"]["prize"],
-                    "winners": prize_data["3rd"]["winners"],
-                    # 3등은 판매점 정보가 너무 많아 수집하지 않음
-                },
-            },
-        }
-
-        # 최신순 유지를 위해 맨 앞에 삽입
-        history_data.insert(0, formatted_data)
+        # 회차마다 저널에 한 줄 추가 (fsync) → 중단돼도 최대 1회차만 손실
+        with metrics.timer("serialize", what="journal"):
+            journal.append(formatted_data)
+        metrics.inc("rounds_total")
 
         print(
-            f"✅ (1등: {len(store_data['1st'])}곳, "
-            f"2등: {len(store_data['2nd'])}곳)"
+            f"✅ (1등: {len(formatted_data['result']['1st']['stores'])}곳, "
+            f"2등: {len(formatted_data['result']['2nd']['stores'])}곳)"
         )
 
-        # 중간 저장 (10회차마다)
-        if current_round % 10 == 0:
-            history_data.sort(key=lambda x: x["round"], reverse=True)
-            with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(history_data, f, ensure_ascii=False, indent=2)
-            print("💾 중간 저장")
-
         current_round += 1
 
-        # 회차 사이 전체 딜레이
-        if GLOBAL_ROUND_DELAY > 0:
-            time.sleep(GLOBAL_ROUND_DELAY)
-
     # 최종 저장
-    history_data.sort(key=lambda x: x["round"], reverse=True)
-    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(history_data, f, ensure_ascii=False, indent=2)
+    finish_crawl()
+
+
+async def backfill_async(start_round, concurrency, executor, journal):
+    """
+    여러 회차를 동시에 수집.
+    - 워커가 회차 번호를 하나씩 가져가서 처리
+    - 'fail' 회차를 만나면 그 이후 회차는 새로 시작하지 않음
+    - 시작 회차부터 끊김 없이 이어진 구간만 회차 순서대로 저널에 기록
+    - 반환: 저널에 기록한 회차 수
+    """
+    results = {}
+    state = {"next": start_round, "stop": None, "written": start_round}
+
+    def flush_contiguous():
+        while state["written"] in results:
+            if state["stop"] is not None and state["written"] >= state["stop"]:
+                break
+            with metrics.timer("serialize", what="journal"):
+                journal.append(results.pop(state["written"]))
+            metrics.inc("rounds_total")
+            state["written"] += 1
+        # 앞 회차를 기다리며 메모리에 쌓여 있는 회차 수
+        metrics.gauge("queue_depth", len(results), queue="backfill_reorder")
+
+    async def worker():
+        while True:
+            round_no = state["next"]
+            if state["stop"] is not None and round_no >= state["stop"]:
+                return
+            state["next"] += 1
+
+            data = await crawl_round_async(round_no, executor)
+            if data is None:
+                if state["stop"] is None or round_no < state["stop"]:
+                    state["stop"] = round_no
+                return
+
+            results[round_no] = data
+            print(
+                f"[{round_no}회차] ✅ (1등: {len(data['result']['1st']['stores'])}곳, "
+                f"2등: {len(data['result']['2nd']['stores'])}곳)",
+                flush=True,
+            )
+            flush_contiguous()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    flush_contiguous()
+
+    return state["written"] - start_round
+
+
+def run_crawler_async(concurrency=ASYNC_CONCURRENCY, rps=ASYNC_RPS):
+    """비동기 백필 모드: 동시 회차 수 + 전체 초당 요청 수 한도 안에서 수집"""
+    print(f"🚀 로또 전체 데이터 비동기 수집 시작 (동시 {concurrency}회차, 초당 {rps}건)...")
+
+    if not os.path.exists(DATA_DIR):
+        os.makedirs(DATA_DIR)
+
+    start_round = resume_round()
+    journal = open_journal(HISTORY_FILE)
+
+    limiter.set_max_rate(rps)
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency * 3) as executor:
+        collected = asyncio.run(backfill_async(start_round, concurrency, executor, journal))
+
+    elapsed = time.monotonic() - started
+    print(f"\n🎉 수집 완료! {collected}개 회차, {elapsed:.1f}초")
+
+    finish_crawl()
+
+
+async def fetch_round_raw(round_no: int, executor):
+    """
+    파이프라인 1단계: 한 회차 원본만 수집 (파싱은 프로세스 풀에서).
+    - 기본 정보(JSON) / byWin / 판매점 첫 페이지를 동시에, 첫 페이지의 페이지 수를 보고 나머지 페이지도 동시에
+    - 반환: {"round", "api", "bywin", "store_pages"} / 없는 회차면 None
+    """
+    loop = asyncio.get_running_loop()
+    api_data, bywin, first_page = await asyncio.gather(
+        loop.run_in_executor(executor, get_base_info_api, round_no),
+        loop.run_in_executor(executor, fetch_prize_page, round_no),
+        loop.run_in_executor(executor, fetch_store_page, round_no, 1),
+    )
+    if api_data is None:
+        return None
+
+    store_pages = [first_page]
+    if first_page is not None:
+        page_count = parse_page_count(first_page)
+        store_pages += await asyncio.gather(*(
+            loop.run_in_executor(executor, fetch_store_page, round_no, page)
+            for page in range(2, page_count + 1)
+        ))
+    return {"round": round_no, "api": api_data, "bywin": bywin, "store_pages": store_pages}
+
+
+async def pipeline_backfill(start_round, concurrency, parse_workers, queue_size, executor, parse_pool, journal):
+    """
+    수집 → 파싱 → 기록을 나눈 백필.
+    - 수집 코루틴(concurrency개)이 원본을 크기 queue_size인 큐에 넣음 (큐가 차면 대기)
+    - 파싱 코루틴(parse_workers개)이 큐에서 꺼내 프로세스 풀에서 prizes/stores로 파싱
+    - 기록은 이벤트 루프 한 곳에서만: 시작 회차부터 이어진 회차를 순서대로 조립해 저널에 기록
+    - 수집을 시작했지만 아직 기록 안 된 회차 수를 세마포어로 제한 → 느린 회차가 있어도 메모리 일정
+    - 'fail' 회차를 만나면 그 이후 회차는 버림 (backfill_async와 같은 규칙)
+    - 반환: 저널에 기록한 회차 수
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=queue_size)
+    pending = asyncio.Semaphore(concurrency + queue_size + parse_workers)
+    held = set()      # 세마포어 자리를 잡고 있는 회차
+    results = {}      # 회차 → (API 결과, 파싱 결과), 앞 회차를 기다리는 중
+    state = {"next": start_round, "stop": None, "written": start_round}
+
+    def release(round_no):
+        if round_no in held:
+            held.remove(round_no)
+            pending.release()
+
+    def stop_at(round_no):
+        if state["stop"] is None or round_no < state["stop"]:
+            state["stop"] = round_no
+        for r in [r for r in results if r >= state["stop"]]:
+            results.pop(r)
+            release(r)
+
+    def stopped(round_no):
+        return state["stop"] is not None and round_no >= state["stop"]
+
+    def flush_contiguous():
+        while state["written"] in results and not stopped(state["written"]):
+            round_no = state["written"]
+            api_data, (prizes, pages, errors) = results.pop(round_no)
+            for error in errors:
+                print(f"⚠️ {error} ({round_no}회)")
+            with metrics.timer("merge", what="round"):
+                store_data = merge_store_pages(pages) if pages else {"1st": [], "2nd": []}
+                data = build_round_data(api_data, prizes, store_data)
+            with metrics.timer("serialize", what="journal"):
+                journal.append(data)
+            metrics.inc("rounds_total")
+            print(
+                f"[{round_no}회차] ✅ (1등: {len(data['result']['1st']['stores'])}곳, "
+                f"2등: {len(data['result']['2nd']['stores'])}곳)",
+                flush=True,
+            )
+            state["written"] += 1
+            release(round_no)
+        metrics.gauge("queue_depth", len(results), queue="pipeline_reorder")
+
+    async def fetcher():
+        while True:
+            await pending.acquire()
+            round_no = state["next"]
+            if stopped(round_no):
+                pending.release()
+                return
+            state["next"] += 1
+            held.add(round_no)
+
+            raw = await fetch_round_raw(round_no, executor)
+            if raw is None:
+                stop_at(round_no)
+                release(round_no)
+                return
+            if stopped(round_no):
+                release(round_no)
+                continue
+            await queue.put(raw)
+            metrics.gauge("queue_depth", queue.qsize(), queue="pipeline_parse")
+
+    async def parser():
+        while True:
+            raw = await queue.get()
+            if raw is None:
+                return
+            metrics.gauge("queue_depth", queue.qsize(), queue="pipeline_parse")
+            with metrics.timer("parse", page="round"):
+                parsed = await loop.run_in_executor(parse_pool, parse_round_pages, raw["bywin"], raw["store_pages"])
+            round_no = raw["round"]
+            if stopped(round_no):
+                release(round_no)
+                continue
+            results[round_no] = (raw["api"], parsed)
+            flush_contiguous()
+
+    parsers = [asyncio.ensure_future(parser()) for _ in range(parse_workers)]
+    await asyncio.gather(*(fetcher() for _ in range(concurrency)))
+    for _ in parsers:
+        await queue.put(None)
+    await asyncio.gather(*parsers)
+    flush_contiguous()
+
+    return state["written"] - start_round
+
+
+def run_crawler_pipeline(concurrency=ASYNC_CONCURRENCY, rps=ASYNC_RPS, parse_workers=PARSE_WORKERS,
+                         queue_size=PIPELINE_QUEUE_SIZE):
+    """파이프라인 백필 모드: 비동기 수집 + 파싱 프로세스 풀 (파싱이 수집 스레드를 막지 않음)"""
+    print(f"🚀 로또 전체 데이터 파이프라인 수집 시작 (동시 {concurrency}회차, 초당 {rps}건, "
+          f"파싱 프로세스 {parse_workers}개)...")
+
+    if not os.path.exists(DATA_DIR):
+        os.makedirs(DATA_DIR)
+
+    start_round = resume_round()
+    journal = open_journal(HISTORY_FILE)
+
+    limiter.set_max_rate(rps)
+    started = time.monotonic()
+    # spawn: 수집 스레드가 도는 중에 fork하지 않도록
+    # (작업자는 lotto_parser.parse_round_pages만 실행, 계측 파일은 부모만 씀 → metrics.discard)
+    with ThreadPoolExecutor(max_workers=concurrency * 3) as executor, \
+            ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn"),
+                                initializer=metrics.discard) as parse_pool:
+        collected = asyncio.run(pipeline_backfill(start_round, concurrency, parse_workers, queue_size,
+                                                  executor, parse_pool, journal))
+
+    elapsed = time.monotonic() - started
+    print(f"\n🎉 수집 완료! {collected}개 회차, {elapsed:.1f}초")
+
+    finish_crawl()
+
+
+def run_replay():
+    """
+    재생 모드: 네트워크 없이 캐시된 원본 응답만 다시 파싱해서 history.json 재생성.
+    - 1회차부터 캐시에 기본 정보가 없는(또는 'fail') 회차 직전까지
+    """
+    print(f"⏪ 캐시 재생 모드 ({CACHE_DIR}) - 네트워크 요청 없음")
+
+    if not os.path.exists(DATA_DIR):
+        os.makedirs(DATA_DIR)
+
+    history_data = []
+    started = time.monotonic()
+    round_no = 1
+    while True:
+        formatted_data = crawl_round(round_no)
+        if formatted_data is None:
+            break
+        history_data.append(formatted_data)
+        round_no += 1
+
+    elapsed = time.monotonic() - started
+    print(f"🎉 재생 완료! {len(history_data)}개 회차, {elapsed:.1f}초")
+
+    if not history_data:
+        print("❌ 캐시에 회차 데이터가 없어 저장하지 않습니다.")
+        return
+
+    with metrics.timer("serialize", what="history"):
+        write_history(HISTORY_FILE, history_data)
     print(f"\n✨ {HISTORY_FILE} 저장 완료!")
+    print(f"📦 캐시 통계: {response_cache.stats()}")
 
 
 if __name__ == "__main__":
-    run_crawler()
+    parser = argparse.ArgumentParser(description="동행복권 로또 전체 회차 수집")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="여러 회차를 동시에 수집하는 비동기 백필 모드")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="비동기 수집 + 파싱 프로세스 풀로 나눈 파이프라인 백필 모드")
+    parser.add_argument("--concurrency", type=int, default=ASYNC_CONCURRENCY,
+                        help="비동기 모드에서 동시에 수집할 회차 수")
+    parser.add_argument("--rps", type=float, default=ASYNC_RPS,
+                        help="비동기 모드에서 전체 초당 요청 수 상한")
+    parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS,
+                        help="파이프라인 모드의 파싱 프로세스 수")
+    parser.add_argument("--queue-size", type=int, default=PIPELINE_QUEUE_SIZE,
+                        help="파이프라인 모드에서 파싱을 기다릴 수 있는 회차 수")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="원본 응답 디스크 캐시를 사용하지 않음")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help="원본 응답 캐시 폴더")
+    parser.add_argument("--cache-max-mb", type=int, default=CACHE_MAX_MB,
+                        help="캐시 용량 상한(MB), 넘으면 오래 안 쓴 항목부터 삭제")
+    parser.add_argument("--replay", action="store_true",
+                        help="네트워크 없이 캐시된 응답만으로 history.json 재생성")
+    parser.add_argument("--compact", action="store_true",
+                        help="수집 없이 저널만 history.json에 합치고 종료")
+    args = parser.parse_args()
+
+    if args.compact:
+        merged = compact_history(HISTORY_FILE)
+        print(f"✨ 저널 {merged}개 회차를 {HISTORY_FILE}에 반영했습니다.")
+        raise SystemExit(0)
+
+    CACHE_DIR = args.cache_dir
+    if args.replay or not args.no_cache:
+        response_cache = ResponseCache(CACHE_DIR, max_bytes=args.cache_max_mb * 1024 * 1024,
+                                       offline=args.replay)
+
+    if args.replay:
+        run_replay()
+    elif args.pipeline:
+        run_crawler_pipeline(concurrency=args.concurrency, rps=args.rps, parse_workers=args.parse_workers,
+                             queue_size=args.queue_size)
+    elif args.use_async:
+        run_crawler_async(concurrency=args.concurrency, rps=args.rps)
+    else:
+        run_crawler()
@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+
+## 한 줄에 레코드 하나씩 쌓는 추가 전용 저널 (JSON Lines) ----------------------------------
+# - append()마다 flush + fsync → 비정상 종료 시에도 마지막으로 쓴 줄까지 보존
+# - 쓰다가 끊긴 마지막 줄(개행 없음/JSON 깨짐)은 읽을 때 무시하고,
+#   다음 append 전에 잘라냄 (새 레코드가 끊긴 줄 뒤에 붙어 같이 버려지지 않게)
+# - 체크포인트 비용은 레코드 하나 크기만큼 (전체 파일 재작성 없음)
+
+
+class JsonlJournal:
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._tail_checked = False
+
+    def _truncate_torn_tail(self):
+        """파일이 개행으로 끝나지 않으면 마지막 개행 뒤(끊긴 줄)를 잘라냄"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            pos = end
+            while pos > 0:
+                step = min(4096, pos)
+                f.seek(pos - step)
+                chunk = f.read(step)
+                if pos == end and chunk.endswith(b"\n"):
+                    return
+                newline = chunk.rfind(b"\n")
+                if newline >= 0:
+                    pos = pos - step + newline + 1
+                    break
+                pos -= step
+            f.truncate(pos)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, record):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            if not self._tail_checked:
+                self._truncate_torn_tail()
+                self._tail_checked = True
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def read_all(self):
+        """저널의 완전한 레코드 전체 (끊긴 마지막 줄 제외)"""
+        records = []
+        if not os.path.exists(self.path):
+            return records
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records
+
+    def last(self):
+        """마지막 완전한 레코드 (파일 끝에서부터 읽어서 전체를 읽지 않음)"""
+        if not os.path.exists(self.path):
+            return None
+
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            chunk = b""
+            pos = end
+            while pos > 0:
+                step = min(4096, pos)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step) + chunk
+                lines = chunk.split(b"\n")
+                # lines[-1]은 개행으로 끝나지 않은(끊긴) 조각
+                for line in reversed(lines[1:-1] if pos > 0 else lines[:-1]):
+                    try:
+                        return json.loads(line.decode("utf-8"))
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+        return None
+
+    def clear(self):
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._tail_checked = False
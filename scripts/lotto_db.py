@@ -0,0 +1,340 @@
+import argparse
+import json
+import os
+import sqlite3
+
+## SQLite 저장소 (선택) ----------------------------------------------------------------
+# JSON 파일 전체를 다시 쓰지 않고 몇 건만 바꿀 수 있도록 회차/판매점을 SQLite에 저장한다.
+# - LOTTO_DB 환경변수에 DB 경로를 지정하면 DB가 쓰기 대상: 각 스크립트는 바뀐 회차/판매점만
+#   DB에 upsert하고, 앱용 JSON(history.json, stores.json)은 DB에서 내보낸다
+#   (history_io.export_from_db / stores_io.publish_stores → export_history / export_stores)
+# - 처음 켤 때 DB가 비어 있으면 기존 JSON을 먼저 가져옴 (import_json(only_empty=True))
+# - 지정하지 않으면 지금처럼 JSON 파일이 원본
+#
+#   python scripts/lotto_db.py import   # 기존 JSON → DB
+#   python scripts/lotto_db.py export   # DB → JSON
+
+
+# --- 설정 ---
+BASE_DIR = os.getcwd()
+DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
+HISTORY_FILE = os.path.join(DATA_DIR, 'history.json')
+STORES_FILE = os.path.join(DATA_DIR, 'stores.json')
+ALIASES_FILE = os.path.join(DATA_DIR, 'store_aliases.json')
+DB_FILE = os.path.join(DATA_DIR, 'lotto.db')
+
+RANKS = ["1st", "2nd", "3rd"]
+STORE_RANKS = ["1st", "2nd"]
+
+# stores.json 레코드에서 전용 컬럼으로 저장하는 키 (나머지는 extra JSON)
+STORE_FIELDS = ["name", "address", "phone", "wins", "likes", "dislikes", "lat", "lng"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS draws (
+    round    INTEGER PRIMARY KEY,
+    date     TEXT NOT NULL,
+    n1 INTEGER, n2 INTEGER, n3 INTEGER, n4 INTEGER, n5 INTEGER, n6 INTEGER,
+    bonus    INTEGER
+);
+CREATE TABLE IF NOT EXISTS prize_tiers (
+    round    INTEGER NOT NULL,
+    rank     TEXT NOT NULL,
+    prize    INTEGER NOT NULL,
+    winners  INTEGER NOT NULL,
+    PRIMARY KEY (round, rank)
+);
+CREATE TABLE IF NOT EXISTS stores (
+    store_key TEXT PRIMARY KEY,
+    seq       INTEGER NOT NULL,
+    name      TEXT NOT NULL,
+    address   TEXT NOT NULL,
+    phone     TEXT NOT NULL DEFAULT '',
+    likes     INTEGER NOT NULL DEFAULT 0,
+    dislikes  INTEGER NOT NULL DEFAULT 0,
+    lat       REAL NOT NULL DEFAULT 0.0,
+    lng       REAL NOT NULL DEFAULT 0.0,
+    extra     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_stores_latlng ON stores (lat, lng);
+CREATE INDEX IF NOT EXISTS idx_stores_seq ON stores (seq);
+-- 회차별 당첨 판매점 목록 (history.json의 result[rank].stores 순서 그대로)
+CREATE TABLE IF NOT EXISTS store_wins (
+    round     INTEGER NOT NULL,
+    rank      TEXT NOT NULL,
+    position  INTEGER NOT NULL,
+    store_key TEXT NOT NULL,
+    name      TEXT NOT NULL,
+    addr      TEXT NOT NULL,
+    method    TEXT,
+    PRIMARY KEY (round, rank, position)
+);
+CREATE INDEX IF NOT EXISTS idx_store_wins_key ON store_wins (store_key, rank, round);
+-- 중복 병합으로 흡수된 판매점 키 → 대표 키 (dedup_stores.py)
+CREATE TABLE IF NOT EXISTS store_aliases (
+    alias_key TEXT PRIMARY KEY,
+    store_key TEXT NOT NULL
+);
+"""
+
+
+def normalize_key(name, addr):
+    """
+    판매점을 구분하는 고유 키 생성 (모든 스크립트가 이 함수 하나를 씀)
+    이름과 주소의 공백을 제거하고 합쳐서 비교 (오타/공백 차이 방지)
+    """
+    n = name.replace(' ', '').strip()
+    a = addr.replace(' ', '').strip()
+    return f"{n}|{a}"
+
+
+def store_key(store):
+    """stores.json 레코드 → normalize_key"""
+    return normalize_key(store.get('name', ''), store.get('address', ''))
+
+
+def connect(db_file=DB_FILE):
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def enabled():
+    return bool(os.environ.get("LOTTO_DB"))
+
+
+def connect_if_enabled():
+    """LOTTO_DB 환경변수가 있으면 연결, 없으면 None"""
+    db_file = os.environ.get("LOTTO_DB")
+    return connect(db_file) if db_file else None
+
+
+# --- 쓰기 (모두 한 트랜잭션 안에서 일괄 upsert) ---
+
+def upsert_draws(conn, records):
+    draw_rows = []
+    tier_rows = []
+    win_rows = []
+    rounds = []
+    for record in records:
+        round_no = record["round"]
+        rounds.append((round_no,))
+        draw_rows.append((round_no, record["date"], *record["numbers"], record["bonus"]))
+        for rank in RANKS:
+            tier = record["result"].get(rank)
+            if tier is None:
+                continue
+            tier_rows.append((round_no, rank, tier.get("prize", 0), tier.get("winners", 0)))
+            for position, entry in enumerate(tier.get("stores", []) if rank in STORE_RANKS else []):
+                win_rows.append((round_no, rank, position,
+                                 normalize_key(entry["name"], entry.get("addr", "")),
+                                 entry["name"], entry.get("addr", ""), entry.get("method")))
+
+    with conn:
+        conn.executemany(
+            "INSERT INTO draws VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(round) DO UPDATE SET date=excluded.date, n1=excluded.n1, n2=excluded.n2, "
+            "n3=excluded.n3, n4=excluded.n4, n5=excluded.n5, n6=excluded.n6, bonus=excluded.bonus",
+            draw_rows,
+        )
+        conn.executemany(
+            "INSERT INTO prize_tiers VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(round, rank) DO UPDATE SET prize=excluded.prize, winners=excluded.winners",
+            tier_rows,
+        )
+        # 회차별 판매점 목록은 통째로 교체 (순서/개수가 바뀔 수 있으므로)
+        conn.executemany("DELETE FROM store_wins WHERE round = ?", rounds)
+        conn.executemany("INSERT INTO store_wins VALUES (?, ?, ?, ?, ?, ?, ?)", win_rows)
+
+
+def upsert_stores(conn, stores):
+    """stores.json 레코드 upsert (wins는 store_wins에서 계산하므로 저장하지 않음)"""
+    with conn:
+        next_seq = conn.execute("SELECT COALESCE(MAX(seq), -1) + 1 FROM stores").fetchone()[0]
+        rows = []
+        for store in stores:
+            extra = {k: v for k, v in store.items() if k not in STORE_FIELDS}
+            rows.append((
+                normalize_key(store["name"], store.get("address", "")),
+                next_seq, store["name"], store.get("address", ""), store.get("phone", ""),
+                store.get("likes", 0), store.get("dislikes", 0),
+                store.get("lat", 0.0), store.get("lng", 0.0),
+                json.dumps(extra, ensure_ascii=False) if extra else None,
+            ))
+            next_seq += 1
+        conn.executemany(
+            "INSERT INTO stores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(store_key) DO UPDATE SET name=excluded.name, address=excluded.address, "
+            "phone=excluded.phone, likes=excluded.likes, dislikes=excluded.dislikes, "
+            "lat=excluded.lat, lng=excluded.lng, extra=excluded.extra",
+            rows,
+        )
+
+
+def upsert_store_aliases(conn, mapping):
+    """mapping: {흡수된 키: 대표 키}"""
+    with conn:
+        conn.executemany(
+            "INSERT INTO store_aliases VALUES (?, ?) "
+            "ON CONFLICT(alias_key) DO UPDATE SET store_key=excluded.store_key",
+            list(mapping.items()),
+        )
+
+
+def update_store_coords(conn, updates):
+    """updates: [(store_key, lat, lng), ...]"""
+    with conn:
+        conn.executemany("UPDATE stores SET lat = ?, lng = ? WHERE store_key = ?",
+                         [(lat, lng, key) for key, lat, lng in updates])
+
+
+def delete_stores(conn, store_keys):
+    with conn:
+        conn.executemany("DELETE FROM stores WHERE store_key = ?", [(key,) for key in store_keys])
+
+
+# --- 읽기 / JSON 내보내기 ---
+
+def fetch_history(conn):
+    """history.json과 같은 구조 (최신 회차 먼저)"""
+    tiers = {}
+    for round_no, rank, prize, winners in conn.execute("SELECT round, rank, prize, winners FROM prize_tiers"):
+        tiers.setdefault(round_no, {})[rank] = {"prize": prize, "winners": winners}
+
+    wins = {}
+    for round_no, rank, name, addr, method in conn.execute(
+            "SELECT round, rank, name, addr, method FROM store_wins ORDER BY round, rank, position"):
+        entry = {"name": name, "addr": addr}
+        if rank == "1st":
+            entry["method"] = method
+        wins.setdefault((round_no, rank), []).append(entry)
+
+    history = []
+    for row in conn.execute("SELECT round, date, n1, n2, n3, n4, n5, n6, bonus FROM draws ORDER BY round DESC"):
+        round_no = row[0]
+        result = {}
+        for rank in RANKS:
+            tier = dict(tiers.get(round_no, {}).get(rank, {"prize": 0, "winners": 0}))
+            if rank in STORE_RANKS:
+                tier["stores"] = wins.get((round_no, rank), [])
+            result[rank] = tier
+        history.append({
+            "round": round_no,
+            "date": row[1],
+            "numbers": list(row[2:8]),
+            "bonus": row[8],
+            "result": result,
+        })
+    return history
+
+
+def fetch_stores(conn):
+    """stores.json과 같은 구조 (처음 등록된 순서)"""
+    wins = {}
+    for key, rank, round_no in conn.execute(
+            "SELECT DISTINCT COALESCE(a.store_key, w.store_key) AS key, w.rank, w.round "
+            "FROM store_wins w LEFT JOIN store_aliases a ON a.alias_key = w.store_key "
+            "ORDER BY key, w.rank, w.round DESC"):
+        wins.setdefault(key, {"1st": [], "2nd": []})[rank].append(round_no)
+
+    stores = []
+    for key, name, address, phone, likes, dislikes, lat, lng, extra in conn.execute(
+            "SELECT store_key, name, address, phone, likes, dislikes, lat, lng, extra "
+            "FROM stores ORDER BY seq"):
+        store = {
+            "name": name,
+            "address": address,
+            "phone": phone,
+            "wins": wins.get(key, {"1st": [], "2nd": []}),
+            "likes": likes,
+            "dislikes": dislikes,
+            "lat": lat,
+            "lng": lng,
+        }
+        if extra:
+            store.update(json.loads(extra))
+        stores.append(store)
+    return stores
+
+
+def stores_near(conn, lat, lng, delta=0.01):
+    """위경도 범위 안의 판매점 (idx_stores_latlng 사용)"""
+    return conn.execute(
+        "SELECT store_key, name, address, lat, lng FROM stores "
+        "WHERE lat BETWEEN ? AND ? AND lng BETWEEN ? AND ?",
+        (lat - delta, lat + delta, lng - delta, lng + delta),
+    ).fetchall()
+
+
+def _has_rows(conn, table):
+    return conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is not None
+
+
+def import_json(conn, history_file=HISTORY_FILE, stores_file=STORES_FILE, only_empty=False):
+    """
+    기존 JSON → DB.
+    - only_empty: 비어 있는 테이블만 채움 (DB를 처음 켰을 때 - 이미 DB가 원본이면 아무것도 안 함)
+    """
+    counts = {}
+    if os.path.exists(history_file) and not (only_empty and _has_rows(conn, "draws")):
+        with open(history_file, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+        upsert_draws(conn, history)
+        counts["draws"] = len(history)
+    if os.path.exists(stores_file) and not (only_empty and _has_rows(conn, "stores")):
+        with open(stores_file, 'r', encoding='utf-8') as f:
+            stores = json.load(f)
+        upsert_stores(conn, stores)
+        counts["stores"] = len(stores)
+    if os.path.exists(ALIASES_FILE) and not (only_empty and _has_rows(conn, "store_aliases")):
+        with open(ALIASES_FILE, 'r', encoding='utf-8') as f:
+            aliases = json.load(f)
+        mapping = {alias: key for key, entry in aliases.items() for alias in entry["aliases"]}
+        upsert_store_aliases(conn, mapping)
+        counts["aliases"] = len(mapping)
+    return counts
+
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def export_history(conn, history_file=HISTORY_FILE):
+    """DB → history.json, 반환: 내보낸 회차 목록 (최신순)"""
+    history = fetch_history(conn)
+    _write_json(history_file, history)
+    return history
+
+
+def export_stores(conn, stores_file=STORES_FILE):
+    """DB → stores.json, 반환: 내보낸 판매점 목록 (등록 순서)"""
+    stores = fetch_stores(conn)
+    _write_json(stores_file, stores)
+    return stores
+
+
+def export_json(conn, history_file=HISTORY_FILE, stores_file=STORES_FILE):
+    history = export_history(conn, history_file)
+    stores = export_stores(conn, stores_file)
+    return {"draws": len(history), "stores": len(stores)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로또 SQLite 저장소 관리")
+    parser.add_argument("command", choices=["import", "export"],
+                        help="import: JSON → DB / export: DB → JSON")
+    parser.add_argument("--db", default=os.environ.get("LOTTO_DB") or DB_FILE, help="DB 파일 경로")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == "import":
+        counts = import_json(conn)
+        print(f"✨ {args.db} 가져오기 완료: {counts}")
+    else:
+        counts = export_json(conn)
+        print(f"✨ JSON 내보내기 완료: {counts}")
+    conn.close()
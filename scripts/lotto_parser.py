@@ -0,0 +1,407 @@
+import os
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html as lxml_html
+except ImportError:  # lxml은 선택 의존성
+    lxml_html = None
+
+## 동행복권 HTML 파서 (상금표/판매점표/최신 회차) --------------------------------------
+# 백엔드
+# - "lxml"   : lxml 트리 + XPath (설치되어 있으면 기본)
+# - "stream" : 표준 라이브러리 HTMLParser로 tbl_data 행만 뽑는 스트리밍 토크나이저
+# - "bs4"    : 기존 BeautifulSoup(html.parser) 방식 (빠른 경로 실패 시 폴백)
+# 세 백엔드는 같은 prizes/stores dict를 만들어야 한다.
+
+BACKENDS = ("lxml", "stream", "bs4")
+
+# LOTTO_PARSER 환경변수로 강제 지정 가능
+DEFAULT_BACKEND = os.environ.get("LOTTO_PARSER") or ("lxml" if lxml_html is not None else "stream")
+
+PRIZE_KEYS = ["1st", "2nd", "3rd"]
+NO_RESULT_TEXT = "조회 결과가 없습니다"
+
+# topStore 페이지 이동 링크: onclick="selfSubmit(3)"
+_PAGE_LINK_RE = re.compile(r"selfSubmit\((\d+)\)")
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+
+# --- 공통 조립 (백엔드가 뽑은 셀 텍스트 → dict) ---
+
+def empty_prizes():
+    return {key: {"prize": 0, "winners": 0} for key in PRIZE_KEYS}
+
+
+def build_prizes(rows):
+    """
+    rows: 상금표 각 행의 td 텍스트 목록
+    - 뒤에서부터: '... 원' 들어간 마지막 셀 = 당첨금, 그 앞 = 인원
+    """
+    prizes = empty_prizes()
+
+    for i, key in enumerate(PRIZE_KEYS):
+        if i >= len(rows):
+            break
+
+        prize_text = None
+        winner_text = None
+        for txt in reversed(rows[i]):
+            txt = txt.strip()
+            if "원" in txt and prize_text is None:
+                prize_text = txt
+            elif prize_text is not None and winner_text is None:
+                winner_text = txt
+                break
+
+        if prize_text is None or winner_text is None:
+            continue
+
+        try:
+            prize_val = int(prize_text.replace(",", "").replace("원", "").strip())
+            winner_val = int(winner_text.replace(",", "").replace("개", "").strip())
+        except ValueError:
+            # 개별 등수만 실패한 경우 → 그 등수는 0으로 남겨둠
+            continue
+
+        prizes[key]["prize"] = prize_val
+        prizes[key]["winners"] = winner_val
+
+    return prizes
+
+
+def build_stores(tables, first_table):
+    """
+    tables: table.tbl_data 별 행 목록 (행 = td 텍스트 목록)
+    - tables[first_table]     : 1등 배출점 (번호, 상호, 구분, 소재지 ...)
+    - tables[first_table + 1] : 2등 배출점 (번호, 상호, 소재지 ...)
+    """
+    stores = {"1st": [], "2nd": []}
+
+    if len(tables) > first_table:
+        for cols in tables[first_table]:
+            if len(cols) >= 4:
+                name = cols[1].strip()
+                if NO_RESULT_TEXT not in name:
+                    stores["1st"].append(
+                        {"name": name, "addr": cols[3].strip(), "method": cols[2].strip()}
+                    )
+
+    if len(tables) > first_table + 1:
+        for cols in tables[first_table + 1]:
+            if len(cols) >= 3:
+                name = cols[1].strip()
+                if NO_RESULT_TEXT not in name:
+                    stores["2nd"].append({"name": name, "addr": cols[2].strip()})
+
+    return stores
+
+
+def build_latest(round_text, date_text, ball_texts, prize_rows):
+    """byWin 페이지 최신 회차 dict (판매점 제외)"""
+    round_num = int(round_text.replace("회", ""))
+    date_text = date_text.replace("(", "").replace(")", "").replace(" 추첨", "")
+
+    numbers = [int(txt) for txt in ball_texts]
+    bonus_number = numbers.pop()
+
+    return {
+        "round": round_num,
+        "date": date_text,
+        "numbers": numbers,
+        "bonus": bonus_number,
+        "result": build_prizes(prize_rows),
+    }
+
+
+# --- bs4 백엔드 ---
+
+def _bs4_prize_rows(soup):
+    return [[cell.text for cell in row.find_all("td")] for row in soup.select(".tbl_data tbody tr")]
+
+
+def _bs4_prizes(html):
+    return build_prizes(_bs4_prize_rows(BeautifulSoup(html, "html.parser")))
+
+
+def _bs4_tables(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [
+        [[cell.text for cell in row.find_all("td")] for row in table.select("tbody tr")]
+        for table in soup.select("table.tbl_data")
+    ]
+
+
+def _bs4_latest(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return build_latest(
+        soup.select_one(".win_result h4 strong").text,
+        soup.select_one(".win_result .desc").text,
+        [span.text for span in soup.select(".ball_645")],
+        _bs4_prize_rows(soup),
+    )
+
+
+# --- lxml 백엔드 ---
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_XP_PRIZE_ROWS = f"//*[{_has_class('tbl_data')}]//tbody//tr"
+_XP_TABLES = f"//table[{_has_class('tbl_data')}]"
+_XP_ROUND = f"//*[{_has_class('win_result')}]//h4//strong"
+_XP_DESC = f"//*[{_has_class('win_result')}]//*[{_has_class('desc')}]"
+_XP_BALLS = f"//*[{_has_class('ball_645')}]"
+
+
+def _lxml_doc(html):
+    return lxml_html.document_fromstring(html)
+
+
+def _lxml_rows(rows):
+    return [[td.text_content() for td in row.iter("td")] for row in rows]
+
+
+def _lxml_prizes(html):
+    return build_prizes(_lxml_rows(_lxml_doc(html).xpath(_XP_PRIZE_ROWS)))
+
+
+def _lxml_tables(html):
+    return [_lxml_rows(table.xpath(".//tbody//tr")) for table in _lxml_doc(html).xpath(_XP_TABLES)]
+
+
+def _lxml_latest(html):
+    doc = _lxml_doc(html)
+    return build_latest(
+        doc.xpath(_XP_ROUND)[0].text_content(),
+        doc.xpath(_XP_DESC)[0].text_content(),
+        [el.text_content() for el in doc.xpath(_XP_BALLS)],
+        _lxml_rows(doc.xpath(_XP_PRIZE_ROWS)),
+    )
+
+
+# --- stream 백엔드 ---
+
+class _TblDataStream(HTMLParser):
+    """
+    트리를 만들지 않고 필요한 텍스트만 모으는 토크나이저.
+    - prize_rows : '.tbl_data tbody tr' 행 (문서 순서)
+    - tables     : 'table.tbl_data' 별 'tbody tr' 행
+    - round_text / desc_text / balls : byWin 최신 회차 영역
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []
+        self.prize_rows = []
+        self.tables = []
+        self.round_text = None
+        self.desc_text = None
+        self.balls = []
+        self._buffers = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+
+        classes = ()
+        for key, value in attrs:
+            if key == "class" and value:
+                classes = value.split()
+                break
+
+        entry = {"tag": tag, "classes": classes, "row": None,
+                 "table_idx": None, "buf": None, "target": None}
+        stack = self.stack
+
+        if tag == "table" and "tbl_data" in classes:
+            entry["table_idx"] = len(self.tables)
+            self.tables.append([])
+
+        elif tag == "tr":
+            # tbody 바깥쪽에 있는 tbl_data 조상 / tbody 안쪽 table.tbl_data 조상 찾기
+            tbody_seen = False
+            in_prize = False
+            table_ids = []
+            for parent in reversed(stack):
+                if parent["tag"] == "tbody":
+                    tbody_seen = True
+                elif tbody_seen and "tbl_data" in parent["classes"]:
+                    in_prize = True
+                    if parent["table_idx"] is not None:
+                        table_ids.append(parent["table_idx"])
+            if in_prize:
+                row = []
+                entry["row"] = row
+                self.prize_rows.append(row)
+                for idx in reversed(table_ids):
+                    self.tables[idx].append(row)
+
+        elif tag == "td":
+            for parent in reversed(stack):
+                if parent["row"] is not None:
+                    entry["target"] = parent["row"]
+                    entry["buf"] = []
+                    break
+
+        if tag == "strong" and self.round_text is None and self._under(("h4",), "win_result"):
+            entry["target"] = "round"
+            entry["buf"] = []
+        elif "desc" in classes and self.desc_text is None and self._under((), "win_result"):
+            entry["target"] = "desc"
+            entry["buf"] = []
+        elif "ball_645" in classes:
+            entry["target"] = "ball"
+            entry["buf"] = []
+
+        if entry["buf"] is not None:
+            self._buffers.append(entry["buf"])
+        stack.append(entry)
+
+    def _under(self, tags, cls):
+        """스택에 tags 순서대로(안쪽→바깥쪽) 조상이 있고, 그보다 바깥에 cls 클래스 조상이 있는지"""
+        need = list(tags)
+        for parent in reversed(self.stack):
+            if need and parent["tag"] == need[0]:
+                need.pop(0)
+            elif not need and cls in parent["classes"]:
+                return True
+        return False
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i]["tag"] == tag:
+                break
+        else:
+            return
+
+        while len(self.stack) > i:
+            self._close(self.stack.pop())
+
+    def _close(self, entry):
+        buf = entry["buf"]
+        if buf is None:
+            return
+        self._buffers.remove(buf)
+        text = "".join(buf)
+        target = entry["target"]
+        if target == "round":
+            self.round_text = text
+        elif target == "desc":
+            self.desc_text = text
+        elif target == "ball":
+            self.balls.append(text)
+        else:
+            target.append(text)
+
+    def handle_data(self, data):
+        for buf in self._buffers:
+            buf.append(data)
+
+    def finish(self, html):
+        self.feed(html)
+        self.close()
+        while self.stack:
+            self._close(self.stack.pop())
+        return self
+
+
+def _stream_prizes(html):
+    return build_prizes(_TblDataStream().finish(html).prize_rows)
+
+
+def _stream_tables(html):
+    return _TblDataStream().finish(html).tables
+
+
+def _stream_latest(html):
+    stream = _TblDataStream().finish(html)
+    if stream.round_text is None or stream.desc_text is None:
+        raise ValueError("win_result 영역을 찾을 수 없습니다")
+    return build_latest(stream.round_text, stream.desc_text, stream.balls, stream.prize_rows)
+
+
+_IMPLS = {
+    "lxml": {"prizes": _lxml_prizes, "tables": _lxml_tables, "latest": _lxml_latest},
+    "stream": {"prizes": _stream_prizes, "tables": _stream_tables, "latest": _stream_latest},
+    "bs4": {"prizes": _bs4_prizes, "tables": _bs4_tables, "latest": _bs4_latest},
+}
+
+
+def _run(kind, html, backend):
+    backend = backend or DEFAULT_BACKEND
+    if backend == "lxml" and lxml_html is None:
+        backend = "stream"
+    if backend not in _IMPLS:
+        raise ValueError(f"알 수 없는 파서 백엔드: {backend}")
+
+    if backend == "bs4":
+        return _IMPLS["bs4"][kind](html)
+    try:
+        return _IMPLS[backend][kind](html)
+    except Exception:
+        # 빠른 경로가 예상 못 한 구조를 만나면 기존 BeautifulSoup 파서로
+        return _IMPLS["bs4"][kind](html)
+
+
+def parse_prizes(html, backend=None):
+    """byWin 페이지 → 1~3등 상금/당첨자 수"""
+    return _run("prizes", html, backend)
+
+
+def parse_stores(html, first_table=1, backend=None):
+    """topStore 페이지 → 1등/2등 배출점 목록 (first_table: 1등 표의 table.tbl_data 순번)"""
+    return build_stores(_run("tables", html, backend), first_table)
+
+
+def parse_latest(html, backend=None):
+    """byWin 페이지 → 회차/날짜/번호/보너스/상금 (판매점 제외)"""
+    return _run("latest", html, backend)
+
+
+def parse_round_pages(bywin_html, store_pages, backend=None):
+    """
+    한 회차 원본 페이지 → (prizes, 페이지별 stores 목록, 오류 메시지 목록).
+    프로세스 풀에서 부르는 순수 함수 (init_lotto.run_crawler_pipeline).
+    - byWin이 없거나 파싱 실패 → empty_prizes()
+    - 판매점 첫 페이지가 없거나 파싱 실패 → 빈 목록 (나머지 페이지도 버림)
+    - 2페이지 이후 누락/파싱 실패 → 그 페이지만 건너뜀
+    """
+    errors = []
+    prizes = empty_prizes()
+    if bywin_html is not None:
+        try:
+            prizes = parse_prizes(bywin_html, backend)
+        except Exception as e:
+            errors.append(f"상금 파싱 오류: {e}")
+
+    pages = []
+    if store_pages and store_pages[0] is not None:
+        for page, html in enumerate(store_pages, start=1):
+            if html is None:
+                errors.append(f"판매점 {page}페이지 누락")
+                continue
+            try:
+                pages.append(parse_stores(html, first_table=1, backend=backend))
+            except Exception as e:
+                errors.append(f"판매점 파싱 오류 ({page}페이지): {e}")
+                if page == 1:
+                    break
+    return prizes, pages, errors
+
+
+def parse_page_count(html):
+    """topStore 페이지의 전체 페이지 수 (페이지 이동 링크 중 가장 큰 번호, 없으면 1)"""
+    pages = [int(num) for num in _PAGE_LINK_RE.findall(html)]
+    return max(pages) if pages else 1
+
+
+def available_backends():
+    return [name for name in BACKENDS if name != "lxml" or lxml_html is not None]
@@ -1,6 +1,9 @@
 import json
 import os
 import sys
+
+import lotto_db
+from stores_io import publish_stores
 # Store에 대한 Dislike 관리 스크립 ------------------------------------------------------
 
 
@@ -10,12 +13,6 @@ DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
 STORES_FILE = os.path.join(DATA_DIR, 'stores.json')
 DELETE_STORES_FILE = os.path.join(DATA_DIR, 'Delete_stores.json')
 
-def normalize_key(store):
-    """중복 방지를 위한 고유 키 생성 (이름+주소)"""
-    name = store.get('name', '').replace(' ', '').strip()
-    addr = store.get('address', '').replace(' ', '').strip()
-    return f"{name}|{addr}"
-
 def filter_bad_stores():
     print("🧹 판매점 데이터 정리 시작 (싫어요 > 30 필터링)...")
 
@@ -41,10 +38,11 @@ def filter_bad_stores():
             pass
 
     # 삭제 목록 맵핑 (중복 방지 및 업데이트용)
-    deleted_map = {normalize_key(s): i for i, s in enumerate(deleted_stores)}
+    deleted_map = {lotto_db.store_key(s): i for i, s in enumerate(deleted_stores)}
 
     valid_stores = []
     moved_count = 0
+    moved_keys = []
 
     # 2. 필터링 로직
     for store in all_stores:
@@ -54,7 +52,7 @@ def filter_bad_stores():
             print(f"🚫 차단: {store['name']} (싫어요 {dislikes}개) -> Delete_stores.json으로 이동")
             
             # 고유 키 생성
-            key = normalize_key(store)
+            key = lotto_db.store_key(store)
             
             # 이미 삭제 목록에 있다면 정보 갱신(업데이트), 없으면 추가
             if key in deleted_map:
@@ -65,14 +63,14 @@ def filter_bad_stores():
                 deleted_map[key] = len(deleted_stores) - 1
             
             moved_count += 1
+            moved_keys.append(key)
         else:
             valid_stores.append(store)
 
     # 3. 결과 저장
     if moved_count > 0:
-        # 유효한 매장만 다시 저장
-        with open(STORES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(valid_stores, f, ensure_ascii=False, indent=2)
+        # 유효한 매장만 다시 저장 (색인/순위표/delta/DB는 publish_stores가 같이 갱신)
+        publish_stores(valid_stores, deletes=moved_keys, stores_file=STORES_FILE)
         
         # 차단된 매장 저장
         with open(DELETE_STORES_FILE, 'w', encoding='utf-8') as f:
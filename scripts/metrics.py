@@ -0,0 +1,249 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+## 단계별 계측 (카운터 / 게이지 / 타이머 히스토그램) ---------------------------------------
+# 긴 수집이 어디서 시간을 쓰는지 보기 위한 계측. 단계(stage)는 http / parse / merge / serialize / geocode.
+# LOTTO_METRICS 환경변수에 폴더를 지정하면 켜지고, 없으면 모든 함수가 바로 반환한다 (조용한 모드).
+#   <폴더>/metrics.jsonl : 타이머 구간마다 한 줄 {"ts", "type": "span", "stage", "seconds", 라벨...}
+#                          + 끝날 때 전체 집계 {"type": "summary", ...}
+#   <폴더>/lotto.prom    : Prometheus textfile collector 형식 (FLUSH_SECONDS마다, 끝날 때 갱신)
+#
+#   with metrics.timer("parse", page="byWin"):
+#       prizes = parse_prizes(html)
+#   metrics.inc("http_bytes_total", len(resp.content))
+#   metrics.gauge("queue_depth", len(results), queue="backfill")
+#
+#   LOTTO_METRICS=.cache/metrics python scripts/init_lotto.py --async
+
+
+# --- 설정 ---
+METRICS_DIR = os.environ.get("LOTTO_METRICS")
+JSONL_NAME = "metrics.jsonl"
+PROM_NAME = "lotto.prom"
+PREFIX = "lotto_"
+FLUSH_SECONDS = 15.0
+
+# 단계 시간 히스토그램 구간 (초)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class Registry:
+    """계측값 보관 + 파일 출력 (스레드 안전)"""
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.jsonl_path = os.path.join(directory, JSONL_NAME)
+        self.prom_path = os.path.join(directory, PROM_NAME)
+        self._lock = threading.Lock()
+        self._jsonl = open(self.jsonl_path, 'a', encoding='utf-8')
+        self._last_flush = time.monotonic()
+        self.counters = {}     # (이름, 라벨) → 값
+        self.gauges = {}       # (이름, 라벨) → 값
+        self.histograms = {}   # (이름, 라벨) → [구간별 개수..., 합계, 개수]
+
+    def inc(self, name, value, labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def gauge(self, name, value, labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.gauges[key] = value
+
+    def _observe(self, key, value):
+        hist = self.histograms.get(key)
+        if hist is None:
+            hist = self.histograms[key] = [0] * len(BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                hist[i] += 1
+        hist[-2] += value
+        hist[-1] += 1
+
+    def observe(self, name, value, labels):
+        with self._lock:
+            self._observe((name, _label_key(labels)), value)
+
+    def span(self, stage, seconds, labels):
+        """타이머 한 구간: stage_seconds 히스토그램 + JSONL 한 줄"""
+        line = json.dumps({"ts": round(time.time(), 3), "type": "span", "stage": stage,
+                           "seconds": round(seconds, 6), **labels}, ensure_ascii=False)
+        with self._lock:
+            self._observe(("stage_seconds", _label_key({"stage": stage, **labels})), seconds)
+            self._jsonl.write(line + "\n")
+            due = time.monotonic() - self._last_flush >= FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def render_prometheus(self):
+        with self._lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            histograms = {key: list(hist) for key, hist in self.histograms.items()}
+
+        lines = []
+        for kind, values in (("counter", counters), ("gauge", gauges)):
+            for name in sorted({name for name, _ in values}):
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                for (n, key), value in sorted(values.items()):
+                    if n == name:
+                        lines.append(f"{PREFIX}{name}{_format_labels(key)} {value}")
+        for name in sorted({name for name, _ in histograms}):
+            lines.append(f"# TYPE {PREFIX}{name} histogram")
+            for (n, key), hist in sorted(histograms.items()):
+                if n != name:
+                    continue
+                for bound, count in zip(BUCKETS, hist):
+                    lines.append(f"{PREFIX}{name}_bucket{_format_labels(key, [('le', str(bound))])} {count}")
+                lines.append(f"{PREFIX}{name}_bucket{_format_labels(key, [('le', '+Inf')])} {hist[-1]}")
+                lines.append(f"{PREFIX}{name}_sum{_format_labels(key)} {hist[-2]:.6f}")
+                lines.append(f"{PREFIX}{name}_count{_format_labels(key)} {hist[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """JSONL 마지막 줄용 전체 집계"""
+        def labeled(key):
+            name, labels = key
+            return name + _format_labels(labels)
+
+        with self._lock:
+            return {
+                "ts": round(time.time(), 3),
+                "type": "summary",
+                "counters": {labeled(k): v for k, v in sorted(self.counters.items())},
+                "gauges": {labeled(k): v for k, v in sorted(self.gauges.items())},
+                "timers": {labeled(k): {"count": h[-1], "seconds": round(h[-2], 6)}
+                           for k, h in sorted(self.histograms.items())},
+            }
+
+    def flush(self):
+        """Prometheus textfile 갱신 (textfile collector가 반쯤 쓴 파일을 읽지 않게 교체 방식)"""
+        text = self.render_prometheus()
+        tmp_path = self.prom_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, self.prom_path)
+        with self._lock:
+            self._jsonl.flush()
+            self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        line = json.dumps(self.summary(), ensure_ascii=False)
+        with self._lock:
+            self._jsonl.write(line + "\n")
+            self._jsonl.close()
+
+
+class _Timer:
+    __slots__ = ("registry", "stage", "labels", "started")
+
+    def __init__(self, registry, stage, labels):
+        self.registry = registry
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.span(self.stage, time.perf_counter() - self.started, self.labels)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+_registry = None
+
+
+def configure(directory=METRICS_DIR):
+    """계측 켜기/끄기 (directory가 None이면 끔). 기존 계측은 닫고 새로 시작"""
+    global _registry
+    if _registry is not None:
+        _registry.close()
+    _registry = Registry(directory) if directory else None
+    return _registry
+
+
+def discard():
+    """
+    계측 끄기 - close()와 달리 파일에 아무것도 쓰지 않음.
+    spawn 작업자(파싱 풀 등)의 initializer: import 때 부모의 LOTTO_METRICS로 켜진 계측이
+    빈 요약 줄/빈 lotto.prom을 쓰지 않게 함
+    """
+    global _registry
+    if _registry is not None:
+        _registry._jsonl.close()
+    _registry = None
+
+
+def enabled():
+    return _registry is not None
+
+
+def timer(stage, **labels):
+    """with metrics.timer("parse", page="byWin"): ... → 구간 시간 기록 (꺼져 있으면 빈 컨텍스트)"""
+    if _registry is None:
+        return _NULL_TIMER
+    return _Timer(_registry, stage, labels)
+
+
+def inc(name, value=1, **labels):
+    if _registry is None:
+        return
+    _registry.inc(name, value, labels)
+
+
+def gauge(name, value, **labels):
+    if _registry is None:
+        return
+    _registry.gauge(name, value, labels)
+
+
+def observe(name, value, **labels):
+    if _registry is None:
+        return
+    _registry.observe(name, value, labels)
+
+
+def flush():
+    if _registry is not None:
+        _registry.flush()
+
+
+def _close_at_exit():
+    if _registry is not None:
+        _registry.close()
+
+
+configure()
+atexit.register(_close_at_exit)
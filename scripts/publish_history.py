@@ -0,0 +1,176 @@
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성 (없으면 .br 생략)
+    brotli = None
+
+## 앱 배포용 history 샤드 생성 ----------------------------------------------------------
+# history.json(3.8MB, indent=2) 하나를 통째로 받는 대신
+# 100회차 단위 샤드를 공백 없이(minified) 저장하고 .gz/.br 압축본을 같이 둔다.
+# manifest.json에 샤드별 sha256을 기록 → 앱은 해시가 바뀐 샤드만 다시 받으면 된다.
+#
+#   assets/data/history/manifest.json
+#   assets/data/history/history_1101-1200.json(.gz/.br)
+
+
+# --- 설정 ---
+BASE_DIR = os.getcwd()
+DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
+HISTORY_FILE = os.path.join(DATA_DIR, 'history.json')
+SHARD_DIR = os.path.join(DATA_DIR, 'history')
+
+SHARD_SIZE = 100
+MANIFEST_NAME = 'manifest.json'
+
+
+def shard_range(round_no, shard_size=SHARD_SIZE):
+    """회차가 속한 샤드의 (시작, 끝) 회차"""
+    start = (round_no - 1) // shard_size * shard_size + 1
+    return start, start + shard_size - 1
+
+
+def shard_name(start, end):
+    return f"history_{start:04d}-{end:04d}.json"
+
+
+def load_manifest(shard_dir=SHARD_DIR):
+    try:
+        with open(os.path.join(shard_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"version": 1, "shard_size": SHARD_SIZE, "latest_round": 0, "shards": []}
+
+
+def _write_bytes(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_shard(shard_dir, start, end, records):
+    """샤드 하나 저장 (+ .gz/.br), manifest 항목 반환"""
+    records = sorted(records, key=lambda x: x["round"], reverse=True)
+    raw = json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    name = shard_name(start, end)
+    entry = {
+        "file": name,
+        "from": start,
+        "to": end,
+        "count": len(records),
+        "latest_round": records[0]["round"] if records else 0,
+        "sha256": hashlib.sha256(raw).hexdigest(),
+        "bytes": len(raw),
+    }
+
+    path = os.path.join(shard_dir, name)
+    _write_bytes(path, raw)
+    # mtime=0 → 내용이 같으면 압축 결과도 같음 (git diff 최소화)
+    gz = gzip.compress(raw, compresslevel=9, mtime=0)
+    _write_bytes(path + ".gz", gz)
+    entry["gz_bytes"] = len(gz)
+    if brotli is not None:
+        br = brotli.compress(raw, quality=11)
+        _write_bytes(path + ".br", br)
+        entry["br_bytes"] = len(br)
+    return entry
+
+
+def _shard_hash(records):
+    records = sorted(records, key=lambda x: x["round"], reverse=True)
+    raw = json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _save_manifest(shard_dir, manifest):
+    manifest["shards"].sort(key=lambda e: e["from"])
+    manifest["latest_round"] = max((e["latest_round"] for e in manifest["shards"]), default=0)
+    _write_bytes(os.path.join(shard_dir, MANIFEST_NAME),
+                 json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def _publish_groups(groups, shard_dir, manifest):
+    """groups: {(시작, 끝): 레코드 목록} → 해시가 바뀐 샤드만 다시 쓰기, 바뀐 파일명 목록 반환"""
+    entries = {e["file"]: e for e in manifest["shards"]}
+    changed = []
+    for (start, end), records in sorted(groups.items()):
+        name = shard_name(start, end)
+        old = entries.get(name)
+        if (old is not None and old["sha256"] == _shard_hash(records)
+                and os.path.exists(os.path.join(shard_dir, name))):
+            continue
+        entries[name] = _write_shard(shard_dir, start, end, records)
+        changed.append(name)
+
+    manifest["shards"] = list(entries.values())
+    return changed
+
+
+def publish_all(history_data, shard_dir=SHARD_DIR):
+    """history 전체로 샤드 갱신 (내용이 같은 샤드는 건드리지 않음)"""
+    os.makedirs(shard_dir, exist_ok=True)
+    manifest = load_manifest(shard_dir)
+
+    groups = {}
+    for record in history_data:
+        groups.setdefault(shard_range(record["round"], manifest["shard_size"]), []).append(record)
+
+    changed = _publish_groups(groups, shard_dir, manifest)
+    # history에서 사라진 샤드는 manifest에서도 제거
+    manifest["shards"] = [e for e in manifest["shards"] if (e["from"], e["to"]) in groups]
+    _save_manifest(shard_dir, manifest)
+    return changed
+
+
+def publish_rounds(records, shard_dir=SHARD_DIR, load_all=None):
+    """
+    새로 추가/변경된 회차만 반영 (해당 샤드 파일만 읽어서 합침).
+    - 주간 업데이트에서 history.json 전체를 읽지 않기 위함
+    - manifest가 없거나 비어 있으면 load_all()(records가 반영된 history 전체)로 publish_all
+      → 방금 건드린 샤드만 든 불완전한 manifest를 남기지 않음
+    """
+    if not records:
+        return []
+    os.makedirs(shard_dir, exist_ok=True)
+    manifest = load_manifest(shard_dir)
+    if not manifest["shards"]:
+        if load_all is None:
+            raise ValueError("manifest가 비어 있어 history 전체(load_all)가 필요합니다.")
+        return publish_all(load_all(), shard_dir)
+
+    groups = {}
+    for record in records:
+        groups.setdefault(shard_range(record["round"], manifest["shard_size"]), {})[record["round"]] = record
+
+    merged = {}
+    for (start, end), by_round in groups.items():
+        path = os.path.join(shard_dir, shard_name(start, end))
+        existing = []
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+        rounds = {item["round"]: item for item in existing}
+        rounds.update(by_round)
+        merged[(start, end)] = list(rounds.values())
+
+    changed = _publish_groups(merged, shard_dir, manifest)
+    _save_manifest(shard_dir, manifest)
+    return changed
+
+
+if __name__ == "__main__":
+    # history.json 전체로 샤드 다시 만들기
+    if not os.path.exists(HISTORY_FILE):
+        print(f"❌ {HISTORY_FILE} 파일이 없습니다.")
+        sys.exit(1)
+
+    with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+        history = json.load(f)
+
+    changed = publish_all(history)
+    print(f"✨ 샤드 {len(changed)}개 갱신 → {SHARD_DIR}")
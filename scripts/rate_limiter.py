@@ -0,0 +1,98 @@
+import random
+import threading
+import time
+
+## 동행복권/지도 API 공용 요청 속도 제한기 -------------------------------------------
+# 고정 sleep 대신 토큰 버킷으로 요청 속도를 맞추고,
+# 응답 상태에 따라 속도를 올리고 내린다 (AIMD: 성공 시 +, 차단/오류 시 ×).
+
+
+class AdaptiveRateLimiter:
+    """
+    스레드 안전 토큰 버킷 + AIMD 속도 조절.
+    - acquire(): 토큰이 생길 때까지 대기 후 1개 소비
+    - record_success(): 정상 응답 → 초당 속도를 increase 만큼 올림
+    - record_failure(reason): 429/5xx/연결 끊김 → 초당 속도를 decrease 배로 낮춤
+    """
+
+    def __init__(self, initial_rate=1.0, min_rate=0.2, max_rate=10.0,
+                 increase=0.1, decrease=0.5, burst=1.0, name=""):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst
+        self.name = name
+
+        self._rate = min(max(initial_rate, min_rate), max_rate)
+        self._tokens = burst
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.successes = 0
+        self.retries = {}
+
+    @property
+    def rate(self):
+        """현재 초당 허용 요청 수"""
+        return self._rate
+
+    def set_max_rate(self, max_rate):
+        with self._lock:
+            self.max_rate = max_rate
+            self._rate = min(self._rate, max_rate)
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self.requests += 1
+                    return
+                wait = (1.0 - self._tokens) / self._rate
+            time.sleep(wait)
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self._rate = min(self.max_rate, self._rate + self.increase)
+
+    def record_failure(self, reason):
+        """
+        reason: "429", "5xx", "connection", "timeout" 등 (재시도 집계 키)
+        - 동시에 실패가 몰려도 한 번의 혼잡으로 보고 1/rate 초 안에는 한 번만 감속
+        """
+        with self._lock:
+            self.retries[reason] = self.retries.get(reason, 0) + 1
+            now = time.monotonic()
+            if now - self._last_decrease >= 1.0 / self._rate:
+                self._rate = max(self.min_rate, self._rate * self.decrease)
+                self._last_decrease = now
+                # 감속 직후 몰려 있던 토큰도 비워서 바로 다시 몰아치지 않게 함
+                self._tokens = min(self._tokens, 0.0)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "rate": round(self._rate, 3),
+                "requests": self.requests,
+                "successes": self.successes,
+                "retries": dict(self.retries),
+                "retry_total": sum(self.retries.values()),
+            }
+
+
+def backoff_delay(attempt, base_sleep=1.0, max_sleep=60.0):
+    """지수 백오프 + 지터 (attempt는 1부터)"""
+    wait = min(max_sleep, base_sleep * (2 ** (attempt - 1)))
+    return wait * random.uniform(0.5, 1.0)
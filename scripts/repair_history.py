@@ -0,0 +1,216 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import init_lotto
+from history_io import compact_history, load_history, open_journal, record_delta, write_history
+from lotto_parser import parse_prizes, parse_stores
+
+## history.json 구멍 메우기 ----------------------------------------------------------
+# 파싱 실패 폴백으로 남은 빈 값만 골라서 다시 수집한다 (전체 재수집 없이).
+# - 빠진 회차          → 회차 전체 다시 수집
+# - 등수가 통째로 없거나 당첨자는 있는데 상금이 0 → 상금 정보만 다시 수집
+#   (상금 0 / 당첨자 0은 이월된 정상 회차)
+# - 당첨자는 있는데 1등 판매점 목록이 비어 있음 → 판매점 정보만 다시 수집
+# 다시 받아도 사이트에 값이 없는 조각은 repair_skip.json에 남겨서 다음 실행부터 요청하지 않는다.
+
+
+# --- 설정 ---
+BASE_DIR = os.getcwd()
+DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
+HISTORY_FILE = os.path.join(DATA_DIR, 'history.json')
+# 복구할 수 없는 조각 {"prize": [회차...], "stores": [회차...]}
+SKIP_FILE = os.path.join(DATA_DIR, 'repair_skip.json')
+
+REPAIR_CONCURRENCY = 4
+PIECES = ("prize", "stores")
+
+
+def load_skip(path=SKIP_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    return {piece: set(data.get(piece, [])) for piece in PIECES}
+
+
+def save_skip(skip, path=SKIP_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({piece: sorted(skip[piece]) for piece in PIECES}, f, ensure_ascii=False, indent=2)
+
+
+def is_prize_hole(tier):
+    """등수가 없거나 당첨자가 있는데 상금이 0 (0/0은 이월이라 정상)"""
+    return tier is None or (tier.get("winners", 0) > 0 and tier.get("prize", 0) == 0)
+
+
+def find_holes(history_data, skip=None):
+    """
+    history 한 번 순회로 수리 대상 찾기 (skip에 기록된 조각은 제외).
+    반환: (빠진 회차, 상금 구멍 회차, 판매점 구멍 회차) - 각각 정렬된 리스트
+    """
+    skip = skip or {piece: set() for piece in PIECES}
+    present = set()
+    prize_holes = []
+    store_holes = []
+
+    for item in history_data:
+        round_no = item["round"]
+        present.add(round_no)
+        result = item.get("result", {})
+
+        if round_no not in skip["prize"] and any(is_prize_hole(result.get(rank)) for rank in ("1st", "2nd", "3rd")):
+            prize_holes.append(round_no)
+
+        first = result.get("1st", {})
+        if round_no not in skip["stores"] and first.get("winners", 0) > 0 and not first.get("stores"):
+            store_holes.append(round_no)
+
+    max_round = max(present) if present else 0
+    missing = [r for r in range(1, max_round + 1) if r not in present]
+    return missing, sorted(prize_holes), sorted(store_holes)
+
+
+def patch_prizes(record, prize_data):
+    """다시 받은 상금 정보 중 0이 아닌 등수만 덮어씀 (판매점 목록은 유지)"""
+    changed = False
+    for rank, values in prize_data.items():
+        tier = record["result"].setdefault(rank, {"prize": 0, "winners": 0})
+        if values["prize"] or values["winners"]:
+            if tier.get("prize") != values["prize"] or tier.get("winners") != values["winners"]:
+                tier["prize"] = values["prize"]
+                tier["winners"] = values["winners"]
+                changed = True
+    return changed
+
+
+def patch_stores(record, store_data):
+    """다시 받은 판매점 목록이 비어 있지 않으면 덮어씀"""
+    changed = False
+    for rank in ("1st", "2nd"):
+        stores = store_data.get(rank)
+        if stores and record["result"].get(rank, {}).get("stores") != stores:
+            record["result"].setdefault(rank, {"prize": 0, "winners": 0})["stores"] = stores
+            changed = True
+    return changed
+
+
+def fetch_prizes(round_no):
+    """상금 정보 다시 받기, 요청 자체가 실패하면 None (다음 실행에서 다시)"""
+    html = init_lotto.fetch_prize_page(round_no)
+    if html is None:
+        return None
+    try:
+        return parse_prizes(html)
+    except Exception as e:
+        print(f"⚠️ 상금 파싱 오류 ({round_no}회): {e}")
+        return None
+
+
+def fetch_stores(round_no):
+    """
+    판매점 정보 다시 받기, 요청 자체가 실패하면 None (다음 실행에서 다시).
+    - 첫 페이지에 목록이 없으면 사이트에 없는 회차로 보고 빈 결과, 있으면 전체 페이지 수집
+    """
+    html = init_lotto.fetch_store_page(round_no, 1)
+    if html is None:
+        return None
+    try:
+        first_page = parse_stores(html, first_table=1)
+    except Exception as e:
+        print(f"⚠️ 판매점 파싱 오류 ({round_no}회): {e}")
+        return None
+    if not (first_page["1st"] or first_page["2nd"]):
+        return first_page
+    return init_lotto.get_store_info(round_no)
+
+
+def repair_history(concurrency=REPAIR_CONCURRENCY, dry_run=False, retry_skipped=False):
+    print("🩹 history.json 구멍 메우기 시작...")
+
+    if not os.path.exists(HISTORY_FILE):
+        print(f"❌ {HISTORY_FILE} 파일이 없습니다.")
+        return
+
+    # 크롤 중 남은 저널이 있으면 먼저 반영 (dry-run은 파일을 쓰지 않고 메모리에서만 합침)
+    if dry_run:
+        by_round = {item["round"]: item for item in load_history(HISTORY_FILE)}
+        for record in open_journal(HISTORY_FILE).read_all():
+            by_round[record["round"]] = record
+        history_data = list(by_round.values())
+    else:
+        compact_history(HISTORY_FILE)
+        history_data = load_history(HISTORY_FILE)
+
+    skip = {piece: set() for piece in PIECES} if retry_skipped else load_skip()
+    missing, prize_holes, store_holes = find_holes(history_data, skip)
+    print(f"📊 빠진 회차 {len(missing)}개, 상금 구멍 {len(prize_holes)}개, "
+          f"1등 판매점 구멍 {len(store_holes)}개 (복구 불가로 건너뜀: "
+          f"상금 {len(skip['prize'])}개, 판매점 {len(skip['stores'])}개)")
+
+    if dry_run or not (missing or prize_holes or store_holes):
+        return
+
+    by_round = {item["round"]: item for item in history_data}
+
+    # 필요한 조각만 한꺼번에 동시 요청
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        round_futures = {r: executor.submit(init_lotto.crawl_round, r) for r in missing}
+        prize_futures = {r: executor.submit(fetch_prizes, r) for r in prize_holes}
+        store_futures = {r: executor.submit(fetch_stores, r) for r in store_holes}
+
+        changed = set()
+        added = 0
+        for round_no, future in round_futures.items():
+            data = future.result()
+            if data is not None:
+                by_round[round_no] = data
+                changed.add(round_no)
+                added += 1
+
+        # 응답은 받았는데 채울 값이 없으면 복구 불가로 기록 (요청 실패는 다음 실행에서 다시)
+        prize_fixed = 0
+        for round_no, future in prize_futures.items():
+            prize_data = future.result()
+            if prize_data is None:
+                continue
+            if patch_prizes(by_round[round_no], prize_data):
+                changed.add(round_no)
+                prize_fixed += 1
+            if any(is_prize_hole(by_round[round_no]["result"].get(rank)) for rank in ("1st", "2nd", "3rd")):
+                skip["prize"].add(round_no)
+
+        store_fixed = 0
+        for round_no, future in store_futures.items():
+            store_data = future.result()
+            if store_data is None:
+                continue
+            if patch_stores(by_round[round_no], store_data):
+                changed.add(round_no)
+                store_fixed += 1
+            if not by_round[round_no]["result"]["1st"].get("stores"):
+                skip["stores"].add(round_no)
+
+    print(f"✅ 회차 추가 {added}개, 상금 수정 {prize_fixed}개, 판매점 수정 {store_fixed}개")
+    save_skip(skip)
+
+    if changed:
+        write_history(HISTORY_FILE, list(by_round.values()), [by_round[r] for r in sorted(changed)])
+        record_delta(HISTORY_FILE, [by_round[r] for r in sorted(changed)])
+        print(f"✨ {HISTORY_FILE} 저장 완료!")
+    print(f"📈 요청 통계: {init_lotto.limiter.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="history.json 빠진 회차/빈 상금/빈 판매점 수리")
+    parser.add_argument("--concurrency", type=int, default=REPAIR_CONCURRENCY,
+                        help="동시에 보낼 요청 수")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="수리 대상만 출력하고 요청하지 않음")
+    parser.add_argument("--retry-skipped", action="store_true",
+                        help="복구 불가로 기록된 조각도 다시 요청")
+    args = parser.parse_args()
+
+    repair_history(concurrency=args.concurrency, dry_run=args.dry_run, retry_skipped=args.retry_skipped)
@@ -0,0 +1,245 @@
+import argparse
+import heapq
+import json
+import os
+import sys
+
+from lotto_db import store_key
+
+## 판매점 순위표 (전국 / 시·도 / 시·군·구) ----------------------------------------------
+# 앱이 요청마다 stores.json 전체를 읽고 wins 목록을 정렬하지 않도록 순위표를 미리 만들어 둔다.
+#   boards[지역][순위 종류] = stores 목록 위치 (상위 N개, 순위순)
+#   순위 종류: 1st(1등 횟수), total(1+2등 횟수), recent_1st / recent_total(최근 WINDOW 회차)
+# 주간 갱신 때는 새 회차로 당첨 목록이 바뀐 판매점의 지역만 누적 순위를 다시 계산하고,
+# 최근 N회차 순위는 창이 한 칸 밀리므로 전 지역 다시 계산한다 (wins가 내림차순이라 bisect로 셈).
+#
+#   assets/data/leaderboards.json
+
+
+# --- 설정 ---
+BASE_DIR = os.getcwd()
+DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
+STORES_FILE = os.path.join(DATA_DIR, 'stores.json')
+LEADERBOARD_FILE = os.path.join(DATA_DIR, 'leaderboards.json')
+
+WINDOW = 52                   # 최근 52회차 (약 1년)
+TOP_N = {"overall": 100, "sido": 20, "sigungu": 10}
+BOARDS = ["1st", "total", "recent_1st", "recent_total"]
+RECENT_BOARDS = ["recent_1st", "recent_total"]
+
+# 시/도 표기 통일 (긴 이름 → 짧은 이름)
+PROVINCES = {
+    "서울특별시": "서울", "부산광역시": "부산", "대구광역시": "대구", "인천광역시": "인천",
+    "광주광역시": "광주", "대전광역시": "대전", "울산광역시": "울산", "세종특별자치시": "세종",
+    "경기도": "경기", "강원특별자치도": "강원", "강원도": "강원", "충청북도": "충북", "충청남도": "충남",
+    "전북특별자치도": "전북", "전라북도": "전북", "전라남도": "전남", "경상북도": "경북",
+    "경상남도": "경남", "제주특별자치도": "제주",
+}
+
+SIDO_NAMES = set(PROVINCES.values())
+
+
+def parse_region(address):
+    """
+    주소 → (시/도, 시/군/구). 온라인 등 지역을 알 수 없으면 (None, None)
+    - "경기 수원시 장안구 ..." 처럼 일반구가 있으면 "수원시 장안구"까지
+    """
+    tokens = (address or "").split()
+    if not tokens:
+        return None, None
+    sido = PROVINCES.get(tokens[0], tokens[0])
+    if sido not in SIDO_NAMES:
+        return None, None
+    if len(tokens) < 2:
+        return sido, None
+    sigungu = tokens[1]
+    if sigungu.endswith("시") and len(tokens) > 2 and tokens[2].endswith("구"):
+        sigungu = f"{sigungu} {tokens[2]}"
+    return sido, f"{sido} {sigungu}"
+
+
+def count_since(rounds_desc, first_round):
+    """내림차순 회차 목록에서 first_round 이상인 개수 (이진 탐색)"""
+    lo, hi = 0, len(rounds_desc)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if rounds_desc[mid] >= first_round:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def store_stats(store, window_from):
+    """(1등, 2등, 최근 1등, 최근 2등, 마지막 당첨 회차)"""
+    first = store["wins"].get("1st", [])
+    second = store["wins"].get("2nd", [])
+    last = max(first[0] if first else 0, second[0] if second else 0)
+    return (len(first), len(second), count_since(first, window_from), count_since(second, window_from), last)
+
+
+def _score(stats, board):
+    n1, n2, r1, r2, _ = stats
+    return {"1st": n1, "total": n1 + n2, "recent_1st": r1, "recent_total": r1 + r2}[board]
+
+
+def _top(members, stats, board, n):
+    """members 중 board 기준 상위 n개 위치 (횟수 → 최근 당첨 → 먼저 등록 순)"""
+    return heapq.nsmallest(
+        n,
+        (pos for pos in members if _score(stats[pos], board) > 0),
+        key=lambda pos: (-_score(stats[pos], board), -stats[pos][4], pos),
+    )
+
+
+def _groups(stores):
+    """{("overall", ""): [...], ("sido", "서울"): [...], ("sigungu", "서울 강남구"): [...]}"""
+    groups = {("overall", ""): list(range(len(stores)))}
+    for pos, store in enumerate(stores):
+        sido, sigungu = parse_region(store.get("address", ""))
+        if sido:
+            groups.setdefault(("sido", sido), []).append(pos)
+        if sigungu:
+            groups.setdefault(("sigungu", sigungu), []).append(pos)
+    return groups
+
+
+def _output(stores, stats, latest_round, boards):
+    """boards의 위치를 출력용 stores 목록 위치로 바꿔 파일 구조로"""
+    used = sorted({pos for level in boards.values() for region in level.values()
+                   for ranked in region.values() for pos in ranked})
+    remap = {pos: i for i, pos in enumerate(used)}
+    return {
+        "version": 1,
+        "latest_round": latest_round,
+        "window": WINDOW,
+        "window_from": max(1, latest_round - WINDOW + 1),
+        "fields": ["key", "name", "address", "1st", "2nd", "recent_1st", "recent_2nd", "last_round"],
+        "stores": [[store_key(stores[pos]), stores[pos]["name"], stores[pos].get("address", ""), *stats[pos]]
+                   for pos in used],
+        "boards": {
+            level: {region: {board: [remap[pos] for pos in ranked] for board, ranked in region_boards.items()}
+                    for region, region_boards in regions.items()}
+            for level, regions in boards.items()
+        },
+    }
+
+
+def _latest_round(stores):
+    return max((s["wins"][rank][0] for s in stores for rank in ("1st", "2nd") if s["wins"].get(rank)),
+               default=0)
+
+
+def build_leaderboards(stores, latest_round=None):
+    """stores 전체로 순위표 생성"""
+    if latest_round is None:
+        latest_round = _latest_round(stores)
+    window_from = max(1, latest_round - WINDOW + 1)
+    stats = [store_stats(store, window_from) for store in stores]
+
+    boards = {"overall": {}, "sido": {}, "sigungu": {}}
+    for (level, region), members in _groups(stores).items():
+        boards[level][region] = {board: _top(members, stats, board, TOP_N[level]) for board in BOARDS}
+    return _output(stores, stats, latest_round, boards)
+
+
+def load_leaderboards(path=LEADERBOARD_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def update_leaderboards(stores, changed, latest_round, previous=None):
+    """
+    새 회차 반영 후 순위표 갱신.
+    - changed: 당첨 목록이 바뀐 판매점 레코드 → 그 지역만 누적 순위(1st/total) 다시 계산
+    - 최근 순위는 창이 움직였을 때만 전 지역 다시 계산
+    - 이전 순위표가 없거나 판매점이 빠졌으면(이전 키를 못 찾으면) 전체 생성
+    """
+    if previous is None:
+        previous = load_leaderboards()
+    if previous is None or previous.get("window") != WINDOW:
+        return build_leaderboards(stores, latest_round)
+
+    window_from = max(1, latest_round - WINDOW + 1)
+    stats = [store_stats(store, window_from) for store in stores]
+    positions = {store_key(store): pos for pos, store in enumerate(stores)}
+    old_positions = []
+    for row in previous["stores"]:
+        pos = positions.get(row[0])
+        if pos is None:
+            return build_leaderboards(stores, latest_round)
+        old_positions.append(pos)
+
+    changed_keys = {store_key(store) for store in changed}
+    touched = {("overall", "")} if changed_keys else set()
+    for key in changed_keys:
+        sido, sigungu = parse_region(stores[positions[key]].get("address", ""))
+        if sido:
+            touched.add(("sido", sido))
+        if sigungu:
+            touched.add(("sigungu", sigungu))
+    slid = previous["latest_round"] != latest_round
+
+    boards = {"overall": {}, "sido": {}, "sigungu": {}}
+    for (level, region), members in _groups(stores).items():
+        old = previous["boards"].get(level, {}).get(region)
+        region_boards = {}
+        for board in BOARDS:
+            recompute = (old is None or (level, region) in touched
+                         or (slid and board in RECENT_BOARDS))
+            if recompute:
+                region_boards[board] = _top(members, stats, board, TOP_N[level])
+            else:
+                region_boards[board] = [old_positions[i] for i in old[board]]
+        boards[level][region] = region_boards
+    return _output(stores, stats, latest_round, boards)
+
+
+def save_leaderboards(data, path=LEADERBOARD_FILE):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def write_leaderboards(stores, changed=None, latest_round=None):
+    """stores.json을 저장한 스크립트에서 호출 (changed가 None이면 전체 생성)"""
+    if changed is None or latest_round is None:
+        data = build_leaderboards(stores, latest_round)
+    else:
+        data = update_leaderboards(stores, changed, latest_round)
+    save_leaderboards(data)
+    return data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="판매점 순위표 생성/조회")
+    parser.add_argument("command", choices=["build", "show"])
+    parser.add_argument("--region", default="", help="show: 시/도 또는 '시/도 시/군/구' (기본 전국)")
+    parser.add_argument("--board", choices=BOARDS, default="1st")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if not os.path.exists(STORES_FILE):
+            print(f"❌ {STORES_FILE} 파일이 없습니다.")
+            sys.exit(1)
+        with open(STORES_FILE, 'r', encoding='utf-8') as f:
+            stores = json.load(f)
+        data = write_leaderboards(stores)
+        print(f"✨ 순위표 생성 완료 ({data['latest_round']}회차 기준, 판매점 {len(data['stores'])}곳) → {LEADERBOARD_FILE}")
+    else:
+        data = load_leaderboards()
+        if data is None:
+            print(f"❌ {LEADERBOARD_FILE} 파일이 없습니다.")
+            sys.exit(1)
+        level = "overall" if not args.region else ("sigungu" if " " in args.region else "sido")
+        region = data["boards"][level].get(args.region)
+        if region is None:
+            print(f"❌ 지역을 찾을 수 없습니다: {args.region}")
+            sys.exit(1)
+        for rank, i in enumerate(region[args.board], 1):
+            key, name, address, n1, n2, r1, r2, last = data["stores"][i]
+            print(f"{rank:3d}. {name} | {address}  (1등 {n1}, 2등 {n2}, 최근 1등 {r1}, 최근 2등 {r2})")
@@ -0,0 +1,210 @@
+import argparse
+import bisect
+import json
+import os
+import sys
+
+from draw_columns import parse_date
+from lotto_db import normalize_key
+
+## 회차 → 당첨 판매점 역색인 ---------------------------------------------------------------
+# "1100~1200회 당첨 판매점", "2024년 1등 판매점" 같은 질의를 stores.json의 wins 목록을
+# 전부 훑지 않고 답하기 위한 색인. 회차(오름차순)마다 판매점 id 목록(정렬됨)을 둔다.
+#   keys      : 판매점 키 목록 (id = 위치)
+#   rounds    : 회차 (오름차순)
+#   dates     : 회차별 추첨일 "YYYY-MM-DD" (rounds와 같은 순서)
+#   postings  : {"1st": [[id, ...], ...], "2nd": [...]} (rounds와 같은 순서)
+# 범위 질의는 rounds/dates에서 이진 탐색으로 구간을 찾고 그 구간 목록만 합친다.
+#
+#   assets/data/store_rounds.json
+
+
+# --- 설정 ---
+BASE_DIR = os.getcwd()
+DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
+HISTORY_FILE = os.path.join(DATA_DIR, 'history.json')
+ROUND_INDEX_FILE = os.path.join(DATA_DIR, 'store_rounds.json')
+
+RANKS = ["1st", "2nd"]
+
+
+class StoreRoundIndex:
+    def __init__(self, keys=None, rounds=None, dates=None, postings=None):
+        self.keys = keys or []
+        self.rounds = rounds or []
+        self.dates = dates or []
+        self.postings = postings or {rank: [] for rank in RANKS}
+        self._ids = {key: i for i, key in enumerate(self.keys)}
+
+    def __len__(self):
+        return len(self.rounds)
+
+    @property
+    def latest_round(self):
+        return self.rounds[-1] if self.rounds else 0
+
+    def _id(self, key):
+        i = self._ids.get(key)
+        if i is None:
+            i = len(self.keys)
+            self.keys.append(key)
+            self._ids[key] = i
+        return i
+
+    def add_round(self, round_no, date, winners):
+        """
+        회차 하나 추가/교체.
+        - winners: {"1st": [판매점 키, ...], "2nd": [...]}
+        """
+        lists = {rank: sorted({self._id(key) for key in winners.get(rank, [])}) for rank in RANKS}
+        pos = bisect.bisect_left(self.rounds, round_no)
+        if pos < len(self.rounds) and self.rounds[pos] == round_no:
+            self.dates[pos] = date
+            for rank in RANKS:
+                self.postings[rank][pos] = lists[rank]
+            return
+        self.rounds.insert(pos, round_no)
+        self.dates.insert(pos, date)
+        for rank in RANKS:
+            self.postings[rank].insert(pos, lists[rank])
+
+    def add_history(self, records, resolve=None):
+        """
+        history 레코드들 반영.
+        - resolve: 판매점 키 → 대표 키 (dedup_stores 별칭), 없으면 그대로
+        - 회차 오름차순으로 넣음 (처음 보는 판매점 id가 전체 생성과 같은 순서가 되도록)
+        """
+        for record in sorted(records, key=lambda x: x["round"]):
+            winners = {}
+            for rank in RANKS:
+                keys = []
+                for entry in record.get("result", {}).get(rank, {}).get("stores", []):
+                    key = normalize_key(entry["name"], entry.get("addr", ""))
+                    keys.append(resolve(key) if resolve else key)
+                winners[rank] = keys
+            self.add_round(record["round"], parse_date(record.get("date")) or "", winners)
+
+    def remap_keys(self, mapping):
+        """판매점 병합 후 키 바꾸기 (mapping: {흡수된 키: 대표 키})"""
+        if not any(key in self._ids for key in mapping):
+            return
+        old_keys = self.keys
+        self.keys = []
+        self._ids = {}
+        new_ids = [self._id(mapping.get(key, key)) for key in old_keys]
+        for rank in RANKS:
+            self.postings[rank] = [sorted({new_ids[i] for i in ids}) for ids in self.postings[rank]]
+
+    # --- 질의 ---
+
+    def round_slice(self, first_round, last_round):
+        """회차 범위 → rounds 위치 구간 [lo, hi)"""
+        return bisect.bisect_left(self.rounds, first_round), bisect.bisect_right(self.rounds, last_round)
+
+    def date_slice(self, start_date, end_date):
+        """날짜 범위("YYYY-MM-DD", 양끝 포함) → rounds 위치 구간 [lo, hi)"""
+        return bisect.bisect_left(self.dates, start_date), bisect.bisect_right(self.dates, end_date)
+
+    def _collect(self, lo, hi, rank):
+        counts = {}
+        for r in ([rank] if rank else RANKS):
+            for ids in self.postings[r][lo:hi]:
+                for i in ids:
+                    counts[i] = counts.get(i, 0) + 1
+        return {self.keys[i]: n for i, n in counts.items()}
+
+    def winners(self, round_no, rank="1st"):
+        lo, hi = self.round_slice(round_no, round_no)
+        return [self.keys[i] for i in self.postings[rank][lo]] if lo < hi else []
+
+    def stores_between(self, first_round, last_round, rank=None):
+        """회차 범위 안 당첨 판매점 → {키: 당첨 횟수}"""
+        return self._collect(*self.round_slice(first_round, last_round), rank)
+
+    def stores_between_dates(self, start_date, end_date, rank=None):
+        """추첨일 범위 안 당첨 판매점 → {키: 당첨 횟수}"""
+        return self._collect(*self.date_slice(start_date, end_date), rank)
+
+    def to_json(self):
+        return {
+            "version": 1,
+            "latest_round": self.latest_round,
+            "keys": self.keys,
+            "rounds": self.rounds,
+            "dates": self.dates,
+            "postings": self.postings,
+        }
+
+    def save(self, path=ROUND_INDEX_FILE):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_json(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+
+def load_index(path=ROUND_INDEX_FILE):
+    """저장된 색인 (없거나 깨졌으면 빈 색인)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return StoreRoundIndex()
+    return StoreRoundIndex(data["keys"], data["rounds"], data["dates"], data["postings"])
+
+
+def build_index(history_data, resolve=None, path=ROUND_INDEX_FILE):
+    """history 전체로 다시 만들기"""
+    index = StoreRoundIndex()
+    index.add_history(history_data, resolve)
+    index.save(path)
+    return index
+
+
+def update_index(records, resolve=None, path=ROUND_INDEX_FILE, load_all=None):
+    """
+    새 회차만 기존 색인에 추가.
+    - 색인 파일이 없거나(깨졌거나) 마지막 회차가 새 회차들과 이어지지 않으면
+      load_all()(history 전체)로 다시 만듦 → 새 회차만 든 색인이 남지 않게
+    """
+    if not records:
+        return load_index(path)
+    index = load_index(path)
+    first_new = min(record["round"] for record in records)
+    if not os.path.exists(path) or index.latest_round < first_new - 1:
+        if load_all is None:
+            raise ValueError("색인이 새 회차와 이어지지 않아 history 전체(load_all)가 필요합니다.")
+        return build_index(load_all(), resolve, path)
+    index.add_history(records, resolve)
+    index.save(path)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="회차 → 당첨 판매점 역색인 생성/조회")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="history.json → store_rounds.json")
+    query = sub.add_parser("query", help="범위 안 당첨 판매점 조회")
+    query.add_argument("start", help="시작 회차 또는 날짜(YYYY-MM-DD)")
+    query.add_argument("end", help="끝 회차 또는 날짜(YYYY-MM-DD)")
+    query.add_argument("--rank", choices=RANKS)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if not os.path.exists(HISTORY_FILE):
+            print(f"❌ {HISTORY_FILE} 파일이 없습니다.")
+            sys.exit(1)
+        import dedup_stores
+        from history_io import load_history
+
+        redirect = dedup_stores.alias_map(dedup_stores.load_aliases())
+        index = build_index(load_history(HISTORY_FILE), lambda key: redirect.get(key, key))
+        print(f"✨ {len(index)}개 회차, 판매점 {len(index.keys)}곳 색인 → {ROUND_INDEX_FILE}")
+    else:
+        index = load_index()
+        if args.start.isdigit() and args.end.isdigit():
+            result = index.stores_between(int(args.start), int(args.end), args.rank)
+        else:
+            result = index.stores_between_dates(args.start, args.end, args.rank)
+        for key, count in sorted(result.items(), key=lambda x: (-x[1], x[0])):
+            print(f"{count:3d}  {key}")
+        print(f"📊 판매점 {len(result)}곳")
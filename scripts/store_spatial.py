@@ -0,0 +1,218 @@
+import argparse
+import json
+import math
+import os
+import sys
+
+from lotto_db import store_key
+
+## 판매점 좌표 격자 색인 -----------------------------------------------------------------
+# "내 주변 당첨 판매점"을 찾을 때마다 stores.json 8천여 개를 전부 훑지 않도록
+# 좌표를 일정 크기(기본 0.01도 ≈ 1km) 격자 칸으로 나눈 색인을 만들어 둔다.
+#   - knn(lat, lng, k)            : 가까운 k곳
+#   - within_radius(lat, lng, m)  : 반경 m미터 이내
+#   - bbox(south, west, north, east) : 지도 화면 범위
+# 모두 rank("1st"/"2nd")와 min_wins(당첨 횟수 하한)로 거를 수 있다.
+# 색인은 assets/data/stores.spatial.json(공백 없이)으로 저장해 앱/스크립트가 바로 읽는다.
+
+
+# --- 설정 ---
+BASE_DIR = os.getcwd()
+DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
+STORES_FILE = os.path.join(DATA_DIR, 'stores.json')
+SPATIAL_FILE = os.path.join(DATA_DIR, 'stores.spatial.json')
+
+CELL_DEG = 0.01
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEG = 111320.0
+
+RANKS = ["1st", "2nd"]
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class StoreSpatialIndex:
+    """
+    격자 색인.
+    - entries: [{"key", "name", "address", "lat", "lng", "wins": [1등 횟수, 2등 횟수]}, ...]
+    - cells: {(행, 열): [entries 위치, ...]}
+    """
+
+    def __init__(self, entries, cell_deg=CELL_DEG):
+        self.entries = entries
+        self.cell_deg = cell_deg
+        self.cells = {}
+        for i, entry in enumerate(entries):
+            self.cells.setdefault(self._cell(entry["lat"], entry["lng"]), []).append(i)
+        if self.cells:
+            rows = [c[0] for c in self.cells]
+            cols = [c[1] for c in self.cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+        else:
+            self._bounds = (0, -1, 0, -1)
+
+    @classmethod
+    def from_stores(cls, stores, cell_deg=CELL_DEG):
+        """좌표가 있는 판매점만 색인 (온라인/미확인 좌표 0.0 제외)"""
+        entries = []
+        for store in stores:
+            lat, lng = store.get("lat", 0.0), store.get("lng", 0.0)
+            if not lat or not lng:
+                continue
+            entries.append({
+                "key": store_key(store),
+                "name": store["name"],
+                "address": store.get("address", ""),
+                "lat": lat,
+                "lng": lng,
+                "wins": [len(store["wins"].get(rank, [])) for rank in RANKS],
+            })
+        return cls(entries, cell_deg)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _cell(self, lat, lng):
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lng / self.cell_deg))
+
+    @staticmethod
+    def _accept(entry, rank, min_wins):
+        wins = entry["wins"]
+        count = wins[RANKS.index(rank)] if rank else wins[0] + wins[1]
+        return count >= min_wins
+
+    def _ring(self, row, col, r):
+        """(row, col)에서 체비쇼프 거리 r인 칸들의 entries 위치"""
+        if r == 0:
+            yield from self.cells.get((row, col), ())
+            return
+        for dc in range(-r, r + 1):
+            yield from self.cells.get((row - r, col + dc), ())
+            yield from self.cells.get((row + r, col + dc), ())
+        for dr in range(-r + 1, r):
+            yield from self.cells.get((row + dr, col - r), ())
+            yield from self.cells.get((row + dr, col + r), ())
+
+    def _max_ring(self, row, col):
+        min_row, max_row, min_col, max_col = self._bounds
+        return max(abs(row - min_row), abs(row - max_row), abs(col - min_col), abs(col - max_col))
+
+    def knn(self, lat, lng, k=10, rank=None, min_wins=1):
+        """가까운 k곳 → [(거리 m, entry), ...] (가까운 순)"""
+        if not self.entries or k <= 0:
+            return []
+        row, col = self._cell(lat, lng)
+        # 링 r 밖의 점은 최소 r칸 떨어져 있음 (경도 방향이 더 짧으므로 cos(lat) 반영)
+        ring_m = self.cell_deg * METERS_PER_DEG * min(1.0, math.cos(math.radians(abs(lat) + self.cell_deg)))
+        found = []
+        max_ring = self._max_ring(row, col)
+        r = 0
+        while r <= max_ring:
+            for i in self._ring(row, col, r):
+                entry = self.entries[i]
+                if self._accept(entry, rank, min_wins):
+                    found.append((haversine_m(lat, lng, entry["lat"], entry["lng"]), i))
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= r * ring_m:
+                    break
+            r += 1
+        found.sort()
+        return [(dist, self.entries[i]) for dist, i in found[:k]]
+
+    def within_radius(self, lat, lng, radius_m, rank=None, min_wins=1):
+        """반경 radius_m 이내 → [(거리 m, entry), ...] (가까운 순)"""
+        if not self.entries:
+            return []
+        row, col = self._cell(lat, lng)
+        ring_m = self.cell_deg * METERS_PER_DEG * min(1.0, math.cos(math.radians(abs(lat) + self.cell_deg)))
+        rings = min(int(radius_m / ring_m) + 1, self._max_ring(row, col))
+        found = []
+        for r in range(rings + 1):
+            for i in self._ring(row, col, r):
+                entry = self.entries[i]
+                if not self._accept(entry, rank, min_wins):
+                    continue
+                dist = haversine_m(lat, lng, entry["lat"], entry["lng"])
+                if dist <= radius_m:
+                    found.append((dist, i))
+        found.sort()
+        return [(dist, self.entries[i]) for dist, i in found]
+
+    def bbox(self, south, west, north, east, rank=None, min_wins=1):
+        """위경도 사각형 안의 판매점 → [entry, ...]"""
+        row0, col0 = self._cell(south, west)
+        row1, col1 = self._cell(north, east)
+        result = []
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                for i in self.cells.get((row, col), ()):
+                    entry = self.entries[i]
+                    if (south <= entry["lat"] <= north and west <= entry["lng"] <= east
+                            and self._accept(entry, rank, min_wins)):
+                        result.append(entry)
+        return result
+
+    def to_json(self):
+        return {
+            "version": 1,
+            "cell_deg": self.cell_deg,
+            "count": len(self.entries),
+            "entries": self.entries,
+        }
+
+    def save(self, path=SPATIAL_FILE):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_json(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+
+def load_index(path=SPATIAL_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return StoreSpatialIndex(data["entries"], data["cell_deg"])
+
+
+def write_index(stores, path=SPATIAL_FILE):
+    """stores.json을 저장한 스크립트에서 호출 → 색인 파일 갱신"""
+    index = StoreSpatialIndex.from_stores(stores)
+    index.save(path)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="판매점 좌표 색인 생성/조회")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="stores.json → stores.spatial.json")
+    near = sub.add_parser("near", help="가까운 판매점 조회")
+    near.add_argument("lat", type=float)
+    near.add_argument("lng", type=float)
+    near.add_argument("-k", type=int, default=10)
+    near.add_argument("--radius", type=float, help="반경(m) - 지정하면 k 대신 반경 검색")
+    near.add_argument("--rank", choices=RANKS)
+    near.add_argument("--min-wins", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if not os.path.exists(STORES_FILE):
+            print(f"❌ {STORES_FILE} 파일이 없습니다.")
+            sys.exit(1)
+        with open(STORES_FILE, 'r', encoding='utf-8') as f:
+            stores = json.load(f)
+        index = write_index(stores)
+        print(f"✨ 판매점 {len(index)}곳 색인 → {SPATIAL_FILE}")
+    else:
+        index = load_index()
+        if args.radius is not None:
+            results = index.within_radius(args.lat, args.lng, args.radius, args.rank, args.min_wins)
+        else:
+            results = index.knn(args.lat, args.lng, args.k, args.rank, args.min_wins)
+        for dist, entry in results:
+            print(f"{dist:8.0f}m  {entry['name']} | {entry['address']}  (1등 {entry['wins'][0]}, 2등 {entry['wins'][1]})")
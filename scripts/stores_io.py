@@ -0,0 +1,90 @@
+import json
+import os
+
+import delta_log
+import lotto_db
+import metrics
+import store_leaderboard
+import store_round_index
+import store_spatial
+
+## stores.json 저장 + 파생 파일 갱신 -----------------------------------------------------
+# stores.json을 다시 쓰는 스크립트(init_Stores, geocoder, dedup_stores, manage_stores)는
+# 모두 publish_stores 하나로 저장한다 → 좌표 색인 / 순위표 / delta / SQLite가 항상 같이 갱신됨.
+# LOTTO_DB가 설정돼 있으면 DB가 쓰기 대상: 바뀐 판매점만 DB에 반영하고 stores.json은 DB에서 내보낸다.
+
+
+# --- 설정 ---
+BASE_DIR = os.getcwd()
+DATA_DIR = os.path.join(BASE_DIR, 'assets', 'data')
+STORES_FILE = os.path.join(DATA_DIR, 'stores.json')
+
+
+def _replace_file(path, text):
+    """임시 파일에 쓰고 교체 (쓰는 도중 죽어도 기존 파일 유지)"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def publish_stores(stores_list, changed=(), deletes=(), latest_round=None, incremental=False,
+                   alias_map=None, stores_file=STORES_FILE):
+    """
+    stores.json 저장 후 파생 파일을 한 번에 갱신.
+    - changed: 추가/변경된 판매점 레코드, deletes: 삭제(흡수)된 판매점 키
+    - incremental: 새 회차만 합친 경우 순위표도 changed가 속한 지역만 다시 계산 (latest_round 필요)
+    - alias_map: {흡수된 키: 대표 키} (dedup_stores.alias_map) - 주어지면 회차 역색인/DB 별칭도 대표 키로 맞춤
+    - LOTTO_DB가 설정돼 있으면 changed/deletes만 DB에 쓰고 stores.json은 DB에서 내보냄
+      (stores_list도 내보낸 내용으로 바뀜 - 순서는 DB 등록 순서)
+    - 반환: 기록한 stores delta 버전 (바뀐 게 없으면 None)
+    """
+    changed = list(changed)
+    deletes = list(deletes)
+    folder = os.path.dirname(stores_file)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    with metrics.timer("serialize", what="stores"):
+        exported = export_from_db(changed, deletes, alias_map, stores_file)
+        if exported is None:
+            _replace_file(stores_file, json.dumps(stores_list, ensure_ascii=False, indent=2))
+        else:
+            stores_list[:] = exported
+    with metrics.timer("serialize", what="spatial_index"):
+        store_spatial.write_index(stores_list)
+    with metrics.timer("merge", what="leaderboards"):
+        if incremental and latest_round is not None:
+            store_leaderboard.write_leaderboards(stores_list, changed, latest_round)
+        else:
+            store_leaderboard.write_leaderboards(stores_list, latest_round=latest_round)
+
+    # 회차 → 판매점 역색인의 흡수된 키도 대표 키로
+    if alias_map is not None and os.path.exists(store_round_index.ROUND_INDEX_FILE):
+        index = store_round_index.load_index()
+        index.remap_keys(alias_map)
+        index.save()
+
+    # 바뀐 판매점만 delta 파일로 기록
+    return delta_log.emit_delta("stores", changed, deletes, snapshot=stores_list)
+
+
+def export_from_db(changed, deletes, alias_map, stores_file):
+    """
+    LOTTO_DB가 설정돼 있으면 DB가 쓰기 대상: 바뀐 판매점/삭제/별칭만 DB에 반영하고 stores.json은 DB에서 내보냄.
+    - DB가 비어 있으면 기존 history.json/stores.json부터 가져옴 (당첨 회차는 DB의 store_wins에서 계산하므로)
+    - 반환: 내보낸 판매점 목록, DB를 쓰지 않으면 None
+    """
+    conn = lotto_db.connect_if_enabled()
+    if conn is None:
+        return None
+    try:
+        lotto_db.import_json(conn, os.path.join(os.path.dirname(stores_file), "history.json"), stores_file,
+                             only_empty=True)
+        lotto_db.delete_stores(conn, deletes)
+        lotto_db.upsert_stores(conn, changed)
+        if alias_map is not None:
+            lotto_db.upsert_store_aliases(conn, alias_map)
+        return lotto_db.export_stores(conn, stores_file)
+    finally:
+        conn.close()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# scripts/ 모듈 import 경로 (scripts는 패키지가 아니라 평평한 스크립트 모음)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
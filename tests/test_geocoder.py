@@ -0,0 +1,25 @@
+import geocoder
+
+
+def test_pending_addresses_groups_by_cleaned_query():
+    stores = [
+        {"address": "서울 강남구 테헤란로 1 (역삼동)", "lat": 0.0, "lng": 0.0},
+        {"address": "서울  강남구 테헤란로 1, 1층", "lat": 0.0, "lng": 0.0},
+        {"address": "서울 강남구 테헤란로 2", "lat": 0.0, "lng": 0.0},
+    ]
+
+    groups = geocoder.pending_addresses(stores)
+
+    assert groups == {"서울 강남구 테헤란로 1": [0, 1], "서울 강남구 테헤란로 2": [2]}
+
+
+def test_cache_is_keyed_on_cleaned_query(tmp_path):
+    path = tmp_path / "geocode_cache.json"
+    # 예전 캐시는 상세주소까지 포함한 키로 저장돼 있음
+    path.write_text('{"서울 강남구 테헤란로 1 (역삼동)": {"lat": 37.5, "lng": 127.0, "provider": "kakao", "ts": 0}}',
+                    encoding="utf-8")
+
+    cache = geocoder.GeocodeCache(str(path))
+
+    assert cache.get("서울 강남구 테헤란로 1, 1층")["lat"] == 37.5
+    assert list(cache.entries) == ["서울 강남구 테헤란로 1"]
@@ -0,0 +1,38 @@
+from journal import JsonlJournal
+
+
+def write_torn_journal(path):
+    """1, 2회차는 완전한 줄, 3회차는 쓰다가 끊긴 줄"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"round":1}\n{"round":2}\n{"round":3,"num')
+
+
+def test_append_after_torn_tail_keeps_new_records(tmp_path):
+    path = str(tmp_path / "history.journal.jsonl")
+    write_torn_journal(path)
+
+    journal = JsonlJournal(path)
+    journal.append({"round": 3})
+    journal.append({"round": 4})
+
+    assert [r["round"] for r in journal.read_all()] == [1, 2, 3, 4]
+    assert journal.last() == {"round": 4}
+
+
+def test_torn_tail_is_ignored_when_reading(tmp_path):
+    path = str(tmp_path / "history.journal.jsonl")
+    write_torn_journal(path)
+
+    journal = JsonlJournal(path)
+    assert [r["round"] for r in journal.read_all()] == [1, 2]
+    assert journal.last() == {"round": 2}
+
+
+def test_append_to_file_without_any_newline(tmp_path):
+    path = str(tmp_path / "history.journal.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"round":1')
+
+    journal = JsonlJournal(path)
+    journal.append({"round": 1})
+    assert journal.read_all() == [{"round": 1}]
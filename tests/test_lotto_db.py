@@ -0,0 +1,50 @@
+import json
+
+import lotto_db
+from history_io import compact_history, load_history, open_journal, prepend_history
+
+
+def make_round(round_no):
+    return {
+        "round": round_no,
+        "date": f"2024-01-{round_no:02d}",
+        "numbers": [1, 2, 3, 4, 5, round_no + 6],
+        "bonus": 45,
+        "result": {
+            "1st": {"prize": 1000, "winners": 1, "stores": [{"name": "판매점", "addr": "서울 1", "method": "자동"}]},
+            "2nd": {"prize": 100, "winners": 1, "stores": [{"name": "판매점", "addr": "서울 1"}]},
+            "3rd": {"prize": 10, "winners": 2},
+        },
+    }
+
+
+def test_db_is_write_target_and_seeded_from_existing_json(tmp_path, monkeypatch):
+    history_file = str(tmp_path / "history.json")
+    with open(history_file, "w", encoding="utf-8") as f:
+        json.dump([make_round(2), make_round(1)], f, ensure_ascii=False, indent=2)
+    db_file = str(tmp_path / "lotto.db")
+    monkeypatch.setenv("LOTTO_DB", db_file)
+
+    # 빈 DB: 기존 1, 2회차를 먼저 가져온 뒤 3회차만 추가하고 history.json은 DB에서 내보냄
+    prepend_history(history_file, [make_round(3)])
+
+    conn = lotto_db.connect(db_file)
+    assert [r["round"] for r in lotto_db.fetch_history(conn)] == [3, 2, 1]
+    assert load_history(history_file) == lotto_db.fetch_history(conn)
+    conn.close()
+
+
+def test_compact_in_db_mode_upserts_journal_rounds(tmp_path, monkeypatch):
+    history_file = str(tmp_path / "history.json")
+    with open(history_file, "w", encoding="utf-8") as f:
+        json.dump([make_round(1)], f, ensure_ascii=False, indent=2)
+    monkeypatch.setenv("LOTTO_DB", str(tmp_path / "lotto.db"))
+
+    journal = open_journal(history_file)
+    fixed = make_round(1)
+    fixed["bonus"] = 7
+    journal.append(fixed)
+    journal.append(make_round(2))
+
+    assert compact_history(history_file) == 2
+    assert [(r["round"], r["bonus"]) for r in load_history(history_file)] == [(2, 45), (1, 7)]
@@ -0,0 +1,13 @@
+import os
+
+import metrics
+
+
+def test_discard_writes_nothing(tmp_path):
+    metrics.configure(str(tmp_path))
+    metrics.discard()
+    metrics.inc("rounds_total")
+
+    assert not metrics.enabled()
+    assert open(tmp_path / metrics.JSONL_NAME, encoding="utf-8").read() == ""
+    assert not os.path.exists(tmp_path / metrics.PROM_NAME)
@@ -0,0 +1,44 @@
+import store_round_index
+
+
+def make_round(round_no, store_name):
+    return {
+        "round": round_no,
+        "date": f"2024-01-{round_no:02d}",
+        "result": {"1st": {"stores": [{"name": store_name, "addr": "서울 강남구 1"}]}},
+    }
+
+
+HISTORY = [make_round(n, f"판매점{n}") for n in range(1, 6)]
+
+
+def test_update_without_index_file_rebuilds_full_history(tmp_path):
+    path = str(tmp_path / "store_rounds.json")
+
+    index = store_round_index.update_index(HISTORY[-1:], path=path, load_all=lambda: HISTORY)
+
+    assert index.rounds == [1, 2, 3, 4, 5]
+    assert store_round_index.load_index(path).rounds == [1, 2, 3, 4, 5]
+    assert len(index.stores_between(1, 4)) == 4
+
+
+def test_update_with_gap_rebuilds_full_history(tmp_path):
+    path = str(tmp_path / "store_rounds.json")
+    store_round_index.build_index(HISTORY[:2], path=path)
+
+    index = store_round_index.update_index(HISTORY[4:], path=path, load_all=lambda: HISTORY)
+
+    assert index.rounds == [1, 2, 3, 4, 5]
+
+
+def test_update_contiguous_appends_without_full_history(tmp_path):
+    path = str(tmp_path / "store_rounds.json")
+    store_round_index.build_index(HISTORY[:4], path=path)
+
+    def fail():
+        raise AssertionError("연속된 회차는 history 전체를 읽지 않아야 함")
+
+    index = store_round_index.update_index(HISTORY[4:], path=path, load_all=fail)
+
+    assert index.rounds == [1, 2, 3, 4, 5]
+    assert store_round_index.load_index(path).winners(5) == index.winners(5)